@@ -0,0 +1,57 @@
+"""add_trigram_autocomplete_indexes
+
+Revision ID: 0a9d4c6e2b51
+Revises: f31c7d5e8a92
+Create Date: 2026-10-19 16:20:44.105928
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0a9d4c6e2b51'
+down_revision: Union[str, Sequence[str], None] = 'f31c7d5e8a92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (索引名, 表名, 列名)
+TRGM_INDEXES = [
+    ("ix_source_targets_target_key_trgm", "source_targets", "target_key"),
+    ("ix_source_targets_display_name_trgm", "source_targets", "display_name"),
+    ("ix_tags_name_trgm", "tags", "name"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    bind = op.get_bind()
+    existing_tables = set(sa.inspect(bind).get_table_names(schema="public"))
+
+    with op.get_context().autocommit_block():
+        for name, table, column in TRGM_INDEXES:
+            if table not in existing_tables:
+                continue
+            op.create_index(
+                name,
+                table,
+                [column],
+                unique=False,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # pg_trgm 扩展可能被其他对象使用，降级时保留
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(TRGM_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
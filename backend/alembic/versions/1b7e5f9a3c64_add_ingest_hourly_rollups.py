@@ -0,0 +1,46 @@
+"""add_ingest_hourly_rollups
+
+Revision ID: 1b7e5f9a3c64
+Revises: 0a9d4c6e2b51
+Create Date: 2026-10-19 17:05:31.662207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1b7e5f9a3c64'
+down_revision: Union[str, Sequence[str], None] = '0a9d4c6e2b51'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "ingest_hourly_rollups",
+        sa.Column("bucket", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("source", sa.String(length=32), nullable=False),
+        sa.Column("target_id", sa.Integer(), nullable=False),
+        sa.Column("tag_id", sa.Integer(), nullable=False),
+        sa.Column("items", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("comments", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("valuable_analyses", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("errors", sa.Integer(), server_default="0", nullable=False),
+        sa.PrimaryKeyConstraint("bucket", "source", "target_id", "tag_id", name="ingest_hourly_rollups_pkey"),
+    )
+    op.create_index(
+        "ix_ingest_hourly_rollups_tag_target_bucket",
+        "ingest_hourly_rollups",
+        ["tag_id", "target_id", "bucket"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_ingest_hourly_rollups_tag_target_bucket", table_name="ingest_hourly_rollups")
+    op.drop_table("ingest_hourly_rollups")
@@ -0,0 +1,113 @@
+"""add_comment_thread_path
+
+为 source_comments 增加物化路径列 thread_path（C 排序规则）及索引，并回填存量评论。
+
+- ix_source_comments_item_thread_path (item_id, thread_path)：线程视图与子树范围扫描；
+- ix_source_comments_item_top_level：仅顶层评论（parent_id IS NULL）的部分索引。
+
+新增可空列只修改元数据；回填按内容 ID 分段执行、逐段提交，避免长事务。
+分区表索引做法同 f31c7d5e8a92：父表 ON ONLY 建索引，逐分区并发建索引后 ATTACH。
+
+Revision ID: 2c8f6b0d4e73
+Revises: 1b7e5f9a3c64
+Create Date: 2026-10-19 18:12:44.105938
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c8f6b0d4e73'
+down_revision: Union[str, Sequence[str], None] = '1b7e5f9a3c64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BACKFILL_ITEM_BATCH = 500
+
+# 与 app.services.comment_tree_service.thread_path_segment 保持一致
+SEGMENT = (
+    "lpad(to_hex(greatest(floor(extract(epoch FROM {t}.created_at)), 0)::bigint), 9, '0') "
+    "|| lpad(to_hex({t}.id), 8, '0')"
+)
+
+# 与 app.services.comment_tree_service.build_thread_path 保持一致：超长时挂到祖父节点下
+PARENT_PREFIX = (
+    "CASE WHEN length(tree.path) + 18 > 2048 "
+    "THEN regexp_replace(tree.path, '\\.[^.]*$', '') ELSE tree.path END"
+)
+
+# 父评论缺失（未抓到或已删除）的评论与入库时一样按根处理
+BACKFILL_SQL = f"""
+WITH RECURSIVE tree AS (
+    SELECT c.id, c.created_at, {SEGMENT.format(t="c")} AS path
+    FROM source_comments c
+    WHERE c.item_id BETWEEN :lo AND :hi
+      AND (c.parent_id IS NULL OR NOT EXISTS (SELECT 1 FROM source_comments p WHERE p.id = c.parent_id))
+    UNION ALL
+    SELECT c.id, c.created_at, {PARENT_PREFIX} || '.' || {SEGMENT.format(t="c")}
+    FROM source_comments c
+    JOIN tree ON c.parent_id = tree.id
+    WHERE c.item_id BETWEEN :lo AND :hi
+)
+UPDATE source_comments s
+SET thread_path = tree.path
+FROM tree
+WHERE s.id = tree.id AND s.created_at = tree.created_at
+"""
+
+INDEXES = (
+    ("ix_source_comments_item_thread_path", "thread_path_idx", "(item_id, thread_path)", ""),
+    ("ix_source_comments_item_top_level", "top_level_idx", "(item_id, thread_path)", " WHERE parent_id IS NULL"),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    op.add_column("source_comments", sa.Column("thread_path", sa.String(2048, collation="C"), nullable=True))
+    if "source_comments_archive" in sa.inspect(bind).get_table_names(schema="public"):
+        op.add_column(
+            "source_comments_archive",
+            sa.Column("thread_path", sa.String(2048, collation="C"), nullable=True),
+        )
+    for name, _, columns, where in INDEXES:
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON ONLY source_comments {columns}{where}")
+
+    partitions = [
+        row[0]
+        for row in bind.execute(
+            sa.text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = 'source_comments'::regclass"
+            )
+        )
+    ]
+
+    with op.get_context().autocommit_block():
+        lo, hi = bind.execute(sa.text("SELECT min(item_id), max(item_id) FROM source_comments")).one()
+        if lo is not None:
+            for start in range(lo, hi + 1, BACKFILL_ITEM_BATCH):
+                bind.execute(sa.text(BACKFILL_SQL), {"lo": start, "hi": start + BACKFILL_ITEM_BATCH - 1})
+
+        for partition in partitions:
+            for name, suffix, columns, where in INDEXES:
+                index_name = f"{partition}_{suffix}"
+                op.execute(
+                    f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{index_name}" '
+                    f'ON "{partition}" {columns}{where}'
+                )
+                op.execute(f'ALTER INDEX {name} ATTACH PARTITION "{index_name}"')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, _, _, _ in INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    if "source_comments_archive" in sa.inspect(op.get_bind()).get_table_names(schema="public"):
+        op.drop_column("source_comments_archive", "thread_path")
+    op.drop_column("source_comments", "thread_path")
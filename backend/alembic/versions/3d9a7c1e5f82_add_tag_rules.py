@@ -0,0 +1,44 @@
+"""add_tag_rules
+
+Revision ID: 3d9a7c1e5f82
+Revises: 2c8f6b0d4e73
+Create Date: 2026-10-19 18:57:09.318442
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d9a7c1e5f82'
+down_revision: Union[str, Sequence[str], None] = '2c8f6b0d4e73'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "tag_rules",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("tag_id", sa.Integer(), nullable=False),
+        sa.Column("kind", sa.String(length=16), nullable=False),
+        sa.Column("pattern", sa.Text(), nullable=False),
+        sa.Column("source", sa.String(length=32), nullable=True),
+        sa.Column("target_id", sa.Integer(), nullable=True),
+        sa.Column("match_comments", sa.Boolean(), nullable=False),
+        sa.Column("enabled", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["tag_id"], ["tags.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["target_id"], ["source_targets.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_tag_rules_tag_id"), "tag_rules", ["tag_id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_tag_rules_tag_id"), table_name="tag_rules")
+    op.drop_table("tag_rules")
@@ -0,0 +1,41 @@
+"""add_source_item_canonical_url
+
+为 source_items 增加规范外链列 canonical_url 及部分索引 ix_source_items_canonical_url
+（仅非空行），用于跨平台重复内容聚类。
+
+新增可空列只修改元数据；索引并发创建不阻塞写入。存量数据用
+``python -m scripts.backfill_canonical_urls`` 分批回填。
+
+Revision ID: 4e1b8d2f6a93
+Revises: 3d9a7c1e5f82
+Create Date: 2026-10-19 19:34:18.226714
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e1b8d2f6a93'
+down_revision: Union[str, Sequence[str], None] = '3d9a7c1e5f82'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("source_items", sa.Column("canonical_url", sa.String(length=1000), nullable=True))
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_source_items_canonical_url "
+            "ON source_items (canonical_url) WHERE canonical_url IS NOT NULL"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_source_items_canonical_url")
+    op.drop_column("source_items", "canonical_url")
@@ -0,0 +1,55 @@
+"""add_keyset_pagination_indexes
+
+Revision ID: 5c2a9e7d1b34
+Revises: 949220c7deae
+Create Date: 2026-10-19 10:12:40.318201
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2a9e7d1b34'
+down_revision: Union[str, Sequence[str], None] = '949220c7deae'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (索引名, 表名, 列) —— 与列表接口的 (排序时间, id) 游标一致
+KEYSET_INDEXES = [
+    ("ix_source_items_fetched_at_id", "source_items", ["fetched_at", "id"]),
+    ("ix_source_items_target_fetched_at_id", "source_items", ["target_id", "fetched_at", "id"]),
+    ("ix_source_comments_item_created_at_id", "source_comments", ["item_id", "created_at", "id"]),
+    ("ix_source_analyses_created_at_id", "source_analyses", ["created_at", "id"]),
+    ("ix_posts_fetched_at_id", "posts", ["fetched_at", "id"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    existing_tables = set(sa.inspect(bind).get_table_names(schema="public"))
+
+    # 大表上建索引使用 CONCURRENTLY，避免长时间阻塞写入
+    with op.get_context().autocommit_block():
+        for name, table, columns in KEYSET_INDEXES:
+            if table not in existing_tables:
+                continue
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(KEYSET_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
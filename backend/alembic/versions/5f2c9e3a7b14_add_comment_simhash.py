@@ -0,0 +1,81 @@
+"""add_comment_simhash
+
+为 source_comments 增加 SimHash 近似重复检测列：
+
+- simhash：64 位 SimHash（有符号 BIGINT）；
+- duplicate_of_id：近似重复时指向更早的规范评论（分区表不建外键）；
+- ix_source_comments_simhash_band0..3：按 16 位分段的表达式索引，用于汉明距离候选查询。
+
+新增可空列只修改元数据；存量评论用 ``python -m scripts.backfill_simhash`` 回填。
+分区表索引做法同 f31c7d5e8a92：父表 ON ONLY 建索引，逐分区并发建索引后 ATTACH。
+
+Revision ID: 5f2c9e3a7b14
+Revises: 4e1b8d2f6a93
+Create Date: 2026-10-19 20:06:51.730482
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f2c9e3a7b14'
+down_revision: Union[str, Sequence[str], None] = '4e1b8d2f6a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# 与 app.services.simhash_service.band_expression 保持一致
+INDEXES = (
+    ("ix_source_comments_duplicate_of_id", "duplicate_of_id_idx", "(duplicate_of_id)"),
+    ("ix_source_comments_simhash_band0", "simhash_band0_idx", "(((simhash >> 48) & 65535))"),
+    ("ix_source_comments_simhash_band1", "simhash_band1_idx", "(((simhash >> 32) & 65535))"),
+    ("ix_source_comments_simhash_band2", "simhash_band2_idx", "(((simhash >> 16) & 65535))"),
+    ("ix_source_comments_simhash_band3", "simhash_band3_idx", "(((simhash >> 0) & 65535))"),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    op.add_column("source_comments", sa.Column("simhash", sa.BigInteger(), nullable=True))
+    op.add_column("source_comments", sa.Column("duplicate_of_id", sa.Integer(), nullable=True))
+    if "source_comments_archive" in sa.inspect(bind).get_table_names(schema="public"):
+        op.add_column("source_comments_archive", sa.Column("simhash", sa.BigInteger(), nullable=True))
+        op.add_column("source_comments_archive", sa.Column("duplicate_of_id", sa.Integer(), nullable=True))
+    for name, _, columns in INDEXES:
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON ONLY source_comments {columns}")
+
+    partitions = [
+        row[0]
+        for row in bind.execute(
+            sa.text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = 'source_comments'::regclass"
+            )
+        )
+    ]
+
+    with op.get_context().autocommit_block():
+        for partition in partitions:
+            for name, suffix, columns in INDEXES:
+                index_name = f"{partition}_{suffix}"
+                op.execute(
+                    f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{index_name}" '
+                    f'ON "{partition}" {columns}'
+                )
+                op.execute(f'ALTER INDEX {name} ATTACH PARTITION "{index_name}"')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, _, _ in INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    if "source_comments_archive" in sa.inspect(op.get_bind()).get_table_names(schema="public"):
+        op.drop_column("source_comments_archive", "duplicate_of_id")
+        op.drop_column("source_comments_archive", "simhash")
+    op.drop_column("source_comments", "duplicate_of_id")
+    op.drop_column("source_comments", "simhash")
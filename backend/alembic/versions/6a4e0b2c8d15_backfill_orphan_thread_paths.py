@@ -0,0 +1,83 @@
+"""backfill_orphan_thread_paths
+
+补齐 2c8f6b0d4e73 回填遗漏的评论物化路径：父评论缺失（未抓到或已删除）的评论当时
+没有路径，线程视图中看不到，而入库时同样情况按根处理。此处与入库保持一致：
+
+- 父评论不存在的评论按根处理；
+- 父评论已有路径的，接在父路径之后（超长时挂到祖父节点下）；
+- 二者的后代沿 parent_id 递归补齐。
+
+只更新 thread_path 为空的行，可重复执行；按内容 ID 分段执行、逐段提交。
+
+Revision ID: 6a4e0b2c8d15
+Revises: 5f2c9e3a7b14
+Create Date: 2026-10-20 10:41:27.318604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a4e0b2c8d15'
+down_revision: Union[str, Sequence[str], None] = '5f2c9e3a7b14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BACKFILL_ITEM_BATCH = 500
+
+# 与 app.services.comment_tree_service.thread_path_segment 保持一致
+SEGMENT = (
+    "lpad(to_hex(greatest(floor(extract(epoch FROM {t}.created_at)), 0)::bigint), 9, '0') "
+    "|| lpad(to_hex({t}.id), 8, '0')"
+)
+
+# 与 app.services.comment_tree_service.build_thread_path 保持一致：超长时挂到祖父节点下
+PARENT_PREFIX = (
+    "CASE WHEN length({p}) + 18 > 2048 "
+    "THEN regexp_replace({p}, '\\.[^.]*$', '') ELSE {p} END"
+)
+
+BACKFILL_SQL = f"""
+WITH RECURSIVE tree AS (
+    SELECT c.id, c.created_at,
+           CASE WHEN p.id IS NULL THEN {SEGMENT.format(t="c")}
+                ELSE {PARENT_PREFIX.format(p="p.thread_path")} || '.' || {SEGMENT.format(t="c")} END AS path
+    FROM source_comments c
+    LEFT JOIN source_comments p ON p.id = c.parent_id
+    WHERE c.item_id BETWEEN :lo AND :hi
+      AND c.thread_path IS NULL
+      AND c.parent_id IS NOT NULL
+      AND (p.id IS NULL OR p.thread_path IS NOT NULL)
+    UNION ALL
+    SELECT c.id, c.created_at, {PARENT_PREFIX.format(p="tree.path")} || '.' || {SEGMENT.format(t="c")}
+    FROM source_comments c
+    JOIN tree ON c.parent_id = tree.id
+    WHERE c.item_id BETWEEN :lo AND :hi AND c.thread_path IS NULL
+)
+UPDATE source_comments s
+SET thread_path = tree.path
+FROM tree
+WHERE s.id = tree.id AND s.created_at = tree.created_at
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    with op.get_context().autocommit_block():
+        lo, hi = bind.execute(
+            sa.text("SELECT min(item_id), max(item_id) FROM source_comments WHERE thread_path IS NULL")
+        ).one()
+        if lo is not None:
+            for start in range(lo, hi + 1, BACKFILL_ITEM_BATCH):
+                bind.execute(sa.text(BACKFILL_SQL), {"lo": start, "hi": start + BACKFILL_ITEM_BATCH - 1})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # 纯数据补齐，无需回滚
+    pass
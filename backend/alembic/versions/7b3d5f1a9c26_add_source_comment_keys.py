@@ -0,0 +1,66 @@
+"""add_source_comment_keys
+
+c4f8a1e92d57 把评论表改为按 created_at 分区后，唯一约束只能是
+(source, external_id, created_at)：同一条评论若以不同的 created_at 入库
+（时钟偏差、时间缺省回退），会落成两行。此处新增不分区的查找表
+source_comment_keys(source, external_id) → (comment_id, created_at)，
+由入库与评论在同一事务中写入，主键保证全局唯一。
+
+回填按外部 ID 取 ID 最小的一行；迁移前已产生的重复评论不做合并，
+其余副本不再被入库命中。回填按内容 ID 分段执行、逐段提交，可重复执行。
+
+Revision ID: 7b3d5f1a9c26
+Revises: 6a4e0b2c8d15
+Create Date: 2026-10-20 15:12:08.463915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b3d5f1a9c26'
+down_revision: Union[str, Sequence[str], None] = '6a4e0b2c8d15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BACKFILL_ITEM_BATCH = 1000
+
+BACKFILL_SQL = """
+INSERT INTO source_comment_keys (source, external_id, comment_id, created_at)
+SELECT DISTINCT ON (source, external_id) source, external_id, id, created_at
+FROM source_comments
+WHERE item_id BETWEEN :lo AND :hi
+ORDER BY source, external_id, id
+ON CONFLICT (source, external_id) DO NOTHING
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "source_comment_keys",
+        sa.Column("source", sa.String(length=32), nullable=False),
+        sa.Column("external_id", sa.String(length=64), nullable=False),
+        sa.Column("comment_id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("source", "external_id"),
+    )
+    op.create_index("ix_source_comment_keys_comment_id", "source_comment_keys", ["comment_id"], unique=False)
+
+    bind = op.get_bind()
+    with op.get_context().autocommit_block():
+        lo, hi = bind.execute(sa.text("SELECT min(item_id), max(item_id) FROM source_comments")).one()
+        if lo is not None:
+            # 跨段的同一外部 ID（理论上只属于一条内容）由 ON CONFLICT 保留先写入的一行
+            for start in range(lo, hi + 1, BACKFILL_ITEM_BATCH):
+                bind.execute(sa.text(BACKFILL_SQL), {"lo": start, "hi": start + BACKFILL_ITEM_BATCH - 1})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_source_comment_keys_comment_id", table_name="source_comment_keys")
+    op.drop_table("source_comment_keys")
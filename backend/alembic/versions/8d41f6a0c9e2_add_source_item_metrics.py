@@ -0,0 +1,78 @@
+"""add_source_item_metrics
+
+Revision ID: 8d41f6a0c9e2
+Revises: 5c2a9e7d1b34
+Create Date: 2026-10-19 11:03:18.902114
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d41f6a0c9e2'
+down_revision: Union[str, Sequence[str], None] = '5c2a9e7d1b34'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _month_start(offset: int) -> datetime:
+    now = datetime.now(timezone.utc)
+    index = now.year * 12 + (now.month - 1) + offset
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "source_item_metrics",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("captured_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("item_id", sa.Integer(), nullable=False),
+        sa.Column("source", sa.String(length=32), nullable=False),
+        sa.Column("score", sa.Integer(), nullable=False),
+        sa.Column("num_comments", sa.Integer(), nullable=False),
+        sa.Column("score_delta", sa.Integer(), nullable=False),
+        sa.Column("comments_delta", sa.Integer(), nullable=False),
+        sa.Column("score_velocity", sa.Float(), nullable=False),
+        sa.Column("comments_velocity", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["item_id"], ["source_items.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id", "captured_at"),
+        postgresql_partition_by="RANGE (captured_at)",
+    )
+    op.create_index(
+        "ix_source_item_metrics_item_captured_at",
+        "source_item_metrics",
+        ["item_id", "captured_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_source_item_metrics_score_velocity",
+        "source_item_metrics",
+        ["score_velocity", "captured_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_source_item_metrics_comments_velocity",
+        "source_item_metrics",
+        ["comments_velocity", "captured_at"],
+        unique=False,
+    )
+
+    # 兜底分区 + 当前及未来两个月分区；后续由调度器滚动预建
+    op.execute("CREATE TABLE source_item_metrics_default PARTITION OF source_item_metrics DEFAULT")
+    for offset in range(0, 3):
+        start = _month_start(offset)
+        end = _month_start(offset + 1)
+        op.execute(
+            f"CREATE TABLE source_item_metrics_p{start:%Y%m} PARTITION OF source_item_metrics "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("source_item_metrics")
@@ -0,0 +1,78 @@
+"""add_source_item_velocity
+
+Revision ID: b7e3d2a14f60
+Revises: 8d41f6a0c9e2
+Create Date: 2026-10-19 11:47:05.220934
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e3d2a14f60'
+down_revision: Union[str, Sequence[str], None] = '8d41f6a0c9e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 常量默认值在 PG11+ 下不会重写全表
+    op.add_column(
+        "source_items",
+        sa.Column("score_velocity", sa.Float(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "source_items",
+        sa.Column("comments_velocity", sa.Float(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "source_items",
+        sa.Column("rising_score", sa.Float(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "source_items",
+        sa.Column("velocity_updated_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_source_items_rising_score",
+            "source_items",
+            ["rising_score", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_source_items_source_rising_score",
+            "source_items",
+            ["source", "rising_score", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_source_items_source_rising_score",
+            table_name="source_items",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_source_items_rising_score",
+            table_name="source_items",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column("source_items", "velocity_updated_at")
+    op.drop_column("source_items", "rising_score")
+    op.drop_column("source_items", "comments_velocity")
+    op.drop_column("source_items", "score_velocity")
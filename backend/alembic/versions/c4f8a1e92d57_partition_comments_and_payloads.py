@@ -0,0 +1,223 @@
+"""partition_comments_and_payloads
+
+将 source_comments / source_comment_payloads / source_item_payloads
+改造为按 created_at 月度范围分区的声明式分区表。
+
+分区表的主键与唯一约束必须包含分区键，因此：
+- 主键改为 (id, created_at)，唯一约束追加 created_at；
+- 指向 source_comments.id 的外键（parent_id、payload、analysis）被移除，
+  由入库逻辑保证引用一致性；
+- payload 表新增 created_at（取所属内容/评论的发布时间），与评论分区对齐。
+
+迁移会整表复制数据，大表请在维护窗口执行。
+
+Revision ID: c4f8a1e92d57
+Revises: b7e3d2a14f60
+Create Date: 2026-10-19 13:25:51.604387
+
+"""
+from datetime import datetime, timezone
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f8a1e92d57'
+down_revision: Union[str, Sequence[str], None] = 'b7e3d2a14f60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+MONTHS_AHEAD = 2
+
+
+def _month_start(dt: datetime) -> datetime:
+    dt = dt.astimezone(timezone.utc) if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+    return dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _add_months(dt: datetime, months: int) -> datetime:
+    index = dt.year * 12 + (dt.month - 1) + months
+    return dt.replace(year=index // 12, month=index % 12 + 1)
+
+
+def _create_partitions(table: str, oldest: Optional[datetime]) -> None:
+    """创建 DEFAULT 分区，以及从最早数据月份到未来 MONTHS_AHEAD 个月的月度分区。"""
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+    current = _month_start(datetime.now(timezone.utc))
+    start = _month_start(oldest) if oldest else current
+    last = _add_months(current, MONTHS_AHEAD)
+    while start <= last:
+        end = _add_months(start, 1)
+        op.execute(
+            f"CREATE TABLE {table}_p{start:%Y%m} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        start = end
+
+
+def _oldest(sql: str) -> Optional[datetime]:
+    return op.get_bind().execute(sa.text(sql)).scalar()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ---- source_comments ----
+    op.execute("ALTER TABLE source_comments RENAME TO source_comments_legacy")
+    op.execute("ALTER SEQUENCE source_comments_id_seq OWNED BY NONE")
+    op.execute(
+        """
+        CREATE TABLE source_comments (
+            LIKE source_comments_legacy INCLUDING DEFAULTS
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    _create_partitions("source_comments", _oldest("SELECT min(created_at) FROM source_comments_legacy"))
+    op.execute("INSERT INTO source_comments SELECT * FROM source_comments_legacy")
+
+    # ---- source_comment_payloads（created_at 取所属评论） ----
+    op.execute("ALTER TABLE source_comment_payloads RENAME TO source_comment_payloads_legacy")
+    op.execute("ALTER SEQUENCE source_comment_payloads_id_seq OWNED BY NONE")
+    op.execute(
+        """
+        CREATE TABLE source_comment_payloads (
+            LIKE source_comment_payloads_legacy INCLUDING DEFAULTS,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    _create_partitions("source_comment_payloads", _oldest("SELECT min(created_at) FROM source_comments_legacy"))
+    op.execute(
+        """
+        INSERT INTO source_comment_payloads (
+            id, comment_id, source, external_id, payload, fetched_at, created_at
+        )
+        SELECT p.id, p.comment_id, p.source, p.external_id, p.payload, p.fetched_at, c.created_at
+        FROM source_comment_payloads_legacy p
+        JOIN source_comments_legacy c ON c.id = p.comment_id
+        """
+    )
+
+    # ---- source_item_payloads（created_at 取所属内容） ----
+    op.execute("ALTER TABLE source_item_payloads RENAME TO source_item_payloads_legacy")
+    op.execute("ALTER SEQUENCE source_item_payloads_id_seq OWNED BY NONE")
+    op.execute(
+        """
+        CREATE TABLE source_item_payloads (
+            LIKE source_item_payloads_legacy INCLUDING DEFAULTS,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    _create_partitions("source_item_payloads", _oldest("SELECT min(created_at) FROM source_items"))
+    op.execute(
+        """
+        INSERT INTO source_item_payloads (
+            id, item_id, source, external_id, payload, fetched_at, created_at
+        )
+        SELECT p.id, p.item_id, p.source, p.external_id, p.payload, p.fetched_at, i.created_at
+        FROM source_item_payloads_legacy p
+        JOIN source_items i ON i.id = p.item_id
+        """
+    )
+
+    # CASCADE 同时移除 source_analyses 等对旧评论表的外键
+    op.execute("DROP TABLE source_comment_payloads_legacy")
+    op.execute("DROP TABLE source_item_payloads_legacy")
+    op.execute("DROP TABLE source_comments_legacy CASCADE")
+
+    for table in ("source_comments", "source_comment_payloads", "source_item_payloads"):
+        op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+
+    # 数据导入后再建约束与索引（在父表上创建会自动下推到各分区）
+    op.create_primary_key("source_comments_pkey", "source_comments", ["id", "created_at"])
+    op.create_unique_constraint(
+        "uq_source_comment_external", "source_comments", ["source", "external_id", "created_at"]
+    )
+    op.create_foreign_key(None, "source_comments", "source_items", ["item_id"], ["id"])
+    op.create_index("ix_source_comments_id", "source_comments", ["id"], unique=False)
+    op.create_index("ix_source_comments_item_id", "source_comments", ["item_id"], unique=False)
+    op.create_index("ix_source_comments_source", "source_comments", ["source"], unique=False)
+    op.create_index("ix_source_comments_external_id", "source_comments", ["external_id"], unique=False)
+    op.create_index("ix_source_comments_parent_id", "source_comments", ["parent_id"], unique=False)
+    op.create_index(
+        "ix_source_comments_item_created_at_id",
+        "source_comments",
+        ["item_id", "created_at", "id"],
+        unique=False,
+    )
+
+    op.create_primary_key("source_comment_payloads_pkey", "source_comment_payloads", ["id", "created_at"])
+    op.create_unique_constraint(
+        "source_comment_payloads_comment_id_key", "source_comment_payloads", ["comment_id", "created_at"]
+    )
+    op.create_index("ix_source_comment_payloads_source", "source_comment_payloads", ["source"], unique=False)
+    op.create_index(
+        "ix_source_comment_payloads_external_id", "source_comment_payloads", ["external_id"], unique=False
+    )
+
+    op.create_primary_key("source_item_payloads_pkey", "source_item_payloads", ["id", "created_at"])
+    op.create_unique_constraint(
+        "source_item_payloads_item_id_key", "source_item_payloads", ["item_id", "created_at"]
+    )
+    op.create_foreign_key(None, "source_item_payloads", "source_items", ["item_id"], ["id"])
+    op.create_index("ix_source_item_payloads_source", "source_item_payloads", ["source"], unique=False)
+    op.create_index("ix_source_item_payloads_external_id", "source_item_payloads", ["external_id"], unique=False)
+
+
+def _unpartition(table: str, columns: str) -> None:
+    """把分区表复制回普通表（保留原序列）。"""
+    op.execute(f"ALTER TABLE {table} RENAME TO {table}_partitioned")
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY NONE")
+    op.execute(f"CREATE TABLE {table} (LIKE {table}_partitioned INCLUDING DEFAULTS)")
+    op.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {table}_partitioned")
+    op.execute(f"DROP TABLE {table}_partitioned")
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    comment_columns = (
+        "id, item_id, source, external_id, content, content_zh, author, score, "
+        "parent_id, depth, created_at, fetched_at"
+    )
+    payload_columns = "id, {fk}, source, external_id, payload, fetched_at, created_at"
+
+    _unpartition("source_comments", comment_columns)
+    _unpartition("source_comment_payloads", payload_columns.format(fk="comment_id"))
+    _unpartition("source_item_payloads", payload_columns.format(fk="item_id"))
+    op.drop_column("source_comment_payloads", "created_at")
+    op.drop_column("source_item_payloads", "created_at")
+
+    op.create_primary_key("source_comments_pkey", "source_comments", ["id"])
+    op.create_unique_constraint("uq_source_comment_external", "source_comments", ["source", "external_id"])
+    op.create_foreign_key(None, "source_comments", "source_items", ["item_id"], ["id"])
+    op.create_foreign_key(None, "source_comments", "source_comments", ["parent_id"], ["id"])
+    op.create_index("ix_source_comments_item_id", "source_comments", ["item_id"], unique=False)
+    op.create_index("ix_source_comments_source", "source_comments", ["source"], unique=False)
+    op.create_index("ix_source_comments_external_id", "source_comments", ["external_id"], unique=False)
+    op.create_index("ix_source_comments_parent_id", "source_comments", ["parent_id"], unique=False)
+    op.create_index(
+        "ix_source_comments_item_created_at_id",
+        "source_comments",
+        ["item_id", "created_at", "id"],
+        unique=False,
+    )
+
+    op.create_primary_key("source_comment_payloads_pkey", "source_comment_payloads", ["id"])
+    op.create_unique_constraint(None, "source_comment_payloads", ["comment_id"])
+    op.create_foreign_key(None, "source_comment_payloads", "source_comments", ["comment_id"], ["id"])
+    op.create_index("ix_source_comment_payloads_source", "source_comment_payloads", ["source"], unique=False)
+    op.create_index(
+        "ix_source_comment_payloads_external_id", "source_comment_payloads", ["external_id"], unique=False
+    )
+
+    op.create_primary_key("source_item_payloads_pkey", "source_item_payloads", ["id"])
+    op.create_unique_constraint(None, "source_item_payloads", ["item_id"])
+    op.create_foreign_key(None, "source_item_payloads", "source_items", ["item_id"], ["id"])
+    op.create_index("ix_source_item_payloads_source", "source_item_payloads", ["source"], unique=False)
+    op.create_index("ix_source_item_payloads_external_id", "source_item_payloads", ["external_id"], unique=False)
+
+    op.create_foreign_key(None, "source_analyses", "source_comments", ["comment_id"], ["id"])
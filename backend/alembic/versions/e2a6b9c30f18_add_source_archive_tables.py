@@ -0,0 +1,72 @@
+"""add_source_archive_tables
+
+Revision ID: e2a6b9c30f18
+Revises: c4f8a1e92d57
+Create Date: 2026-10-19 15:02:37.418260
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a6b9c30f18'
+down_revision: Union[str, Sequence[str], None] = 'c4f8a1e92d57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "source_items_archive",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("target_id", sa.Integer(), nullable=True),
+        sa.Column("source", sa.String(length=32), nullable=False),
+        sa.Column("external_id", sa.String(length=64), nullable=False),
+        sa.Column("item_type", sa.String(length=32), nullable=False),
+        sa.Column("title", sa.String(length=500), nullable=False),
+        sa.Column("title_zh", sa.String(length=500), nullable=True),
+        sa.Column("content", sa.Text(), nullable=True),
+        sa.Column("content_zh", sa.Text(), nullable=True),
+        sa.Column("author", sa.String(length=100), nullable=True),
+        sa.Column("url", sa.String(length=1000), nullable=True),
+        sa.Column("score", sa.Integer(), nullable=True),
+        sa.Column("num_comments", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("fetched_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("archived_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_source_items_archive_target_id", "source_items_archive", ["target_id"], unique=False)
+    op.create_index("ix_source_items_archive_created_at", "source_items_archive", ["created_at"], unique=False)
+
+    op.create_table(
+        "source_comments_archive",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("item_id", sa.Integer(), nullable=False),
+        sa.Column("source", sa.String(length=32), nullable=False),
+        sa.Column("external_id", sa.String(length=64), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("content_zh", sa.Text(), nullable=True),
+        sa.Column("author", sa.String(length=100), nullable=True),
+        sa.Column("score", sa.Integer(), nullable=True),
+        sa.Column("parent_id", sa.Integer(), nullable=True),
+        sa.Column("depth", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("fetched_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("archived_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_source_comments_archive_item_id", "source_comments_archive", ["item_id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_source_comments_archive_item_id", table_name="source_comments_archive")
+    op.drop_table("source_comments_archive")
+    op.drop_index("ix_source_items_archive_created_at", table_name="source_items_archive")
+    op.drop_index("ix_source_items_archive_target_id", table_name="source_items_archive")
+    op.drop_table("source_items_archive")
@@ -0,0 +1,95 @@
+"""add_full_text_search
+
+为 source_items(title, content) 与 source_comments(content) 增加 tsvector 生成列与 GIN 索引。
+
+添加 STORED 生成列会重写整表，大表请在维护窗口执行。source_comments 为分区表，
+不支持直接 CONCURRENTLY 建索引：先在父表上 ON ONLY 建（无效）索引，再逐个分区
+并发建索引并 ATTACH，全部挂载后父表索引自动生效；之后新建的分区会自动继承该索引。
+
+Revision ID: f31c7d5e8a92
+Revises: e2a6b9c30f18
+Create Date: 2026-10-19 15:48:12.730415
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f31c7d5e8a92'
+down_revision: Union[str, Sequence[str], None] = 'e2a6b9c30f18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# 需与 app.models.source_items.SEARCH_TS_CONFIG 保持一致
+TS_CONFIG = "english"
+
+ITEM_VECTOR = (
+    f"setweight(to_tsvector('{TS_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{TS_CONFIG}', coalesce(content, '')), 'B')"
+)
+COMMENT_VECTOR = f"to_tsvector('{TS_CONFIG}', coalesce(content, ''))"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "source_items",
+        sa.Column("search_vector", postgresql.TSVECTOR(), sa.Computed(ITEM_VECTOR, persisted=True), nullable=True),
+    )
+    op.add_column(
+        "source_comments",
+        sa.Column(
+            "search_vector", postgresql.TSVECTOR(), sa.Computed(COMMENT_VECTOR, persisted=True), nullable=True
+        ),
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_source_comments_search_vector "
+        "ON ONLY source_comments USING gin (search_vector)"
+    )
+    partitions = [
+        row[0]
+        for row in op.get_bind().execute(
+            sa.text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = 'source_comments'::regclass"
+            )
+        )
+    ]
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_source_items_search_vector",
+            "source_items",
+            ["search_vector"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        for partition in partitions:
+            index_name = f"{partition}_search_vector_idx"
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{index_name}" '
+                f'ON "{partition}" USING gin (search_vector)'
+            )
+            op.execute(f'ALTER INDEX ix_source_comments_search_vector ATTACH PARTITION "{index_name}"')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ix_source_comments_search_vector")
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_source_items_search_vector",
+            table_name="source_items",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column("source_comments", "search_vector")
+    op.drop_column("source_items", "search_vector")
@@ -3,6 +3,7 @@ from app.api import (
     analyses_api,
     crawler_api,
     dashboard_api,
+    export_api,
     posts_api,
     sources_api,
     subreddits_api,
@@ -18,3 +19,4 @@ router.include_router(tags_api.router, prefix="/tags", tags=["tags"])
 router.include_router(crawler_api.router, prefix="/crawler", tags=["crawler"])
 router.include_router(dashboard_api.router, prefix="/dashboard", tags=["dashboard"])
 router.include_router(sources_api.router, prefix="/sources", tags=["sources"])
+router.include_router(export_api.router, prefix="/export", tags=["export"])
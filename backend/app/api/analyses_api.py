@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 from typing import List, Optional
 
-from app.database import get_db
+from app.api.pagination import paginate, set_next_cursor
+from app.database import get_read_db
 from app.models.analyses import Analysis
 from app.models.source_comments import SourceAnalysis
 from app.models.source_comments import SourceComment
@@ -18,7 +19,7 @@ async def list_analyses(
     is_valuable: Optional[int] = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """查询旧版分析结果列表（支持价值过滤）。"""
     query = select(Analysis).options(selectinload(Analysis.comment))
@@ -46,21 +47,34 @@ async def list_analyses(
 
 @router.get("/sources", response_model=List[AnalysisResponse])
 async def list_source_analyses(
+    response: Response,
     source: Optional[str] = None,
     is_valuable: Optional[int] = None,
+    cursor: Optional[str] = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """查询统一来源评论分析结果列表。"""
+    """查询统一来源评论分析结果列表（按创建时间倒序）。
+
+    传入 ``cursor`` 时按 ``(created_at, id)`` 游标分页，下一页游标见 ``X-Next-Cursor`` 响应头。
+    """
     query = select(SourceAnalysis).options(selectinload(SourceAnalysis.comment))
     if is_valuable is not None:
         query = query.where(SourceAnalysis.is_valuable == is_valuable)
     if source:
         query = query.join(SourceAnalysis.comment).where(SourceComment.source == source)
-    query = query.offset(skip).limit(limit)
+    query = paginate(
+        query,
+        sort_column=SourceAnalysis.created_at,
+        id_column=SourceAnalysis.id,
+        cursor=cursor,
+        skip=skip,
+        limit=limit,
+    )
     result = await db.execute(query)
     rows = result.scalars().all()
+    set_next_cursor(response, rows, sort_attr="created_at", limit=limit)
     return [
         AnalysisResponse(
             id=row.id,
@@ -0,0 +1,129 @@
+"""响应缓存与条件请求（ETag）的 HTTP 适配层。
+
+处理函数把查询与序列化放进 ``build`` 回调，命中时直接返回缓存的 JSON 字节，
+跳过数据库查询与 pydantic 序列化。``X-Cache`` 响应头标记 ``HIT`` / ``MISS``。
+
+所有经过本模块的响应都带弱 ETag（响应体摘要，随缓存条目只计算一次），
+请求携带匹配的 ``If-None-Match`` 时返回 304 且不发送响应体。
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+
+from app.api.responses import FastJSONResponse
+from app.services.cache_service import response_cache
+
+CACHE_STATUS_HEADER = "X-Cache"
+ETAG_HEADER = "ETag"
+
+# 允许浏览器保存响应，但每次使用前必须带 If-None-Match 重新验证
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+# 不随缓存保存的响应头（由返回时的 Response 重新生成）
+_VOLATILE_HEADERS = {"content-length", "content-type"}
+
+# 缓存条目：(JSON 字节, 需要回放的响应头, ETag)
+CachedResponse = Tuple[bytes, Dict[str, str], str]
+
+
+def weak_etag(*parts: bytes) -> str:
+    """根据响应内容（及影响内容的附加标记）生成弱 ETag。"""
+    digest = hashlib.blake2b(digest_size=12)
+    for part in parts:
+        digest.update(part)
+        digest.update(b"\x00")
+    return f'W/"{digest.hexdigest()}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """按弱比较规则判断 ``If-None-Match`` 是否命中当前 ETag。"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    current = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == current:
+            return True
+    return False
+
+
+def not_modified_response(etag: str, headers: Optional[Dict[str, str]] = None) -> Response:
+    """返回不带响应体的 304。"""
+    return Response(
+        status_code=304,
+        headers={**(headers or {}), ETAG_HEADER: etag, "Cache-Control": REVALIDATE_CACHE_CONTROL},
+    )
+
+
+def json_with_etag(request: Request, content: Any, *, etag: Optional[str] = None) -> Response:
+    """序列化 JSON 响应并附带 ETag；``If-None-Match`` 命中时返回 304。
+
+    参数：
+        request: 当前请求。
+        content: 响应内容（pydantic 模型或可 JSON 编码对象）。
+        etag: 预先计算的 ETag；不传时按响应体摘要生成。
+
+    返回：
+        Response: 200 JSON 响应或 304。
+    """
+    body = FastJSONResponse(content).body
+    etag = etag or weak_etag(body)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={ETAG_HEADER: etag, "Cache-Control": REVALIDATE_CACHE_CONTROL},
+    )
+
+
+async def cached_json(
+    request: Request,
+    *,
+    namespace: str,
+    depends_on: Iterable[str],
+    build: Callable[[Response], Awaitable[Any]],
+    ttl: Optional[float] = None,
+) -> Response:
+    """按请求路径与查询参数缓存 JSON 响应，并支持 ``If-None-Match``。
+
+    参数：
+        request: 当前请求（提供路径与查询参数）。
+        namespace: 统计用命名空间。
+        depends_on: 结果依赖的命名空间，任一失效都会使缓存失效。
+        build: 未命中时执行的查询回调，可在传入的 ``Response`` 上设置响应头。
+        ttl: 可选 TTL（秒），默认使用全局配置。
+
+    返回：
+        Response: JSON 响应，或 ETag 未变化时的 304。
+    """
+    key = response_cache.make_key(namespace, depends_on, request.url.path, request.query_params.multi_items())
+    entry: Optional[CachedResponse] = response_cache.get(namespace, key)
+    status = "HIT"
+    if entry is None:
+        status = "MISS"
+        scratch = Response()
+        content = await build(scratch)
+        headers = {k: v for k, v in scratch.headers.items() if k.lower() not in _VOLATILE_HEADERS}
+        body = FastJSONResponse(content).body
+        entry = (body, headers, weak_etag(body))
+        response_cache.set(key, entry, ttl)
+
+    body, headers, etag = entry
+    headers = {**headers, CACHE_STATUS_HEADER: status}
+    if is_not_modified(request, etag):
+        return not_modified_response(etag, headers)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={**headers, ETAG_HEADER: etag, "Cache-Control": REVALIDATE_CACHE_CONTROL},
+    )
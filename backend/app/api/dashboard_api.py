@@ -1,71 +1,71 @@
-from datetime import datetime, timedelta, timezone
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends
-from sqlalchemy import func, select
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.models.analyses import Analysis
-from app.models.source_comments import SourceAnalysis
-from app.models.posts import Post
-from app.models.subreddits import Subreddit
-from app.models.source_items import SourceItem
-from app.models.source_targets import SourceTarget
-from app.models.tags import Tag
+from app.config import settings
+from app.database import get_read_db, pool_stats
+from app.schemas.dashboard_schemas import TimeseriesPoint
+from app.services.cache_service import response_cache
+from app.services.dashboard_service import get_dashboard_stats as load_dashboard_stats
+from app.services.rollup_service import list_timeseries
 
 router = APIRouter()
 
 
 @router.get("/stats")
-async def get_dashboard_stats(db: AsyncSession = Depends(get_db)):
-    """返回仪表盘核心统计（旧版 + 统一模型）。"""
-    now = datetime.now(timezone.utc)
-    since_24h = now - timedelta(hours=24)
+async def get_dashboard_stats(response: Response, db: AsyncSession = Depends(get_read_db)):
+    """返回仪表盘核心统计（旧版 + 统一模型）。
 
-    posts_total = await db.scalar(select(func.count()).select_from(Post))
-    source_items_total = await db.scalar(select(func.count()).select_from(SourceItem))
-    subreddits_total = await db.scalar(select(func.count()).select_from(Subreddit))
-    targets_total = await db.scalar(select(func.count()).select_from(SourceTarget))
-    targets_monitored = await db.scalar(
-        select(func.count()).select_from(SourceTarget).where(SourceTarget.monitor_enabled.is_(True))
-    )
-    targets_fetched = await db.scalar(
-        select(func.count()).select_from(SourceTarget).where(SourceTarget.last_fetched_at.is_not(None))
-    )
-    subreddits_monitored = await db.scalar(
-        select(func.count()).select_from(Subreddit).where(Subreddit.monitor_enabled.is_(True))
-    )
-    subreddits_fetched = await db.scalar(
-        select(func.count()).select_from(Subreddit).where(Subreddit.last_fetched_at.is_not(None))
-    )
-    tags_total = await db.scalar(select(func.count()).select_from(Tag))
-    analyses_valuable_total = await db.scalar(
-        select(func.count()).select_from(Analysis).where(Analysis.is_valuable == 1)
-    )
-    source_analyses_valuable_total = await db.scalar(
-        select(func.count()).select_from(SourceAnalysis).where(SourceAnalysis.is_valuable == 1)
-    )
-    posts_fetched_24h = await db.scalar(
-        select(func.count()).select_from(Post).where(Post.fetched_at >= since_24h)
-    )
-    source_items_fetched_24h = await db.scalar(
-        select(func.count()).select_from(SourceItem).where(SourceItem.fetched_at >= since_24h)
-    )
+    统计由单条聚合语句计算并在服务端缓存 ``dashboard_stats_ttl_seconds`` 秒，
+    同时通过 ``Cache-Control`` 允许客户端在同一时间窗口内复用结果。
+    """
+    response.headers["Cache-Control"] = f"private, max-age={max(settings.dashboard_stats_ttl_seconds, 0)}"
+    return await load_dashboard_stats(db)
 
-    return {
-        "now": now,
-        "posts_total": int(posts_total or 0),
-        "source_items_total": int(source_items_total or 0),
-        "posts_fetched_24h": int(posts_fetched_24h or 0),
-        "source_items_fetched_24h": int(source_items_fetched_24h or 0),
-        "subreddits_total": int(subreddits_total or 0),
-        "targets_total": int(targets_total or 0),
-        "targets_monitored": int(targets_monitored or 0),
-        "targets_fetched": int(targets_fetched or 0),
-        "subreddits_monitored": int(subreddits_monitored or 0),
-        "subreddits_fetched": int(subreddits_fetched or 0),
-        "tags_total": int(tags_total or 0),
-        "analyses_valuable_total": int(analyses_valuable_total or 0),
-        "source_analyses_valuable_total": int(source_analyses_valuable_total or 0),
-    }
 
+@router.get("/cache")
+async def get_cache_stats():
+    """返回响应缓存的条目数与各命名空间命中/未命中计数。"""
+    return response_cache.stats()
+
+
+@router.get("/pool")
+async def get_pool_stats():
+    """返回数据库连接池占用与借出等待统计。"""
+    return pool_stats()
+
+
+@router.get("/timeseries", response_model=List[TimeseriesPoint])
+async def get_dashboard_timeseries(
+    hours: int = Query(48, ge=1, le=24 * 90),
+    interval: str = Query("hour", pattern="^(hour|day)$"),
+    source: Optional[str] = None,
+    target_id: Optional[int] = Query(None, ge=0),
+    tag_id: Optional[int] = Query(None, ge=1),
+    group_by_source: bool = False,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """返回入库/分析趋势（新增内容、新增评论、有价值分析、抓取失败）。
+
+    参数：
+        hours: 回看窗口（小时）。
+        interval: 时间粒度，``hour`` 或 ``day``。
+        source: 可选平台过滤。
+        target_id: 可选目标过滤，``0`` 表示未关联目标的内容。
+        tag_id: 可选标签过滤。
+        group_by_source: 是否按平台拆分序列。
+        db: 异步数据库会话。
+
+    返回：
+        List[TimeseriesPoint]: 按时间升序的数据点，无数据的时间段不返回。
+    """
+    return await list_timeseries(
+        db,
+        hours=hours,
+        interval=interval,
+        source=source,
+        target_id=target_id,
+        tag_id=tag_id,
+        group_by_source=group_by_source,
+    )
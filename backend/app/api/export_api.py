@@ -0,0 +1,73 @@
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.database import read_session
+from app.services.export_service import (
+    EXPORT_FORMATS,
+    EXPORT_KINDS,
+    EXPORT_MEDIA_TYPES,
+    build_export_query,
+    export_columns,
+    iter_export_batches,
+    stream_csv,
+    stream_ndjson,
+)
+
+router = APIRouter()
+
+# 每批从服务端游标读取的行数
+EXPORT_BATCH_SIZE = 1000
+
+
+@router.get("")
+async def export_data(
+    kind: str = Query("items", description="items / comments / analyses"),
+    format: str = Query("ndjson", description="ndjson / csv"),
+    source: Optional[str] = None,
+    target_id: Optional[int] = None,
+    tag_id: List[int] = Query([], description="命中任一标签即导出，可重复"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    """流式导出内容、评论或分析结果（NDJSON / CSV）。
+
+    数据经服务端游标分批读取、逐批写出，内存占用与导出量无关；不保证行顺序。
+    会话在响应体生成器内打开，整个传输期间保持同一事务快照。
+
+    参数：
+        kind: 导出对象。
+        format: 输出格式。
+        source: 平台过滤。
+        target_id: 目标过滤（评论/分析按所属内容过滤）。
+        tag_id: 标签过滤（按所属内容）。
+        since: 起始时间（含，作用于各自的 ``created_at``）。
+        until: 截止时间（不含）。
+
+    返回：
+        StreamingResponse: ``application/x-ndjson`` 或 ``text/csv`` 附件。
+    """
+    if kind not in EXPORT_KINDS:
+        raise HTTPException(status_code=400, detail=f"Unsupported kind: {kind}")
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format: {format}")
+    if since and until and since >= until:
+        raise HTTPException(status_code=400, detail="since must be earlier than until")
+
+    query = build_export_query(kind, source=source, target_id=target_id, tag_ids=tag_id, since=since, until=until)
+
+    async def body():
+        async with read_session() as db:
+            batches = iter_export_batches(db, query, kind=kind, batch_size=EXPORT_BATCH_SIZE)
+            chunks = stream_csv(batches, export_columns(query)) if format == "csv" else stream_ndjson(batches)
+            async for chunk in chunks:
+                yield chunk
+
+    filename = f"{kind}-{datetime.utcnow():%Y%m%d%H%M%S}.{format}"
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -2,17 +2,21 @@
 
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.database import get_db
+from app.api.caching import cached_json, is_not_modified, json_with_etag, not_modified_response, weak_etag
+from app.api.pagination import paginate, set_next_cursor
+from app.database import get_db, get_read_db
+from app.models.payloads import PostPayload
 from app.models.posts import Post
 from app.models.source_items import SourceItem
 from app.models.tags import Tag
-from app.schemas.posts_schemas import PostResponse, PostTagsUpdate
+from app.schemas.posts_schemas import PostDetailResponse, PostResponse, PostTagsUpdate
 from app.schemas.tags_schemas import TagResponse
+from app.services.cache_service import CACHE_ITEMS, CACHE_POSTS, CACHE_TAGS, invalidate_on_commit
 
 router = APIRouter()
 
@@ -48,13 +52,15 @@ def _to_post_response_from_source_item(item: SourceItem) -> PostResponse:
 @router.get("", response_model=List[PostResponse])
 @router.get("/", response_model=List[PostResponse])
 async def list_posts(
+    request: Request,
     source: Optional[str] = None,
     target_id: Optional[int] = None,
     subreddit_id: Optional[int] = None,
     tag_id: Optional[int] = None,
+    cursor: Optional[str] = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """查询帖子列表（默认走统一多源模型）。
 
@@ -63,43 +69,91 @@ async def list_posts(
         target_id: 可选目标 ID（统一模型）。
         subreddit_id: 旧版 subreddit ID，仅用于 legacy 兼容。
         tag_id: 可选标签过滤。
+        cursor: 可选游标（``X-Next-Cursor`` 响应头返回），传入时忽略 ``skip``。
         skip: 分页偏移。
         limit: 分页大小。
         db: 异步数据库会话。
 
     Returns:
-        List[PostResponse]: 统一格式的帖子列表。
+        List[PostResponse]: 统一格式的帖子列表（按查询参数缓存，入库或标签变更后失效）。
     """
+
+    async def build(response: Response):
+        return await _query_posts(
+            response,
+            source=source,
+            target_id=target_id,
+            subreddit_id=subreddit_id,
+            tag_id=tag_id,
+            cursor=cursor,
+            skip=skip,
+            limit=limit,
+            db=db,
+        )
+
+    return await cached_json(
+        request,
+        namespace=CACHE_POSTS,
+        depends_on=(CACHE_ITEMS, CACHE_POSTS, CACHE_TAGS),
+        build=build,
+    )
+
+
+async def _query_posts(
+    response: Response,
+    *,
+    source: Optional[str],
+    target_id: Optional[int],
+    subreddit_id: Optional[int],
+    tag_id: Optional[int],
+    cursor: Optional[str],
+    skip: int,
+    limit: int,
+    db: AsyncSession,
+) -> List[PostResponse]:
+    """执行帖子列表查询（统一模型或 legacy 旧表）。"""
     # 默认返回统一模型，确保多源场景下不丢 HN 等平台内容。
     # 当传入 legacy 的 subreddit_id（且目标未指定）时，回退旧表查询以兼容旧筛选行为。
     use_legacy_posts = subreddit_id is not None and target_id is None and source in (None, "reddit")
     use_unified_source_items = not use_legacy_posts
 
     if use_unified_source_items:
-        query = (
-            select(SourceItem)
-            .options(selectinload(SourceItem.tags))
-            .order_by(SourceItem.fetched_at.desc())
-        )
+        query = select(SourceItem).options(selectinload(SourceItem.tags))
         if source:
             query = query.where(SourceItem.source == source)
         if target_id:
             query = query.where(SourceItem.target_id == target_id)
         if tag_id:
             query = query.where(SourceItem.tags.any(Tag.id == tag_id))
-        query = query.offset(skip).limit(limit)
+        query = paginate(
+            query,
+            sort_column=SourceItem.fetched_at,
+            id_column=SourceItem.id,
+            cursor=cursor,
+            skip=skip,
+            limit=limit,
+        )
         result = await db.execute(query)
         rows = result.scalars().all()
+        set_next_cursor(response, rows, sort_attr="fetched_at", limit=limit)
         return [_to_post_response_from_source_item(row) for row in rows]
 
-    query = select(Post).options(selectinload(Post.tags)).order_by(Post.fetched_at.desc())
+    query = select(Post).options(selectinload(Post.tags))
     if subreddit_id:
         query = query.where(Post.subreddit_id == subreddit_id)
     if tag_id:
         query = query.where(Post.tags.any(Tag.id == tag_id))
-    query = query.offset(skip).limit(limit)
+    query = paginate(
+        query,
+        sort_column=Post.fetched_at,
+        id_column=Post.id,
+        cursor=cursor,
+        skip=skip,
+        limit=limit,
+    )
     result = await db.execute(query)
     rows = result.scalars().all()
+    set_next_cursor(response, rows, sort_attr="fetched_at", limit=limit)
     return [
         PostResponse(
             id=row.id,
@@ -122,16 +176,40 @@ async def list_posts(
     ]
 
 
-@router.get("/{post_id}", response_model=PostResponse)
-async def get_post(post_id: int, db: AsyncSession = Depends(get_db)):
-    """按 ID 获取单条旧版帖子。"""
+@router.get("/{post_id}", response_model=PostDetailResponse)
+async def get_post(
+    post_id: int,
+    request: Request,
+    include_payload: bool = False,
+    db: AsyncSession = Depends(get_db),
+):
+    """按 ID 获取单条旧版帖子，支持 ``If-None-Match`` 条件请求。
+
+    Args:
+        post_id: 旧版帖子 ID。
+        request: 当前请求。
+        include_payload: 是否附带原始 payload（仅详情请求按需加载）。
+        db: 异步数据库会话。
+
+    Returns:
+        PostDetailResponse: 帖子详情。
+    """
     result = await db.execute(
         select(Post).options(selectinload(Post.tags)).where(Post.id == post_id)
     )
     post = result.scalar_one_or_none()
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
-    return post
+
+    response = PostDetailResponse.model_validate(post)
+    etag = weak_etag(response.model_dump_json().encode("utf-8"), b"payload" if include_payload else b"")
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    if include_payload:
+        response.raw_payload = await db.scalar(
+            select(PostPayload.payload).where(PostPayload.post_id == post_id)
+        )
+    return json_with_etag(request, response, etag=etag)
 
 
 @router.get("/{post_id}/tags", response_model=List[TagResponse])
@@ -154,6 +232,7 @@ async def set_post_tags(
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
 
+    invalidate_on_commit(db, CACHE_POSTS)
     if not payload.tag_ids:
         post.tags.clear()
         await db.commit()
@@ -0,0 +1,20 @@
+"""基于 orjson 的 JSON 响应类。"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    """使用 orjson 渲染的 JSON 响应。
+
+    orjson 原生支持 dict/list/datetime 等类型，比标准库 ``json`` 快数倍；
+    pydantic 模型、ORM 实体等其余类型回退到 ``jsonable_encoder``。
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=jsonable_encoder, option=orjson.OPT_NON_STR_KEYS)
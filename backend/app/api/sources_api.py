@@ -1,38 +1,91 @@
 ﻿from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from datetime import datetime
 from typing import List, Optional
 
-from app.database import get_db
+from app.api.caching import cached_json, is_not_modified, json_with_etag, not_modified_response, weak_etag
+from app.api.pagination import (
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    decode_path_cursor,
+    encode_cursor,
+    encode_path_cursor,
+    paginate,
+    set_next_cursor,
+)
+from app.api.responses import FastJSONResponse
+from app.database import get_db, get_read_db
 from app.models.source_items import SourceItem
 from app.models.source_comments import SourceComment
+from app.models.source_payloads import SourceCommentPayload, SourceItemPayload
 from app.models.source_targets import SourceTarget
 from app.models.tags import Tag
 from app.schemas.sources_schemas import (
     FetchTargetRequest,
+    RisingItemMetricResponse,
+    RisingItemResponse,
+    SourceCommentDetailResponse,
     SourceCommentResponse,
+    SourceCommentTreeNode,
+    SourceCommentTreeResponse,
+    SourceItemClusterResponse,
+    SourceItemDetailResponse,
+    SourceItemMetricResponse,
     SourceItemResponse,
+    SourceItemSearchHit,
+    SourceItemTagsBulkResult,
+    SourceItemTagsBulkUpdate,
     SourceItemTagsUpdate,
+    SourceCommentSearchHit,
+    SourceSearchResponse,
     SourceTargetCreate,
     SourceTargetResponse,
     SourceTargetUpdate,
 )
 from app.schemas.tags_schemas import TagResponse
+from app.services.autocomplete_service import AUTOCOMPLETE_MODES, autocomplete_targets
+from app.services.cache_service import (
+    CACHE_CAPABILITIES,
+    CACHE_ITEMS,
+    CACHE_TAGS,
+    invalidate_on_commit,
+)
+from app.services.canonical_url_service import list_clusters, list_duplicates
+from app.services.comment_tree_service import list_descendants, list_thread_comments, load_comment_tree
+from app.services.item_metrics_service import (
+    list_fastest_rising,
+    list_item_metrics,
+    list_rising_items,
+)
+from app.services.rollup_service import record_fetch_error
+from app.services.search_service import SEARCH_SORTS, search_comments, search_items
 from app.services.source_fetch_service import fetch_and_ingest_target
 from app.services.source_registry_service import source_registry
+from app.services.tagging_service import bulk_update_item_tags, find_missing_tags, item_scope
 
 router = APIRouter()
 
 
 @router.get("/capabilities")
-async def list_source_capabilities():
-    """返回各平台适配器能力描述。"""
-    return {
-        "sources": [adapter.capabilities() for adapter in source_registry.all().values()]
-    }
+async def list_source_capabilities(request: Request):
+    """返回各平台适配器能力描述（进程内静态数据，缓存 1 小时）。"""
+
+    async def build(_: Response):
+        return {
+            "sources": [adapter.capabilities() for adapter in source_registry.all().values()]
+        }
+
+    return await cached_json(
+        request,
+        namespace=CACHE_CAPABILITIES,
+        depends_on=(CACHE_CAPABILITIES,),
+        build=build,
+        ttl=3600,
+    )
 
 
 @router.get("/targets", response_model=List[SourceTargetResponse])
@@ -115,6 +168,29 @@ async def create_target(payload: SourceTargetCreate, db: AsyncSession = Depends(
     return target
 
 
+@router.get("/targets/autocomplete", response_model=List[SourceTargetResponse])
+async def autocomplete_target(
+    q: str = Query(..., min_length=1, max_length=200),
+    mode: str = Query("prefix", pattern=f"^({'|'.join(AUTOCOMPLETE_MODES)})$"),
+    source: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_db),
+):
+    """按 ``target_key`` / ``display_name`` 自动补全目标（前缀或模糊匹配）。
+
+    参数：
+        q: 用户输入。
+        mode: ``prefix`` 前缀匹配，``fuzzy`` trigram 相似度匹配。
+        source: 可选平台过滤。
+        limit: 返回条数。
+        db: 异步数据库会话。
+
+    返回：
+        List[SourceTargetResponse]: 匹配的目标列表。
+    """
+    return await autocomplete_targets(db, q=q, mode=mode, source=source, limit=limit)
+
+
 @router.get("/targets/{target_id}", response_model=SourceTargetResponse)
 async def get_target(target_id: int, db: AsyncSession = Depends(get_db)):
     """按 ID 获取统一目标。"""
@@ -154,12 +230,28 @@ async def delete_target(target_id: int, db: AsyncSession = Depends(get_db)):
     return {"message": "Deleted"}
 
 
-@router.post("/fetch")
-async def fetch_target(payload: FetchTargetRequest, db: AsyncSession = Depends(get_db)):
+def _strip_payloads(item: dict) -> dict:
+    """去掉内容及其内嵌评论的原始 ``payload``。"""
+    item = {k: v for k, v in item.items() if k != "payload"}
+    if isinstance(item.get("comments"), list):
+        item["comments"] = [
+            {k: v for k, v in comment.items() if k != "payload"} if isinstance(comment, dict) else comment
+            for comment in item["comments"]
+        ]
+    return item
+
+
+@router.post("/fetch", response_class=FastJSONResponse)
+async def fetch_target(
+    payload: FetchTargetRequest,
+    verbose: bool = Query(True, description="为 false 时不返回平台原始 payload"),
+    db: AsyncSession = Depends(get_db),
+):
     """通过统一抓取链路抓取一个目标。
 
     参数：
         payload: 抓取请求，可传 ``target_id`` 或三元组参数。
+        verbose: 是否返回平台原始 payload（体积通常占响应的大部分）。
         db: 异步数据库会话。
 
     返回：
@@ -197,47 +289,311 @@ async def fetch_target(payload: FetchTargetRequest, db: AsyncSession = Depends(g
         )
     except Exception as exc:
         await db.rollback()
+        await record_fetch_error(db, source=source, target_id=payload.target_id)
         raise HTTPException(status_code=500, detail=str(exc))
 
-    return {
-        "target": result["target"],
-        "items": result["items"],
+    items = result["items"] if verbose else [_strip_payloads(item) for item in result["items"]]
+    return FastJSONResponse({
+        "target": SourceTargetResponse.model_validate(result["target"]),
+        "items": items,
         "saved": result["saved"],
-    }
+    })
+
+
+@router.get("/search", response_model=SourceSearchResponse)
+async def search_sources(
+    q: str = Query(..., min_length=1, max_length=200),
+    scope: str = Query("all", pattern="^(all|items|comments)$"),
+    source: Optional[str] = None,
+    target_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    sort: str = Query("rank", pattern=f"^({'|'.join(SEARCH_SORTS)})$"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """全文检索统一内容与评论。
+
+    参数：
+        q: 检索词，支持 websearch 语法（``"短语"``、``or``、``-排除``）。
+        scope: 检索范围，``all`` / ``items`` / ``comments``。
+        source: 可选平台过滤。
+        target_id: 可选目标过滤。
+        since: 发布时间下界（含）；对评论检索可显著缩小扫描的分区。
+        until: 发布时间上界（不含）。
+        sort: ``rank`` 按相关度，``recent`` 按发布时间倒序。
+        skip: 偏移量（内容与评论分别计算）。
+        limit: 每类返回条数。
+        db: 异步数据库会话。
+
+    返回：
+        SourceSearchResponse: 命中列表，``snippet`` 中命中词以 ``<mark>`` 包裹。
+    """
+    filters = dict(
+        q=q,
+        source=source,
+        target_id=target_id,
+        since=since,
+        until=until,
+        sort=sort,
+        skip=skip,
+        limit=limit,
+    )
+    response = SourceSearchResponse(query=q)
+    if scope in ("all", "items"):
+        response.items = [
+            SourceItemSearchHit.model_validate(item).model_copy(update={"rank": rank, "snippet": snippet})
+            for item, rank, snippet in await search_items(db, **filters)
+        ]
+    if scope in ("all", "comments"):
+        response.comments = [
+            SourceCommentSearchHit.model_validate(comment).model_copy(update={"rank": rank, "snippet": snippet})
+            for comment, rank, snippet in await search_comments(db, **filters)
+        ]
+    return response
 
 
 @router.get("/items", response_model=List[SourceItemResponse])
 async def list_items(
+    request: Request,
     source: Optional[str] = None,
     target_id: Optional[int] = None,
     tag_id: Optional[int] = None,
+    cursor: Optional[str] = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=200),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """查询统一内容列表。
+
+    传入 ``cursor`` 时按 ``(fetched_at, id)`` 游标分页，下一页游标见 ``X-Next-Cursor`` 响应头。
+    结果按查询参数缓存，入库或标签变更后失效。
+    """
+
+    async def build(response: Response):
+        query = select(SourceItem).options(selectinload(SourceItem.tags))
+        if source:
+            query = query.where(SourceItem.source == source)
+        if target_id:
+            query = query.where(SourceItem.target_id == target_id)
+        if tag_id:
+            query = query.where(SourceItem.tags.any(Tag.id == tag_id))
+        query = paginate(
+            query,
+            sort_column=SourceItem.fetched_at,
+            id_column=SourceItem.id,
+            cursor=cursor,
+            skip=skip,
+            limit=limit,
+        )
+        result = await db.execute(query)
+        rows = result.scalars().all()
+        set_next_cursor(response, rows, sort_attr="fetched_at", limit=limit)
+        return [SourceItemResponse.model_validate(row) for row in rows]
+
+    return await cached_json(request, namespace=CACHE_ITEMS, depends_on=(CACHE_ITEMS, CACHE_TAGS), build=build)
+
+
+# 单次按 ID 批量操作的上限；更大范围请使用 filter
+BULK_TAG_MAX_ITEM_IDS = 10000
+
+
+@router.post("/items/tags:bulk", response_model=SourceItemTagsBulkResult)
+async def bulk_update_tags(payload: SourceItemTagsBulkUpdate, db: AsyncSession = Depends(get_db)):
+    """批量为统一内容增删标签（集合操作，单个事务）。
+
+    参数：
+        payload: ``item_ids`` 或 ``filter`` 二选一圈定内容，``add_tag_ids`` / ``remove_tag_ids`` 为增删标签。
+        db: 异步数据库会话。
+
+    返回：
+        SourceItemTagsBulkResult: 圈定内容数与实际新增/删除的绑定数。
+    """
+    if (payload.item_ids is None) == (payload.filter is None):
+        raise HTTPException(status_code=400, detail="Exactly one of item_ids or filter is required")
+    if not payload.add_tag_ids and not payload.remove_tag_ids:
+        raise HTTPException(status_code=400, detail="add_tag_ids or remove_tag_ids is required")
+    overlap = sorted(set(payload.add_tag_ids) & set(payload.remove_tag_ids))
+    if overlap:
+        raise HTTPException(status_code=400, detail=f"Tag both added and removed: {overlap}")
+    if payload.item_ids is not None and len(payload.item_ids) > BULK_TAG_MAX_ITEM_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_TAG_MAX_ITEM_IDS} item_ids per request")
+
+    if payload.filter is not None:
+        scope = item_scope(**payload.filter.model_dump(exclude_none=True))
+        if not scope:
+            # 防止误操作全表（空字符串、0 等空值也不构成条件）
+            raise HTTPException(status_code=400, detail="filter must not be empty")
+    else:
+        scope = item_scope(item_ids=payload.item_ids)
+
+    missing_ids = await find_missing_tags(db, [*payload.add_tag_ids, *payload.remove_tag_ids])
+    if missing_ids:
+        raise HTTPException(status_code=400, detail=f"Tag not found: {missing_ids}")
+
+    result = await bulk_update_item_tags(
+        db,
+        scope=scope,
+        add_tag_ids=payload.add_tag_ids,
+        remove_tag_ids=payload.remove_tag_ids,
+    )
+    await db.commit()
+    return result
+
+
+@router.get("/items/rising", response_model=List[RisingItemResponse])
+async def list_rising(
+    source: Optional[str] = None,
+    target_id: Optional[int] = None,
+    hours: int = Query(24, ge=1, le=24 * 7),
+    limit: int = Query(20, ge=1, le=200),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """按分数/评论速度排序返回正在上升的内容（跨 Reddit 与 HN）。
+
+    参数：
+        source: 可选平台过滤。
+        target_id: 可选目标过滤。
+        hours: 仅包含该窗口内速度有更新的内容。
+        limit: 返回条数。
+        db: 异步数据库会话。
+
+    返回：
+        List[RisingItemResponse]: 按 ``rising_score`` 倒序的内容列表。
+    """
+    return await list_rising_items(db, hours=hours, source=source, target_id=target_id, limit=limit)
+
+
+@router.get("/items/clusters", response_model=List[SourceItemClusterResponse])
+async def list_item_clusters(
+    min_size: int = Query(2, ge=2, le=100),
+    cross_source: bool = True,
+    source: Optional[str] = None,
+    since: Optional[datetime] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """列出指向同一外链的内容簇（如同一链接在 Reddit 与 HN 的讨论）。
+
+    参数：
+        min_size: 簇内最少内容数。
+        cross_source: 是否只返回跨平台的簇。
+        source: 只返回包含该平台内容的簇。
+        since: 只统计该时间之后发布的内容。
+        skip: 偏移量。
+        limit: 返回簇数。
+        db: 异步数据库会话。
+
+    返回：
+        List[SourceItemClusterResponse]: 按最近发布时间倒序的内容簇。
+    """
+    return await list_clusters(
+        db,
+        min_size=min_size,
+        cross_source=cross_source,
+        source=source,
+        since=since,
+        skip=skip,
+        limit=limit,
+    )
+
+
+@router.get("/metrics/rising", response_model=List[RisingItemMetricResponse])
+async def list_rising_metrics(
+    hours: int = Query(24, ge=1, le=24 * 31),
+    metric: str = Query("score", pattern="^(score|comments)$"),
+    source: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """查询窗口内分数/评论增长最快的内容（基于指标时间序列）。
+
+    参数：
+        hours: 回看窗口（小时）。
+        metric: 排序指标，``score`` 或 ``comments``。
+        source: 可选平台过滤。
+        limit: 返回条数。
+        db: 异步数据库会话。
+
+    返回：
+        List[RisingItemMetricResponse]: 按速度倒序的内容列表。
+    """
+    rows = await list_fastest_rising(db, hours=hours, metric=metric, source=source, limit=limit)
+    return [
+        RisingItemMetricResponse(
+            metric=SourceItemMetricResponse.model_validate(sample),
+            item=SourceItemResponse.model_validate(item),
+        )
+        for sample, item in rows
+    ]
+
+
+@router.get("/items/{item_id}", response_model=SourceItemDetailResponse)
+async def get_item(
+    item_id: int,
+    request: Request,
+    include_payload: bool = False,
     db: AsyncSession = Depends(get_db),
 ):
-    """查询统一内容列表。"""
-    query = select(SourceItem).options(selectinload(SourceItem.tags)).order_by(SourceItem.fetched_at.desc())
-    if source:
-        query = query.where(SourceItem.source == source)
-    if target_id:
-        query = query.where(SourceItem.target_id == target_id)
-    if tag_id:
-        query = query.where(SourceItem.tags.any(Tag.id == tag_id))
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
-    return result.scalars().all()
+    """按 ID 获取统一内容（含标签），支持 ``If-None-Match`` 条件请求。
 
+    ETag 由不含 payload 的详情内容计算：payload 与内容同时入库，``fetched_at`` 未变则
+    payload 也未变，因此命中 304 时无需读取 payload。
 
-@router.get("/items/{item_id}", response_model=SourceItemResponse)
-async def get_item(item_id: int, db: AsyncSession = Depends(get_db)):
-    """按 ID 获取统一内容（含标签）。"""
+    参数：
+        item_id: 内容 ID。
+        request: 当前请求。
+        include_payload: 是否附带原始 payload（仅详情请求按需加载）。
+        db: 异步数据库会话。
+
+    返回：
+        SourceItemDetailResponse: 内容详情。
+    """
     result = await db.execute(
         select(SourceItem).options(selectinload(SourceItem.tags)).where(SourceItem.id == item_id)
     )
     item = result.scalar_one_or_none()
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
-    return item
+
+    response = SourceItemDetailResponse.model_validate(item)
+    etag = weak_etag(response.model_dump_json().encode("utf-8"), b"payload" if include_payload else b"")
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    if include_payload:
+        # 携带分区键，只命中一个 payload 分区
+        response.raw_payload = await db.scalar(
+            select(SourceItemPayload.payload).where(
+                SourceItemPayload.item_id == item_id,
+                SourceItemPayload.created_at == item.created_at,
+            )
+        )
+    return json_with_etag(request, response, etag=etag)
+
+
+@router.get("/items/{item_id}/metrics", response_model=List[SourceItemMetricResponse])
+async def list_item_metric_history(
+    item_id: int,
+    since: Optional[datetime] = None,
+    limit: int = Query(500, ge=1, le=5000),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """查询单条内容的分数/评论数变化轨迹（按时间升序）。"""
+    item_exists = await db.scalar(select(SourceItem.id).where(SourceItem.id == item_id))
+    if not item_exists:
+        raise HTTPException(status_code=404, detail="Item not found")
+    return await list_item_metrics(db, item_id=item_id, since=since, limit=limit)
+
+
+@router.get("/items/{item_id}/duplicates", response_model=List[SourceItemResponse])
+async def list_item_duplicates(item_id: int, db: AsyncSession = Depends(get_read_db)):
+    """查询与该内容指向同一外链的其他内容（按发布时间升序）。"""
+    item = await db.get(SourceItem, item_id)
+    if not item:
+        raise HTTPException(status_code=404, detail="Item not found")
+    return await list_duplicates(db, item)
 
 
 @router.get("/items/{item_id}/tags", response_model=List[TagResponse])
@@ -256,6 +612,7 @@ async def set_item_tags(item_id: int, payload: SourceItemTagsUpdate, db: AsyncSe
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
 
+    invalidate_on_commit(db, CACHE_ITEMS)
     if not payload.tag_ids:
         item.tags.clear()
         await db.commit()
@@ -278,21 +635,159 @@ async def set_item_tags(item_id: int, payload: SourceItemTagsUpdate, db: AsyncSe
 @router.get("/items/{item_id}/comments", response_model=List[SourceCommentResponse])
 async def list_item_comments(
     item_id: int,
+    response: Response,
+    order: str = Query("created", pattern="^(created|thread)$"),
+    top_level: bool = False,
+    cursor: Optional[str] = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """查询统一内容下的评论列表。"""
-    item = await db.get(SourceItem, item_id)
-    if not item:
+    """查询统一内容下的评论列表。
+
+    ``order=created`` 按 ``(created_at, id)`` 升序，传入 ``cursor`` 时走游标分页；
+    ``order=thread`` 按物化路径输出线程视图（深度优先，仅支持游标分页，不接受 ``skip``）。
+    ``top_level=true`` 只返回顶层评论。下一页游标见 ``X-Next-Cursor`` 响应头。
+    """
+    if order == "thread" and skip:
+        raise HTTPException(status_code=400, detail="skip is not supported with order=thread; use cursor")
+    if not await db.scalar(select(SourceItem.id).where(SourceItem.id == item_id)):
         raise HTTPException(status_code=404, detail="Item not found")
 
-    query = (
-        select(SourceComment)
-        .where(SourceComment.item_id == item_id)
-        .order_by(SourceComment.created_at.asc())
-        .offset(skip)
-        .limit(limit)
+    if order == "thread":
+        rows = await list_thread_comments(
+            db,
+            item_id=item_id,
+            top_level_only=top_level,
+            after_path=decode_path_cursor(cursor) if cursor else None,
+            limit=limit,
+        )
+        if len(rows) == limit:
+            response.headers[NEXT_CURSOR_HEADER] = encode_path_cursor(rows[-1].thread_path)
+        return rows
+
+    # 不加发布时间下界：评论可能早于所属内容（时钟偏差、时间缺省回退），由 item_id 索引定位
+    base = select(SourceComment).where(SourceComment.item_id == item_id)
+    if top_level:
+        base = base.where(SourceComment.parent_id.is_(None))
+    query = paginate(
+        base,
+        sort_column=SourceComment.created_at,
+        id_column=SourceComment.id,
+        cursor=cursor,
+        skip=skip,
+        limit=limit,
+        descending=False,
     )
     result = await db.execute(query)
-    return result.scalars().all()
+    rows = result.scalars().all()
+    set_next_cursor(response, rows, sort_attr="created_at", limit=limit)
+    return rows
+
+
+def _tree_node(node: dict) -> SourceCommentTreeNode:
+    """把服务层的树节点转换为响应模型（子树游标编码为不透明字符串）。"""
+    after = node["replies_after"]
+    return SourceCommentTreeNode(
+        **SourceCommentResponse.model_validate(node["comment"]).model_dump(),
+        replies=[_tree_node(child) for child in node["replies"]],
+        has_more_replies=node["has_more_replies"],
+        replies_cursor=encode_cursor(*after) if after else None,
+    )
+
+
+@router.get("/items/{item_id}/comment-tree", response_model=SourceCommentTreeResponse)
+async def get_item_comment_tree(
+    item_id: int,
+    parent_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    max_depth: int = Query(3, ge=1, le=8),
+    max_children: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """以嵌套结构返回统一内容的评论树（递归 CTE，一次只展开有限的一段）。
+
+    参数：
+        item_id: 内容 ID。
+        parent_id: 子树根评论 ID；不传时从顶层评论开始。
+        cursor: 起始层的分页游标（上一次响应的 ``next_cursor`` 或节点的 ``replies_cursor``）。
+        max_depth: 向下展开的层数。
+        max_children: 每个节点最多返回的回复数。
+        db: 异步数据库会话。
+
+    返回：
+        SourceCommentTreeResponse: 评论树片段及起始层的下一页游标。
+    """
+    if not await db.scalar(select(SourceItem.id).where(SourceItem.id == item_id)):
+        raise HTTPException(status_code=404, detail="Item not found")
+    if parent_id is not None:
+        parent_item_id = await db.scalar(select(SourceComment.item_id).where(SourceComment.id == parent_id))
+        if parent_item_id != item_id:
+            raise HTTPException(status_code=404, detail="Comment not found")
+
+    tree = await load_comment_tree(
+        db,
+        item_id=item_id,
+        parent_id=parent_id,
+        after=decode_cursor(cursor) if cursor else None,
+        max_depth=max_depth,
+        max_children=max_children,
+    )
+    return SourceCommentTreeResponse(
+        item_id=item_id,
+        parent_id=parent_id,
+        comments=[_tree_node(node) for node in tree["nodes"]],
+        next_cursor=encode_cursor(*tree["after"]) if tree["after"] else None,
+    )
+
+
+@router.get("/comments/{comment_id}/descendants", response_model=List[SourceCommentResponse])
+async def list_comment_descendants(
+    comment_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """按线程视图顺序返回某条评论的全部后代（物化路径上的一次范围扫描）。
+
+    下一页游标见 ``X-Next-Cursor`` 响应头。
+    """
+    comment = await db.get(SourceComment, comment_id)
+    if not comment:
+        raise HTTPException(status_code=404, detail="Comment not found")
+    rows = await list_descendants(
+        db,
+        comment=comment,
+        after_path=decode_path_cursor(cursor) if cursor else None,
+        limit=limit,
+    )
+    if len(rows) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_path_cursor(rows[-1].thread_path)
+    return rows
+
+
+@router.get("/comments/{comment_id}", response_model=SourceCommentDetailResponse)
+async def get_comment(
+    comment_id: int,
+    request: Request,
+    include_payload: bool = False,
+    db: AsyncSession = Depends(get_db),
+):
+    """按 ID 获取统一评论，可按需附带原始 payload，支持 ``If-None-Match`` 条件请求。"""
+    comment = await db.get(SourceComment, comment_id)
+    if not comment:
+        raise HTTPException(status_code=404, detail="Comment not found")
+
+    response = SourceCommentDetailResponse.model_validate(comment)
+    etag = weak_etag(response.model_dump_json().encode("utf-8"), b"payload" if include_payload else b"")
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    if include_payload:
+        response.raw_payload = await db.scalar(
+            select(SourceCommentPayload.payload).where(
+                SourceCommentPayload.comment_id == comment_id,
+                SourceCommentPayload.created_at == comment.created_at,
+            )
+        )
+    return json_with_etag(request, response, etag=etag)
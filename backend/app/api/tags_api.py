@@ -1,24 +1,90 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete
-from typing import List
+import re
+from typing import List, Optional
 
+from app.api.caching import cached_json
 from app.database import get_db
 from app.models.tags import Tag, AnalysisTag
+from app.models.tag_rules import TagRule
 from app.models.post_tag_associations import post_tags
 from app.models.source_item_tag_associations import source_item_tags
-from app.schemas.tags_schemas import TagCreate, TagResponse
+from app.schemas.tags_schemas import TagCreate, TagResponse, TagRuleCreate, TagRuleResponse
+from app.services.autocomplete_service import AUTOCOMPLETE_MODES, autocomplete_tags
+from app.services.cache_service import CACHE_ITEMS, CACHE_POSTS, CACHE_TAGS, invalidate_on_commit
+from app.services.tag_rule_service import TAG_RULE_KINDS, invalidate_tag_rules
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[TagResponse])
-async def list_tags(db: AsyncSession = Depends(get_db)):
-    """查询所有标签。"""
-    result = await db.execute(select(Tag))
+async def list_tags(request: Request, db: AsyncSession = Depends(get_db)):
+    """查询所有标签（缓存，标签增删或入库新建标签后失效）。"""
+
+    async def build(_: Response):
+        result = await db.execute(select(Tag))
+        return [TagResponse.model_validate(tag) for tag in result.scalars().all()]
+
+    return await cached_json(request, namespace=CACHE_TAGS, depends_on=(CACHE_TAGS,), build=build)
+
+
+@router.get("/autocomplete", response_model=List[TagResponse])
+async def autocomplete_tag(
+    q: str = Query(..., min_length=1, max_length=50),
+    mode: str = Query("prefix", pattern=f"^({'|'.join(AUTOCOMPLETE_MODES)})$"),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_db),
+):
+    """按标签名自动补全（``prefix`` 前缀匹配，``fuzzy`` trigram 相似度匹配）。"""
+    return await autocomplete_tags(db, q=q, mode=mode, limit=limit)
+
+
+@router.get("/rules", response_model=List[TagRuleResponse])
+async def list_tag_rules(tag_id: Optional[int] = None, db: AsyncSession = Depends(get_db)):
+    """查询自动打标签规则。"""
+    query = select(TagRule).order_by(TagRule.id)
+    if tag_id:
+        query = query.where(TagRule.tag_id == tag_id)
+    result = await db.execute(query)
     return result.scalars().all()
 
 
+@router.post("/rules", response_model=TagRuleResponse)
+async def create_tag_rule(data: TagRuleCreate, db: AsyncSession = Depends(get_db)):
+    """创建自动打标签规则（只作用于之后入库的内容，历史内容需运行回填脚本）。"""
+    if data.kind not in TAG_RULE_KINDS:
+        raise HTTPException(status_code=400, detail=f"kind must be one of {list(TAG_RULE_KINDS)}")
+    if not data.pattern.strip():
+        raise HTTPException(status_code=400, detail="pattern must not be empty")
+    if data.kind == "regex":
+        try:
+            re.compile(data.pattern, re.IGNORECASE)
+        except re.error as e:
+            raise HTTPException(status_code=400, detail=f"Invalid regex: {e}")
+    if not await db.get(Tag, data.tag_id):
+        raise HTTPException(status_code=400, detail=f"Tag not found: {data.tag_id}")
+
+    rule = TagRule(**data.model_dump())
+    db.add(rule)
+    await db.commit()
+    await db.refresh(rule)
+    invalidate_tag_rules()
+    return rule
+
+
+@router.delete("/rules/{rule_id}")
+async def delete_tag_rule(rule_id: int, db: AsyncSession = Depends(get_db)):
+    """删除自动打标签规则（已打上的标签保留）。"""
+    rule = await db.get(TagRule, rule_id)
+    if not rule:
+        raise HTTPException(status_code=404, detail="Rule not found")
+    await db.delete(rule)
+    await db.commit()
+    invalidate_tag_rules()
+    return {"message": "Deleted"}
+
+
 @router.post("/", response_model=TagResponse)
 async def create_tag(data: TagCreate, db: AsyncSession = Depends(get_db)):
     """创建标签（标签名需唯一）。"""
@@ -29,6 +95,7 @@ async def create_tag(data: TagCreate, db: AsyncSession = Depends(get_db)):
 
     tag = Tag(**data.model_dump())
     db.add(tag)
+    invalidate_on_commit(db, CACHE_TAGS)
     await db.commit()
     await db.refresh(tag)
     return tag
@@ -46,7 +113,11 @@ async def delete_tag(tag_id: int, db: AsyncSession = Depends(get_db)):
     await db.execute(delete(AnalysisTag).where(AnalysisTag.tag_id == tag_id))
     await db.execute(delete(post_tags).where(post_tags.c.tag_id == tag_id))
     await db.execute(delete(source_item_tags).where(source_item_tags.c.tag_id == tag_id))
+    await db.execute(delete(TagRule).where(TagRule.tag_id == tag_id))
 
     await db.delete(tag)
+    # 内容/帖子列表内嵌标签，一并失效
+    invalidate_on_commit(db, CACHE_TAGS, CACHE_ITEMS, CACHE_POSTS)
     await db.commit()
+    invalidate_tag_rules()
     return {"message": "Deleted"}
@@ -1,26 +1,248 @@
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict
+
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.config import settings
+from app.logging_config import get_logger
 
-# 将 postgresql:// 转换为 postgresql+asyncpg://
-database_url = settings.database_url.replace(
-    "postgresql://", "postgresql+asyncpg://"
-)
+logger = get_logger("reddit_trace.database")
 
-engine = create_async_engine(
-    database_url,
-    echo=False,
-    pool_pre_ping=True,
-    pool_recycle=1800,
-)
+
+def _async_url(url: str) -> str:
+    # 将 postgresql:// 转换为 postgresql+asyncpg://
+    return url.replace("postgresql://", "postgresql+asyncpg://")
+
+
+class PoolMetrics:
+    """连接池借出等待时间统计（线程安全）。"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.slow_checkouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        # 指数滑动平均，反映最近的等待水平
+        self.wait_ewma = 0.0
+        self.last_timeout_at = float("-inf")
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            self.wait_ewma = seconds if self.checkouts == 1 else 0.8 * self.wait_ewma + 0.2 * seconds
+            if seconds * 1000 >= settings.db_pool_slow_checkout_ms:
+                self.slow_checkouts += 1
+
+    def observe_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+            self.last_timeout_at = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "slow_checkouts": self.slow_checkouts,
+                "wait_avg_ms": round(self.wait_total / self.checkouts * 1000, 2) if self.checkouts else 0.0,
+                "wait_recent_ms": round(self.wait_ewma * 1000, 2),
+                "wait_max_ms": round(self.wait_max * 1000, 2),
+            }
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """记录借出等待时间（含排队、新建连接与 pre-ping）的连接池。"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def recreate(self):
+        # dispose 会重建连接池，统计沿用
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.metrics.observe_timeout()
+            raise
+        self.metrics.observe(time.perf_counter() - start)
+        return connection
+
+
+def _create_engine(url: str):
+    return create_async_engine(
+        _async_url(url),
+        echo=False,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_pre_ping=True,
+        pool_recycle=settings.db_pool_recycle,
+        # asyncpg 自身与 SQLAlchemy 适配层各有一份预编译语句缓存；经 PgBouncer 事务模式时均需设为 0
+        connect_args={
+            "statement_cache_size": settings.db_statement_cache_size,
+            "prepared_statement_cache_size": settings.db_statement_cache_size,
+        },
+    )
+
+
+database_url = _async_url(settings.database_url)
+
+engine = _create_engine(settings.database_url)
 
 AsyncSessionLocal = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
 
+# 只读副本（可选）：未配置时只读接口也走主库
+read_engine = _create_engine(settings.database_read_url) if settings.database_read_url else None
+
+ReadSessionLocal = (
+    sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False) if read_engine is not None else None
+)
+
+
+def _pool_status(target_engine) -> Dict[str, Any]:
+    pool = target_engine.sync_engine.pool
+    capacity = pool.size() + max(pool._max_overflow, 0)
+    checked_out = pool.checkedout()
+    return {
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "checked_out": checked_out,
+        "idle": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "utilization": round(checked_out / capacity, 4) if capacity else 0.0,
+        **pool.metrics.snapshot(),
+    }
+
+
+def pool_stats() -> Dict[str, Any]:
+    """返回主库（及只读副本）连接池的占用与借出等待统计。"""
+    stats = {"primary": _pool_status(engine)}
+    if read_engine is not None:
+        stats["replica"] = _pool_status(read_engine)
+    return stats
+
+
+def pool_is_saturated() -> bool:
+    """主库连接池是否已饱和：占用率达到阈值、最近借出等待过长，或刚发生过借出超时。"""
+    pool = engine.sync_engine.pool
+    capacity = pool.size() + max(pool._max_overflow, 0)
+    if capacity and pool.checkedout() >= capacity * settings.db_pool_saturation_ratio:
+        return True
+    metrics: PoolMetrics = pool.metrics
+    if metrics.wait_ewma * 1000 >= settings.db_pool_slow_checkout_ms:
+        return True
+    return time.monotonic() - metrics.last_timeout_at < settings.scheduler_backoff_base_seconds
+
+
 Base = declarative_base()
 
+# 复制延迟：WAL 已全部回放时为 0，否则为距最后一次回放事务的秒数；主库上返回 NULL
+_REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE extract(epoch FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+_TRACK_WRITES = "track_writes"
+_HAS_WRITES = "has_writes"
+
+# 进程内副本路由状态（单调时钟秒）
+_read_routing = {
+    "last_write_at": float("-inf"),
+    "replica_retry_at": 0.0,
+    "lag_checked_at": float("-inf"),
+    "lag": 0.0,
+}
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_writes(session: Session, flush_context) -> None:
+    if session.info.get(_TRACK_WRITES):
+        session.info[_HAS_WRITES] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _record_write(session: Session) -> None:
+    if session.info.pop(_HAS_WRITES, False):
+        _read_routing["last_write_at"] = time.monotonic()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_writes(session: Session) -> None:
+    session.info.pop(_HAS_WRITES, None)
+
+
+def _prefer_primary() -> bool:
+    """副本不可用，或刚有接口写入（读己之写窗口内）时读主库。"""
+    now = time.monotonic()
+    if now < _read_routing["replica_retry_at"]:
+        return True
+    return now - _read_routing["last_write_at"] < settings.read_after_write_seconds
+
+
+async def _replica_is_fresh(session: AsyncSession) -> bool:
+    """按间隔检查复制延迟，超过阈值时视为过期。"""
+    now = time.monotonic()
+    if now - _read_routing["lag_checked_at"] >= settings.read_replica_lag_check_seconds:
+        lag = await session.scalar(_REPLICA_LAG_SQL)
+        _read_routing["lag"] = float(lag or 0)
+        _read_routing["lag_checked_at"] = now
+        # 结束检查用的隐式事务，处理函数拿到的是干净的会话
+        await session.rollback()
+    return _read_routing["lag"] <= settings.read_replica_max_lag_seconds
+
+
+async def _open_read_session() -> AsyncSession:
+    if ReadSessionLocal is not None and not _prefer_primary():
+        session = ReadSessionLocal()
+        try:
+            if await _replica_is_fresh(session):
+                return session
+        except (DBAPIError, PoolTimeoutError, OSError) as e:
+            _read_routing["replica_retry_at"] = time.monotonic() + settings.read_replica_retry_seconds
+            logger.warning(f"[DB] 只读副本不可用，{settings.read_replica_retry_seconds}s 内回退主库: {type(e).__name__}: {e}")
+        await session.close()
+    return AsyncSessionLocal()
+
 
 async def get_db():
     async with AsyncSessionLocal() as session:
+        # 接口写入会开启读己之写窗口，期间只读接口改读主库
+        session.info[_TRACK_WRITES] = True
+        yield session
+
+
+@asynccontextmanager
+async def read_session():
+    """只读会话：优先只读副本，副本不可用、延迟过大或处于写后窗口时回退主库。
+
+    流式响应等需要在依赖注入生命周期之外持有会话时直接使用。
+    """
+    session = await _open_read_session()
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+async def get_read_db():
+    """只读接口的会话依赖（路由规则同 ``read_session``）。"""
+    async with read_session() as session:
         yield session
@@ -1,11 +1,15 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 import time
+from sqlalchemy import text
 from sqlalchemy.exc import DBAPIError
 
 from app.api import router
+from app.api.caching import CACHE_STATUS_HEADER, ETAG_HEADER
+from app.api.pagination import NEXT_CURSOR_HEADER
 from app.database import engine, Base
 import app.models  # noqa: F401
 from app.services import scheduler_service
@@ -28,6 +32,8 @@ async def lifespan(app: FastAPI):
     logger.info("[1/2] 初始化数据库...")
     if settings.auto_create_tables:
         async with engine.begin() as conn:
+            # 自动补全的 trigram 索引依赖 pg_trgm 扩展
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
             await conn.run_sync(Base.metadata.create_all)
         logger.info("[1/2] 已执行 Base.metadata.create_all")
     else:
@@ -70,8 +76,27 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, CACHE_STATUS_HEADER, ETAG_HEADER],
 )
 
+# 响应压缩（列表/抓取结果等大 JSON 体积可缩小数倍；小响应不值得压缩）
+if settings.compression_enabled:
+    try:
+        from brotli_asgi import BrotliMiddleware
+    except ImportError:
+        app.add_middleware(
+            GZipMiddleware,
+            minimum_size=settings.compression_min_size,
+            compresslevel=settings.compression_level,
+        )
+    else:
+        app.add_middleware(
+            BrotliMiddleware,
+            minimum_size=settings.compression_min_size,
+            quality=settings.compression_level,
+            gzip_fallback=True,
+        )
+
 # 注册路由
 app.include_router(router, prefix="/api")
 
@@ -6,8 +6,12 @@ from app.models.tags import Tag, AnalysisTag
 from app.models.payloads import PostPayload, CommentPayload
 from app.models.source_targets import SourceTarget
 from app.models.source_items import SourceItem
-from app.models.source_comments import SourceComment, SourceAnalysis
+from app.models.source_item_metrics import SourceItemMetric
+from app.models.source_comments import SourceComment, SourceCommentKey, SourceAnalysis
 from app.models.source_payloads import SourceItemPayload, SourceCommentPayload
+from app.models.source_archives import SourceItemArchive, SourceCommentArchive
+from app.models.ingest_rollups import IngestHourlyRollup
+from app.models.tag_rules import TagRule
 
 __all__ = [
     "Subreddit",
@@ -20,8 +24,14 @@ __all__ = [
     "CommentPayload",
     "SourceTarget",
     "SourceItem",
+    "SourceItemMetric",
     "SourceComment",
+    "SourceCommentKey",
     "SourceAnalysis",
     "SourceItemPayload",
     "SourceCommentPayload",
+    "SourceItemArchive",
+    "SourceCommentArchive",
+    "IngestHourlyRollup",
+    "TagRule",
 ]
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, DateTime, Index, Integer, PrimaryKeyConstraint, String
+
+from app.database import Base
+
+
+class IngestHourlyRollup(Base):
+    """按小时预聚合的入库/分析计数，供仪表盘趋势图使用。
+
+    维度为 ``(bucket, source, target_id, tag_id)``；``target_id = 0`` 表示未关联目标，
+    ``tag_id = 0`` 行为不分标签的合计，带标签的行是按标签拆分的明细（不能与合计行相加）。
+    """
+
+    __tablename__ = "ingest_hourly_rollups"
+
+    bucket = Column(DateTime(timezone=True), nullable=False)  # 整点（UTC）
+    source = Column(String(32), nullable=False)
+    target_id = Column(Integer, nullable=False, default=0)
+    tag_id = Column(Integer, nullable=False, default=0)
+    items = Column(Integer, nullable=False, default=0, server_default="0")
+    comments = Column(Integer, nullable=False, default=0, server_default="0")
+    valuable_analyses = Column(Integer, nullable=False, default=0, server_default="0")
+    errors = Column(Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        PrimaryKeyConstraint("bucket", "source", "target_id", "tag_id", name="ingest_hourly_rollups_pkey"),
+        Index("ix_ingest_hourly_rollups_tag_target_bucket", "tag_id", "target_id", "bucket"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -31,4 +31,8 @@ class Post(Base):
         lazy="selectin",
         collection_class=set,
     )
-    payload = relationship("PostPayload", back_populates="post", uselist=False, lazy="selectin")
+    payload = relationship("PostPayload", back_populates="post", uselist=False, lazy="raise_on_sql")
+
+    __table_args__ = (
+        Index("ix_posts_fetched_at_id", "fetched_at", "id"),
+    )
@@ -0,0 +1,51 @@
+from sqlalchemy import BigInteger, Column, Integer, String, Text, DateTime
+from sqlalchemy.sql import func
+
+from app.database import Base
+from app.models.source_comments import THREAD_PATH_MAX_LENGTH
+
+
+class SourceItemArchive(Base):
+    """归档后的统一内容（结构与 ``source_items`` 对齐，无外键约束）。"""
+
+    __tablename__ = "source_items_archive"
+
+    id = Column(Integer, primary_key=True)
+    target_id = Column(Integer, nullable=True, index=True)
+    source = Column(String(32), nullable=False)
+    external_id = Column(String(64), nullable=False)
+    item_type = Column(String(32), nullable=False)
+    title = Column(String(500), nullable=False)
+    title_zh = Column(String(500), nullable=True)
+    content = Column(Text, nullable=True)
+    content_zh = Column(Text, nullable=True)
+    author = Column(String(100), nullable=True)
+    url = Column(String(1000), nullable=True)
+    score = Column(Integer, default=0)
+    num_comments = Column(Integer, default=0)
+    created_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    fetched_at = Column(DateTime(timezone=True), nullable=False)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class SourceCommentArchive(Base):
+    """归档后的统一评论（结构与 ``source_comments`` 对齐，无外键约束）。"""
+
+    __tablename__ = "source_comments_archive"
+
+    id = Column(Integer, primary_key=True)
+    item_id = Column(Integer, nullable=False, index=True)
+    source = Column(String(32), nullable=False)
+    external_id = Column(String(64), nullable=False)
+    content = Column(Text, nullable=False)
+    content_zh = Column(Text, nullable=True)
+    author = Column(String(100), nullable=True)
+    score = Column(Integer, default=0)
+    parent_id = Column(Integer, nullable=True)
+    depth = Column(Integer, default=0)
+    thread_path = Column(String(THREAD_PATH_MAX_LENGTH, collation="C"), nullable=True)
+    simhash = Column(BigInteger, nullable=True)
+    duplicate_of_id = Column(Integer, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    fetched_at = Column(DateTime(timezone=True), nullable=False)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
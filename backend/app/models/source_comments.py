@@ -1,16 +1,41 @@
 import json
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, UniqueConstraint
-from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Computed,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    PrimaryKeyConstraint,
+    String,
+    Text,
+    UniqueConstraint,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
+from sqlalchemy.sql import func, text
 
 from app.database import Base
+from app.models.source_items import SEARCH_TS_CONFIG
+
+# 物化路径列长度；每层 18 个字符，超过约 113 层的回复由 build_thread_path 截断挂到祖先下
+THREAD_PATH_MAX_LENGTH = 2048
 
 
 class SourceComment(Base):
+    """统一评论（按 ``created_at`` 月度范围分区）。
+
+    分区表的主键/唯一约束必须包含分区键，因此表级主键为 ``(id, created_at)``，
+    ORM 仍以 ``id`` 作为标识；指向评论的引用（parent/payload/analysis）不再建外键约束。
+    ``uq_source_comment_external`` 含分区键，只在同一 ``created_at`` 内唯一；
+    全局的 ``(source, external_id)`` 唯一由 :class:`SourceCommentKey` 保证。
+    """
+
     __tablename__ = "source_comments"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, autoincrement=True, nullable=False)
     item_id = Column(Integer, ForeignKey("source_items.id"), nullable=False, index=True)
     source = Column(String(32), nullable=False, index=True)
     external_id = Column(String(64), nullable=False, index=True)
@@ -18,32 +43,87 @@ class SourceComment(Base):
     content_zh = Column(Text, nullable=True)
     author = Column(String(100), nullable=True)
     score = Column(Integer, default=0)
-    parent_id = Column(Integer, ForeignKey("source_comments.id"), nullable=True)
+    parent_id = Column(Integer, nullable=True, index=True)
     depth = Column(Integer, default=0)
+    # 物化路径：祖先链（含自身）每条评论的定长 ``(created_at, id)`` 编码，以 ``.`` 连接。
+    # C 排序规则下字典序即线程视图顺序，任一子树是一段连续区间
+    thread_path = Column(String(THREAD_PATH_MAX_LENGTH, collation="C"), nullable=True)
+    # 64 位 SimHash（有符号存储），文本过短时为空；近似重复时指向更早的规范评论
+    simhash = Column(BigInteger, nullable=True)
+    duplicate_of_id = Column(Integer, nullable=True, index=True)
     created_at = Column(DateTime(timezone=True), nullable=False)
     fetched_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # 全文检索向量，由数据库生成；默认延迟加载
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(f"to_tsvector('{SEARCH_TS_CONFIG}', coalesce(content, ''))", persisted=True),
+        )
+    )
 
     item = relationship("SourceItem", back_populates="comments")
-    analyses = relationship("Analysis", back_populates="comment")
-    parent = relationship("SourceComment", remote_side=[id], backref="replies")
-    analyses = relationship("SourceAnalysis", back_populates="comment")
+    parent = relationship(
+        "SourceComment",
+        primaryjoin="foreign(SourceComment.parent_id) == SourceComment.id",
+        remote_side=[id],
+        backref="replies",
+    )
+    analyses = relationship(
+        "SourceAnalysis",
+        primaryjoin="SourceComment.id == foreign(SourceAnalysis.comment_id)",
+        back_populates="comment",
+    )
     payload = relationship(
         "SourceCommentPayload",
+        primaryjoin="SourceComment.id == foreign(SourceCommentPayload.comment_id)",
         back_populates="comment",
         uselist=False,
-        lazy="selectin",
+        lazy="raise_on_sql",
     )
 
     __table_args__ = (
-        UniqueConstraint("source", "external_id", name="uq_source_comment_external"),
+        PrimaryKeyConstraint("id", "created_at", name="source_comments_pkey"),
+        UniqueConstraint("source", "external_id", "created_at", name="uq_source_comment_external"),
+        Index("ix_source_comments_id", "id"),
+        Index("ix_source_comments_item_created_at_id", "item_id", "created_at", "id"),
+        Index("ix_source_comments_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_source_comments_item_thread_path", "item_id", "thread_path"),
+        Index(
+            "ix_source_comments_item_top_level",
+            "item_id",
+            "thread_path",
+            postgresql_where=text("parent_id IS NULL"),
+        ),
+        # SimHash 分段索引（与 app.services.simhash_service.band_expression 一致）
+        Index("ix_source_comments_simhash_band0", text("((simhash >> 48) & 65535)")),
+        Index("ix_source_comments_simhash_band1", text("((simhash >> 32) & 65535)")),
+        Index("ix_source_comments_simhash_band2", text("((simhash >> 16) & 65535)")),
+        Index("ix_source_comments_simhash_band3", text("((simhash >> 0) & 65535)")),
+        {"postgresql_partition_by": "RANGE (created_at)"},
     )
+    __mapper_args__ = {"primary_key": [id]}
+
+
+class SourceCommentKey(Base):
+    """评论外部 ID 查找表（不分区）：``(source, external_id)`` 全局唯一，指向评论行。
+
+    与评论在同一事务中写入与删除；并发入库同一条评论时后提交的一方因主键冲突失败，
+    与原先未分区时的唯一约束行为一致。入库按此表定位已有评论，可直接按主键命中分区。
+    """
+
+    __tablename__ = "source_comment_keys"
+
+    source = Column(String(32), primary_key=True)
+    external_id = Column(String(64), primary_key=True)
+    comment_id = Column(Integer, nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), nullable=False)
 
 
 class SourceAnalysis(Base):
     __tablename__ = "source_analyses"
 
     id = Column(Integer, primary_key=True, index=True)
-    comment_id = Column(Integer, ForeignKey("source_comments.id"), nullable=False, index=True)
+    comment_id = Column(Integer, nullable=False, index=True)
     pain_points_raw = Column("pain_points", Text, nullable=True)
     user_needs_raw = Column("user_needs", Text, nullable=True)
     opportunities_raw = Column("opportunities", Text, nullable=True)
@@ -51,7 +131,15 @@ class SourceAnalysis(Base):
     is_valuable = Column(Integer, default=0)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
-    comment = relationship("SourceComment", back_populates="analyses")
+    comment = relationship(
+        "SourceComment",
+        primaryjoin="foreign(SourceAnalysis.comment_id) == SourceComment.id",
+        back_populates="analyses",
+    )
+
+    __table_args__ = (
+        Index("ix_source_analyses_created_at_id", "created_at", "id"),
+    )
 
     @property
     def pain_points(self):
@@ -0,0 +1,30 @@
+from sqlalchemy import BigInteger, Column, DateTime, Float, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import relationship
+
+from app.database import Base
+
+
+class SourceItemMetric(Base):
+    """统一内容分数/评论数时间序列（仅追加，按 ``captured_at`` 月度分区）。"""
+
+    __tablename__ = "source_item_metrics"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    captured_at = Column(DateTime(timezone=True), primary_key=True, nullable=False)
+    item_id = Column(Integer, ForeignKey("source_items.id", ondelete="CASCADE"), nullable=False)
+    source = Column(String(32), nullable=False)
+    score = Column(Integer, nullable=False, default=0)
+    num_comments = Column(Integer, nullable=False, default=0)
+    score_delta = Column(Integer, nullable=False, default=0)
+    comments_delta = Column(Integer, nullable=False, default=0)
+    score_velocity = Column(Float, nullable=False, default=0.0)  # 每小时分数增量
+    comments_velocity = Column(Float, nullable=False, default=0.0)  # 每小时评论增量
+
+    item = relationship("SourceItem")
+
+    __table_args__ = (
+        Index("ix_source_item_metrics_item_captured_at", "item_id", "captured_at"),
+        Index("ix_source_item_metrics_score_velocity", "score_velocity", "captured_at"),
+        Index("ix_source_item_metrics_comments_velocity", "comments_velocity", "captured_at"),
+        {"postgresql_partition_by": "RANGE (captured_at)"},
+    )
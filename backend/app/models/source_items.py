@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, UniqueConstraint
-from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Computed, Integer, String, Text, DateTime, Float, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
+from sqlalchemy.sql import func, text
 
 from app.database import Base
 from app.models.source_item_tag_associations import source_item_tags
 
+# 全文检索使用的文本搜索配置：生成列与查询必须一致，修改需配套迁移重建 search_vector
+SEARCH_TS_CONFIG = "english"
+
 
 class SourceItem(Base):
     __tablename__ = "source_items"
@@ -20,14 +24,32 @@ class SourceItem(Base):
     content_zh = Column(Text, nullable=True)
     author = Column(String(100), nullable=True)
     url = Column(String(1000), nullable=True)
+    # 规范化后的外链（跨平台同一链接聚类用）；自发帖与站内链接为空
+    canonical_url = Column(String(1000), nullable=True)
     score = Column(Integer, default=0)
     num_comments = Column(Integer, default=0)
     created_at = Column(DateTime(timezone=True), nullable=False)
     fetched_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # 最近两次抓取之间的增长速度（每小时），入库时增量更新
+    score_velocity = Column(Float, nullable=False, default=0.0, server_default="0")
+    comments_velocity = Column(Float, nullable=False, default=0.0, server_default="0")
+    rising_score = Column(Float, nullable=False, default=0.0, server_default="0")
+    velocity_updated_at = Column(DateTime(timezone=True), nullable=True)
+    # 全文检索向量（标题权重 A、正文权重 B），由数据库生成；默认延迟加载
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                f"setweight(to_tsvector('{SEARCH_TS_CONFIG}', coalesce(title, '')), 'A') || "
+                f"setweight(to_tsvector('{SEARCH_TS_CONFIG}', coalesce(content, '')), 'B')",
+                persisted=True,
+            ),
+        )
+    )
 
     target = relationship("SourceTarget", back_populates="items")
     comments = relationship("SourceComment", back_populates="item")
-    payload = relationship("SourceItemPayload", back_populates="item", uselist=False, lazy="selectin")
+    payload = relationship("SourceItemPayload", back_populates="item", uselist=False, lazy="raise_on_sql")
     tags = relationship(
         "Tag",
         secondary=source_item_tags,
@@ -38,4 +60,14 @@ class SourceItem(Base):
 
     __table_args__ = (
         UniqueConstraint("source", "external_id", name="uq_source_item_external"),
+        Index("ix_source_items_fetched_at_id", "fetched_at", "id"),
+        Index("ix_source_items_target_fetched_at_id", "target_id", "fetched_at", "id"),
+        Index("ix_source_items_rising_score", "rising_score", "id"),
+        Index("ix_source_items_source_rising_score", "source", "rising_score", "id"),
+        Index("ix_source_items_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_source_items_canonical_url",
+            "canonical_url",
+            postgresql_where=text("canonical_url IS NOT NULL"),
+        ),
     )
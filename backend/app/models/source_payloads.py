@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, PrimaryKeyConstraint, UniqueConstraint
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -7,32 +7,50 @@ from app.database import Base
 
 
 class SourceItemPayload(Base):
+    """统一内容原始载荷（按所属内容的 ``created_at`` 月度范围分区）。"""
+
     __tablename__ = "source_item_payloads"
 
-    id = Column(Integer, primary_key=True, index=True)
-    item_id = Column(Integer, ForeignKey("source_items.id"), unique=True, index=True, nullable=False)
+    id = Column(Integer, autoincrement=True, nullable=False)
+    item_id = Column(Integer, ForeignKey("source_items.id"), nullable=False)
     source = Column(String(32), nullable=False, index=True)
     external_id = Column(String(64), nullable=False, index=True)
     payload = Column(JSONB, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
     fetched_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     item = relationship("SourceItem", back_populates="payload")
 
+    __table_args__ = (
+        PrimaryKeyConstraint("id", "created_at", name="source_item_payloads_pkey"),
+        UniqueConstraint("item_id", "created_at", name="source_item_payloads_item_id_key"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+    __mapper_args__ = {"primary_key": [id]}
+
 
 class SourceCommentPayload(Base):
+    """统一评论原始载荷（按所属评论的 ``created_at`` 月度范围分区）。"""
+
     __tablename__ = "source_comment_payloads"
 
-    id = Column(Integer, primary_key=True, index=True)
-    comment_id = Column(
-        Integer,
-        ForeignKey("source_comments.id"),
-        unique=True,
-        index=True,
-        nullable=False,
-    )
+    id = Column(Integer, autoincrement=True, nullable=False)
+    comment_id = Column(Integer, nullable=False)
     source = Column(String(32), nullable=False, index=True)
     external_id = Column(String(64), nullable=False, index=True)
     payload = Column(JSONB, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
     fetched_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
-    comment = relationship("SourceComment", back_populates="payload")
+    comment = relationship(
+        "SourceComment",
+        primaryjoin="foreign(SourceCommentPayload.comment_id) == SourceComment.id",
+        back_populates="payload",
+    )
+
+    __table_args__ = (
+        PrimaryKeyConstraint("id", "created_at", name="source_comment_payloads_pkey"),
+        UniqueConstraint("comment_id", "created_at", name="source_comment_payloads_comment_id_key"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+    __mapper_args__ = {"primary_key": [id]}
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -31,5 +31,18 @@ class SourceTarget(Base):
 
     __table_args__ = (
         UniqueConstraint("source", "target_type", "target_key", name="uq_source_target"),
+        # 自动补全：pg_trgm 索引同时支撑 ILIKE 前缀匹配与相似度模糊匹配
+        Index(
+            "ix_source_targets_target_key_trgm",
+            "target_key",
+            postgresql_using="gin",
+            postgresql_ops={"target_key": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_source_targets_display_name_trgm",
+            "display_name",
+            postgresql_using="gin",
+            postgresql_ops={"display_name": "gin_trgm_ops"},
+        ),
     )
 
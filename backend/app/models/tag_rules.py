@@ -0,0 +1,24 @@
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class TagRule(Base):
+    """自动打标签规则。
+
+    ``kind`` 为 ``keyword``（不区分大小写的整词匹配）或 ``regex``（不区分大小写）；
+    ``source`` / ``target_id`` 为空表示不限范围；``match_comments`` 为真时评论命中也会给所属内容打标签。
+    """
+
+    __tablename__ = "tag_rules"
+
+    id = Column(Integer, primary_key=True)
+    tag_id = Column(Integer, ForeignKey("tags.id", ondelete="CASCADE"), nullable=False, index=True)
+    kind = Column(String(16), nullable=False, default="keyword")
+    pattern = Column(Text, nullable=False)
+    source = Column(String(32), nullable=True)
+    target_id = Column(Integer, ForeignKey("source_targets.id", ondelete="CASCADE"), nullable=True)
+    match_comments = Column(Boolean, nullable=False, default=False)
+    enabled = Column(Boolean, nullable=False, default=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
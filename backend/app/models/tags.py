@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 from app.models.post_tag_associations import post_tags
@@ -17,17 +17,22 @@ class Tag(Base):
         "Post",
         secondary=post_tags,
         back_populates="tags",
-        lazy="selectin",
+        lazy="select",
         collection_class=set,
     )
     source_items = relationship(
         "SourceItem",
         secondary=source_item_tags,
         back_populates="tags",
-        lazy="selectin",
+        lazy="select",
         collection_class=set,
     )
 
+    __table_args__ = (
+        # 自动补全：pg_trgm 索引同时支撑 ILIKE 前缀匹配与相似度模糊匹配
+        Index("ix_tags_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
+
 
 class AnalysisTag(Base):
     __tablename__ = "analysis_tags"
@@ -0,0 +1,15 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class TimeseriesPoint(BaseModel):
+    """仪表盘趋势数据点（来自小时级预聚合表）。"""
+
+    bucket: datetime
+    source: Optional[str] = None
+    items: int = 0
+    comments: int = 0
+    valuable_analyses: int = 0
+    errors: int = 0
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 
 from app.schemas.tags_schemas import TagResponse
 
@@ -36,3 +36,9 @@ class PostResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class PostDetailResponse(PostResponse):
+    """旧版帖子详情响应模型（可选附带原始载荷）。"""
+
+    raw_payload: Optional[Dict[str, Any]] = None
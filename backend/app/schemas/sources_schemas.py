@@ -63,6 +63,7 @@ class SourceItemResponse(BaseModel):
     content_zh: Optional[str]
     author: Optional[str]
     url: Optional[str]
+    canonical_url: Optional[str] = None
     score: int
     num_comments: int
     created_at: datetime
@@ -73,12 +74,90 @@ class SourceItemResponse(BaseModel):
         from_attributes = True
 
 
+class RisingItemResponse(SourceItemResponse):
+    """上升内容响应模型（附带入库时计算的速度）。"""
+
+    score_velocity: float
+    comments_velocity: float
+    rising_score: float
+    velocity_updated_at: Optional[datetime]
+
+
+class SourceItemDetailResponse(SourceItemResponse):
+    """统一内容详情响应模型（可选附带原始载荷）。"""
+
+    raw_payload: Optional[Dict[str, Any]] = None
+
+
+class SourceItemMetricResponse(BaseModel):
+    """统一内容指标样本响应模型。"""
+
+    item_id: int
+    source: str
+    captured_at: datetime
+    score: int
+    num_comments: int
+    score_delta: int
+    comments_delta: int
+    score_velocity: float
+    comments_velocity: float
+
+    class Config:
+        from_attributes = True
+
+
+class RisingItemMetricResponse(BaseModel):
+    """上升最快内容响应模型（样本 + 内容摘要）。"""
+
+    metric: SourceItemMetricResponse
+    item: SourceItemResponse
+
+
+class SourceItemClusterResponse(BaseModel):
+    """同一规范外链下的内容簇（``items`` 按发布时间升序）。"""
+
+    canonical_url: str
+    item_count: int
+    sources: List[str]
+    first_seen_at: datetime
+    last_seen_at: datetime
+    items: List[SourceItemResponse]
+
+
 class SourceItemTagsUpdate(BaseModel):
     """覆盖统一内容标签的请求模型。"""
 
     tag_ids: List[int] = []
 
 
+class SourceItemFilter(BaseModel):
+    """按条件圈定统一内容（各条件取交集）。"""
+
+    source: Optional[str] = None
+    target_id: Optional[int] = None
+    tag_id: Optional[int] = None
+    q: Optional[str] = None
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+
+
+class SourceItemTagsBulkUpdate(BaseModel):
+    """批量增删统一内容标签的请求模型（``item_ids`` 与 ``filter`` 二选一）。"""
+
+    item_ids: Optional[List[int]] = None
+    filter: Optional[SourceItemFilter] = None
+    add_tag_ids: List[int] = []
+    remove_tag_ids: List[int] = []
+
+
+class SourceItemTagsBulkResult(BaseModel):
+    """批量增删标签的结果统计。"""
+
+    matched: int
+    added: int
+    removed: int
+
+
 class SourceCommentResponse(BaseModel):
     """统一评论响应模型。"""
 
@@ -92,6 +171,8 @@ class SourceCommentResponse(BaseModel):
     score: int
     parent_id: Optional[int]
     depth: int
+    thread_path: Optional[str] = None
+    duplicate_of_id: Optional[int] = None
     created_at: datetime
     fetched_at: datetime
 
@@ -99,6 +180,55 @@ class SourceCommentResponse(BaseModel):
         from_attributes = True
 
 
+class SourceCommentDetailResponse(SourceCommentResponse):
+    """统一评论详情响应模型（可选附带原始载荷）。"""
+
+    raw_payload: Optional[Dict[str, Any]] = None
+
+
+class SourceCommentTreeNode(SourceCommentResponse):
+    """评论树节点。
+
+    ``has_more_replies`` 为真时：``replies_cursor`` 非空表示本层还有更多回复，
+    为空表示已到深度上限，以本节点 ID 作为 ``parent_id`` 请求即可继续展开。
+    """
+
+    replies: List["SourceCommentTreeNode"] = []
+    has_more_replies: bool = False
+    replies_cursor: Optional[str] = None
+
+
+class SourceCommentTreeResponse(BaseModel):
+    """评论树响应模型（一次返回有限深度、每节点有限回复的一段子树）。"""
+
+    item_id: int
+    parent_id: Optional[int] = None
+    comments: List[SourceCommentTreeNode] = []
+    next_cursor: Optional[str] = None
+
+
+class SourceItemSearchHit(SourceItemResponse):
+    """全文检索命中的内容（附相关度与高亮摘要）。"""
+
+    rank: float = 0.0
+    snippet: Optional[str] = None
+
+
+class SourceCommentSearchHit(SourceCommentResponse):
+    """全文检索命中的评论（附相关度与高亮摘要）。"""
+
+    rank: float = 0.0
+    snippet: Optional[str] = None
+
+
+class SourceSearchResponse(BaseModel):
+    """全文检索响应模型。"""
+
+    query: str
+    items: List[SourceItemSearchHit] = []
+    comments: List[SourceCommentSearchHit] = []
+
+
 class FetchTargetRequest(BaseModel):
     """统一目标抓取请求模型。"""
 
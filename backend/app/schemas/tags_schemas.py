@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from datetime import datetime
 from typing import Optional
 
 
@@ -16,3 +17,28 @@ class TagResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class TagRuleCreate(BaseModel):
+    tag_id: int
+    kind: str = "keyword"
+    pattern: str
+    source: Optional[str] = None
+    target_id: Optional[int] = None
+    match_comments: bool = False
+    enabled: bool = True
+
+
+class TagRuleResponse(BaseModel):
+    id: int
+    tag_id: int
+    kind: str
+    pattern: str
+    source: Optional[str]
+    target_id: Optional[int]
+    match_comments: bool
+    enabled: bool
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -1,10 +1,13 @@
 ﻿from typing import List
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.llm import OpenAILLM, ClaudeLLM
 from app.config import settings
 from app.models.source_comments import SourceComment
 from app.models.source_comments import SourceAnalysis
+from app.models.source_items import SourceItem
+from app.services.rollup_service import RollupCounts, add_counts, load_item_tag_ids, record_rollups
 
 
 class AnalyzerService:
@@ -36,14 +39,21 @@ class AnalyzerService:
     async def screen_comments(self, comments: List[SourceComment]) -> List[bool]:
         """阶段一：批量筛选评论价值。
 
+        已标记为近似重复（``duplicate_of_id`` 非空）的评论不送入模型，直接判为无价值。
+
         参数：
             comments: 待筛选评论列表。
 
         返回：
             List[bool]: 与输入评论一一对应的筛选结果。
         """
-        contents = [c.content for c in comments]
-        return await self.screening_llm.screen_comments(contents)
+        results = [False] * len(comments)
+        pending = [i for i, c in enumerate(comments) if c.duplicate_of_id is None]
+        if pending:
+            screened = await self.screening_llm.screen_comments([comments[i].content for i in pending])
+            for i, valuable in zip(pending, screened):
+                results[i] = valuable
+        return results
 
     async def analyze_comment(self, comment: SourceComment, db: AsyncSession) -> SourceAnalysis:
         """阶段二：深度分析单条评论并入库。
@@ -66,6 +76,19 @@ class AnalyzerService:
             is_valuable=1
         )
         db.add(analysis)
+
+        # 与分析结果同事务累加小时级“有价值分析”计数
+        target_id = await db.scalar(select(SourceItem.target_id).where(SourceItem.id == comment.item_id))
+        rollup: RollupCounts = {}
+        add_counts(
+            rollup,
+            at=None,
+            source=comment.source,
+            target_id=target_id,
+            tag_ids=await load_item_tag_ids(db, comment.item_id),
+            valuable_analyses=1,
+        )
+        await record_rollups(db, rollup)
         await db.commit()
         await db.refresh(analysis)
         return analysis
@@ -0,0 +1,98 @@
+from __future__ import annotations
+"""目标与标签的自动补全服务。
+
+依赖 ``pg_trgm`` 的 GIN 索引：
+- ``prefix``：``ILIKE 'q%'``，按长度与字典序返回，适合边输入边提示；
+- ``fuzzy``：trigram 相似度（``%`` 运算符）过滤并按相似度排序，容忍拼写错误。
+"""
+
+from typing import List, Optional
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.source_targets import SourceTarget
+from app.models.tags import Tag
+
+AUTOCOMPLETE_MODES = ("prefix", "fuzzy")
+
+
+def _prefix_pattern(q: str) -> str:
+    """转义 LIKE 通配符后拼接前缀模式。"""
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%"
+
+
+async def autocomplete_targets(
+    db: AsyncSession,
+    *,
+    q: str,
+    mode: str = "prefix",
+    source: Optional[str] = None,
+    limit: int = 10,
+) -> List[SourceTarget]:
+    """按 ``target_key`` / ``display_name`` 补全统一目标。
+
+    参数：
+        db: 异步数据库会话。
+        q: 用户输入。
+        mode: ``prefix`` 或 ``fuzzy``。
+        source: 可选平台过滤。
+        limit: 返回条数。
+
+    返回：
+        List[SourceTarget]: 匹配的目标列表。
+    """
+    query = select(SourceTarget)
+    if source:
+        query = query.where(SourceTarget.source == source)
+
+    if mode == "fuzzy":
+        similarity = func.greatest(
+            func.similarity(SourceTarget.target_key, q),
+            func.similarity(func.coalesce(SourceTarget.display_name, ""), q),
+        )
+        query = query.where(
+            or_(SourceTarget.target_key.op("%")(q), SourceTarget.display_name.op("%")(q))
+        ).order_by(similarity.desc(), SourceTarget.id)
+    else:
+        pattern = _prefix_pattern(q)
+        query = query.where(
+            or_(
+                SourceTarget.target_key.ilike(pattern, escape="\\"),
+                SourceTarget.display_name.ilike(pattern, escape="\\"),
+            )
+        ).order_by(func.length(SourceTarget.target_key), SourceTarget.target_key, SourceTarget.id)
+
+    result = await db.execute(query.limit(limit))
+    return list(result.scalars().all())
+
+
+async def autocomplete_tags(
+    db: AsyncSession,
+    *,
+    q: str,
+    mode: str = "prefix",
+    limit: int = 10,
+) -> List[Tag]:
+    """按标签名补全标签。
+
+    参数：
+        db: 异步数据库会话。
+        q: 用户输入。
+        mode: ``prefix`` 或 ``fuzzy``。
+        limit: 返回条数。
+
+    返回：
+        List[Tag]: 匹配的标签列表。
+    """
+    if mode == "fuzzy":
+        query = select(Tag).where(Tag.name.op("%")(q)).order_by(func.similarity(Tag.name, q).desc(), Tag.id)
+    else:
+        query = (
+            select(Tag)
+            .where(Tag.name.ilike(_prefix_pattern(q), escape="\\"))
+            .order_by(func.length(Tag.name), Tag.name, Tag.id)
+        )
+    result = await db.execute(query.limit(limit))
+    return list(result.scalars().all())
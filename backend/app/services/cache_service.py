@@ -0,0 +1,187 @@
+from __future__ import annotations
+"""热点读接口的响应缓存。
+
+- 缓存键 = 命名空间 + 依赖命名空间的当前代数（generation）+ 路径 + 查询参数；
+- 写入路径通过 ``invalidate_on_commit`` 登记受影响的命名空间，事务提交后代数 +1，
+  旧键自然失效并由 LRU 淘汰，无需逐键删除；回滚则丢弃登记；
+- 后端可替换（``CacheBackend``），默认进程内 LRU+TTL；多进程部署需换成共享后端，
+  代数也由后端保存，才能跨进程失效。
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+# 缓存命名空间
+CACHE_ITEMS = "items"
+CACHE_POSTS = "posts"
+CACHE_TAGS = "tags"
+CACHE_CAPABILITIES = "capabilities"
+
+_PENDING_INVALIDATIONS = "pending_cache_invalidations"
+
+
+class CacheBackend:
+    """缓存后端接口。"""
+
+    def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        raise NotImplementedError
+
+    def get_generation(self, namespace: str) -> int:
+        raise NotImplementedError
+
+    def incr_generation(self, namespace: str) -> int:
+        raise NotImplementedError
+
+    def size(self) -> int:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class MemoryLRUCache(CacheBackend):
+    """进程内 LRU+TTL 缓存（线程安全）。"""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max(int(max_entries), 1)
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_generation(self, namespace: str) -> int:
+        with self._lock:
+            return self._generations.get(namespace, 0)
+
+    def incr_generation(self, namespace: str) -> int:
+        with self._lock:
+            value = self._generations.get(namespace, 0) + 1
+            self._generations[namespace] = value
+            return value
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class ResponseCache:
+    """带代数失效与命中统计的响应缓存。"""
+
+    def __init__(self, backend: CacheBackend, *, enabled: bool = True, default_ttl: float = 30):
+        self.backend = backend
+        self.enabled = enabled
+        self.default_ttl = default_ttl
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def set_backend(self, backend: CacheBackend) -> None:
+        """替换缓存后端（如切换为共享缓存）。"""
+        self.backend = backend
+
+    def generation(self, *namespaces: str) -> Tuple[int, ...]:
+        """返回各命名空间的当前代数。"""
+        return tuple(self.backend.get_generation(ns) for ns in namespaces)
+
+    def make_key(self, namespace: str, depends_on: Iterable[str], path: str, params: Iterable[Tuple[str, str]]) -> str:
+        """构建缓存键；查询参数排序后参与，参数顺序不同视为同一请求。"""
+        depends_on = tuple(depends_on)
+        generations = ",".join(f"{ns}:{gen}" for ns, gen in zip(depends_on, self.generation(*depends_on)))
+        query = "&".join(f"{k}={v}" for k, v in sorted(params))
+        return f"{namespace}|{generations}|{path}?{query}"
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        value = self.backend.get(key)
+        self._count(namespace, "hits" if value is not None else "misses")
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        if not self.enabled:
+            return
+        self.backend.set(key, value, self.default_ttl if ttl is None else ttl)
+
+    def bump(self, *namespaces: str) -> None:
+        """使命名空间下的已有缓存全部失效。"""
+        for namespace in namespaces:
+            self.backend.incr_generation(namespace)
+
+    def stats(self) -> Dict[str, Any]:
+        """返回各命名空间的命中/未命中计数与当前条目数。"""
+        with self._lock:
+            namespaces = {ns: dict(counts) for ns, counts in self._stats.items()}
+        for counts in namespaces.values():
+            total = counts["hits"] + counts["misses"]
+            counts["hit_ratio"] = round(counts["hits"] / total, 4) if total else 0.0
+        return {
+            "enabled": self.enabled,
+            "entries": self.backend.size(),
+            "namespaces": namespaces,
+        }
+
+    def _count(self, namespace: str, field: str) -> None:
+        with self._lock:
+            counts = self._stats.setdefault(namespace, {"hits": 0, "misses": 0})
+            counts[field] += 1
+
+
+response_cache = ResponseCache(
+    MemoryLRUCache(max_entries=settings.response_cache_max_entries),
+    enabled=settings.response_cache_enabled,
+    default_ttl=settings.response_cache_ttl_seconds,
+)
+
+
+def invalidate_on_commit(db: AsyncSession, *namespaces: str) -> None:
+    """登记本事务影响的缓存命名空间，提交成功后统一失效。
+
+    参数：
+        db: 异步数据库会话。
+        *namespaces: 受影响的命名空间（``CACHE_*``）。
+    """
+    db.info.setdefault(_PENDING_INVALIDATIONS, set()).update(namespaces)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_after_commit(session: Session) -> None:
+    pending = session.info.pop(_PENDING_INVALIDATIONS, None)
+    if pending:
+        response_cache.bump(*sorted(pending))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_INVALIDATIONS, None)
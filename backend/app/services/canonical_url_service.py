@@ -0,0 +1,268 @@
+from __future__ import annotations
+"""外链 URL 规范化与跨平台重复内容聚类。
+
+同一链接在不同平台（如 Reddit 链接帖与 HN story）的写法常有差异：协议、``www.``、
+末尾斜杠、``utm_*`` 等跟踪参数。入库时把外链规范化写入 ``canonical_url``（带索引），
+相同规范 URL 的内容即视为同一簇。平台自身页面（自发帖、站内图片等）不参与聚类。
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.logging_config import get_logger
+from app.models.source_items import SourceItem
+from app.models.source_payloads import SourceItemPayload
+
+logger = get_logger("reddit_trace.canonical_url")
+
+# 与列宽一致，超长 URL 不参与聚类
+CANONICAL_URL_MAX_LENGTH = 1000
+
+# 平台自身域名：指向这些域名的链接是站内内容，不视为外链
+PLATFORM_HOSTS = (
+    "reddit.com",
+    "redd.it",
+    "redditmedia.com",
+    "news.ycombinator.com",
+)
+
+# 去掉的跟踪/分享参数（``utm_`` 前缀另行处理）
+TRACKING_PARAMS = frozenset(
+    {
+        "fbclid",
+        "gclid",
+        "gbraid",
+        "wbraid",
+        "dclid",
+        "msclkid",
+        "yclid",
+        "igshid",
+        "mc_cid",
+        "mc_eid",
+        "_hsenc",
+        "_hsmi",
+        "mkt_tok",
+        "ref",
+        "ref_src",
+        "ref_url",
+        "si",
+        "spm",
+    }
+)
+
+_STRIPPED_HOST_PREFIXES = ("www.", "m.", "mobile.")
+
+
+def _is_platform_host(host: str) -> bool:
+    return any(host == domain or host.endswith(f".{domain}") for domain in PLATFORM_HOSTS)
+
+
+def canonicalize_url(url: Optional[str]) -> Optional[str]:
+    """规范化外链 URL。
+
+    统一为 https、主机名小写并去掉 ``www.`` / ``m.`` 前缀与默认端口、去掉末尾斜杠与片段、
+    删除跟踪参数并对其余参数排序；``youtu.be`` 短链展开为 ``youtube.com/watch``。
+
+    参数：
+        url: 原始 URL。
+
+    返回：
+        Optional[str]: 规范 URL；非 http(s)、平台站内链接或超长时返回 ``None``。
+    """
+    if not url:
+        return None
+    try:
+        parts = urlsplit(str(url).strip())
+        host = (parts.hostname or "").lower().rstrip(".")
+        port = parts.port
+    except ValueError:
+        return None
+    if parts.scheme.lower() not in ("http", "https") or not host:
+        return None
+    for prefix in _STRIPPED_HOST_PREFIXES:
+        if host.startswith(prefix) and host.count(".") > 1:
+            host = host[len(prefix):]
+            break
+    if _is_platform_host(host):
+        return None
+
+    path = parts.path or ""
+    params = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    ]
+    if host == "youtu.be" and path.strip("/"):
+        params = [("v", path.strip("/"))] + [(k, v) for k, v in params if k != "v"]
+        host, path = "youtube.com", "/watch"
+
+    path = path.rstrip("/")
+    netloc = host if port in (None, 80, 443) else f"{host}:{port}"
+    query = urlencode(sorted(params))
+    canonical = f"https://{netloc}{path}" + (f"?{query}" if query else "")
+    return canonical if len(canonical) <= CANONICAL_URL_MAX_LENGTH else None
+
+
+async def list_clusters(
+    db: AsyncSession,
+    *,
+    min_size: int = 2,
+    cross_source: bool = True,
+    source: Optional[str] = None,
+    since: Optional[datetime] = None,
+    skip: int = 0,
+    limit: int = 20,
+) -> List[Dict[str, Any]]:
+    """列出同一规范 URL 下的内容簇（按最近发布时间倒序）。
+
+    参数：
+        db: 异步数据库会话。
+        min_size: 簇内最少内容数。
+        cross_source: 是否只返回跨平台的簇。
+        source: 只返回包含该平台内容的簇。
+        since: 只统计该时间之后发布的内容。
+        skip: 偏移量。
+        limit: 返回簇数。
+
+    返回：
+        List[Dict[str, Any]]: ``{canonical_url, item_count, sources, first_seen_at, last_seen_at, items}``，
+        ``items`` 按发布时间升序（第一条即最早出现的原始内容）。
+    """
+    scope = [SourceItem.canonical_url.is_not(None)]
+    if since:
+        scope.append(SourceItem.created_at >= since)
+
+    clusters = (
+        select(
+            SourceItem.canonical_url,
+            func.count().label("item_count"),
+            func.array_agg(func.distinct(SourceItem.source)).label("sources"),
+            func.min(SourceItem.created_at).label("first_seen_at"),
+            func.max(SourceItem.created_at).label("last_seen_at"),
+        )
+        .where(*scope)
+        .group_by(SourceItem.canonical_url)
+        .having(func.count() >= min_size)
+    )
+    if cross_source:
+        clusters = clusters.having(func.count(func.distinct(SourceItem.source)) >= 2)
+    if source:
+        clusters = clusters.having(func.bool_or(SourceItem.source == source))
+    rows = (
+        await db.execute(
+            clusters.order_by(func.max(SourceItem.created_at).desc(), SourceItem.canonical_url)
+            .offset(skip)
+            .limit(limit)
+        )
+    ).all()
+    if not rows:
+        return []
+
+    urls = [row.canonical_url for row in rows]
+    items = (
+        await db.execute(
+            select(SourceItem)
+            .where(SourceItem.canonical_url.in_(urls), *scope[1:])
+            .order_by(SourceItem.created_at, SourceItem.id)
+        )
+    ).scalars().all()
+    by_url: Dict[str, List[SourceItem]] = {}
+    for item in items:
+        by_url.setdefault(item.canonical_url, []).append(item)
+
+    return [
+        {
+            "canonical_url": row.canonical_url,
+            "item_count": int(row.item_count),
+            "sources": sorted(row.sources or []),
+            "first_seen_at": row.first_seen_at,
+            "last_seen_at": row.last_seen_at,
+            "items": by_url.get(row.canonical_url, []),
+        }
+        for row in rows
+    ]
+
+
+async def list_duplicates(db: AsyncSession, item: SourceItem) -> List[SourceItem]:
+    """返回与该内容规范 URL 相同的其他内容（按发布时间升序）。"""
+    if not item.canonical_url:
+        return []
+    result = await db.execute(
+        select(SourceItem)
+        .where(SourceItem.canonical_url == item.canonical_url, SourceItem.id != item.id)
+        .order_by(SourceItem.created_at, SourceItem.id)
+    )
+    return list(result.scalars().all())
+
+
+async def backfill_canonical_urls(
+    db: AsyncSession,
+    *,
+    start_id: int = 0,
+    batch_size: int = 1000,
+    pause_ms: int = 100,
+) -> Dict[str, Any]:
+    """为历史内容回填 ``canonical_url``（按内容 ID 分批，每批独立提交）。
+
+    外链优先取原始 payload 中的 ``url``（Reddit 条目的 ``url`` 字段存的是站内 permalink），
+    payload 已被清理时退回条目自身的 ``url``。
+
+    返回：
+        Dict[str, Any]: ``items`` 扫描数、``updated`` 写入数、``last_id``、``seconds``。
+    """
+    started = time.perf_counter()
+    stats: Dict[str, Any] = {"items": 0, "updated": 0, "last_id": start_id}
+    last_id = start_id
+    while True:
+        rows = (
+            await db.execute(
+                select(
+                    SourceItem.id,
+                    SourceItem.url,
+                    SourceItem.canonical_url,
+                    SourceItemPayload.payload["url"].astext.label("payload_url"),
+                    SourceItemPayload.payload["is_self"].astext.label("is_self"),
+                )
+                .outerjoin(
+                    SourceItemPayload,
+                    (SourceItemPayload.item_id == SourceItem.id)
+                    & (SourceItemPayload.created_at == SourceItem.created_at),
+                )
+                .where(SourceItem.id > last_id)
+                .order_by(SourceItem.id)
+                .limit(batch_size)
+            )
+        ).all()
+        if not rows:
+            break
+
+        changed = []
+        for row in rows:
+            link = None if row.is_self == "true" else (row.payload_url or row.url)
+            canonical = canonicalize_url(link)
+            if canonical != row.canonical_url:
+                changed.append({"item_id": row.id, "new_url": canonical})
+        if changed:
+            items = SourceItem.__table__
+            await db.execute(
+                update(items).where(items.c.id == bindparam("item_id")).values(canonical_url=bindparam("new_url")),
+                changed,
+            )
+        await db.commit()
+
+        last_id = rows[-1].id
+        stats["items"] += len(rows)
+        stats["updated"] += len(changed)
+        stats["last_id"] = last_id
+        logger.info(f"[CanonicalURL] 回填进度: last_id={last_id}, items={stats['items']}, updated={stats['updated']}")
+        if pause_ms:
+            await asyncio.sleep(pause_ms / 1000)
+
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    return stats
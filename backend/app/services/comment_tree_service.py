@@ -0,0 +1,243 @@
+from __future__ import annotations
+"""评论树查询服务。
+
+用递归 CTE 沿 ``parent_id`` 自上而下展开评论树：每层通过 ``LATERAL`` 子查询
+只取每个父节点的前 N 条回复（多取 1 条用于判断是否还有更多），到达深度上限即停止，
+超大帖子也只读取本次要渲染的部分；剩余分支由调用方按子树游标继续加载。
+
+另有基于物化路径 ``thread_path`` 的查询：线程视图、仅顶层、某条评论的全部后代
+都是 ``(item_id, thread_path)`` 索引上的一次范围扫描，不需要递归。
+
+查询不加 ``created_at >= 内容发布时间`` 的分区裁剪下界：时钟偏差或时间缺省回退
+（epoch / 当前时间）会让评论早于所属内容，加下界会把它们静默漏掉；各查询均以
+``item_id`` 开头的索引定位，逐分区的索引探测代价很小。
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, case, exists, false, func, literal, select, true, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.source_comments import THREAD_PATH_MAX_LENGTH, SourceComment
+
+# 子树分页位置：(created_at, id)，同级回复按此升序
+TreeCursor = Tuple[datetime, int]
+
+THREAD_PATH_SEPARATOR = "."
+# 紧随分隔符的字符：``path + "."`` 与 ``path + "/"`` 之间恰好是 path 的全部后代
+_SUBTREE_END = chr(ord(THREAD_PATH_SEPARATOR) + 1)
+
+
+def thread_path_segment(created_at: datetime, comment_id: int) -> str:
+    """单条评论的路径段：9 位十六进制秒级时间戳 + 8 位十六进制 ID（定长，字典序即时间序）。"""
+    return f"{max(int(created_at.timestamp()), 0):09x}{int(comment_id):08x}"
+
+
+def build_thread_path(parent_path: Optional[str], created_at: datetime, comment_id: int) -> str:
+    """在父路径后追加本条评论的路径段。
+
+    超出列长度（约 113 层）时去掉父路径的最后一段，把回复挂到祖父节点下与父评论同级
+    （线程视图中仍紧随其后），而不是让整批入库因超长失败。
+    """
+    segment = thread_path_segment(created_at, comment_id)
+    if not parent_path:
+        return segment
+    if len(parent_path) + len(THREAD_PATH_SEPARATOR) + len(segment) > THREAD_PATH_MAX_LENGTH:
+        parent_path = parent_path.rpartition(THREAD_PATH_SEPARATOR)[0]
+        if not parent_path:
+            return segment
+    return f"{parent_path}{THREAD_PATH_SEPARATOR}{segment}"
+
+
+def _children_page(comments, *, parent_id, item_id: int, limit: int, after=None):
+    """取某个父节点下按 ``(created_at, id)`` 升序的前 ``limit + 1`` 条回复。"""
+    order = (comments.c.created_at, comments.c.id)
+    query = select(
+        comments.c.id,
+        comments.c.created_at,
+        comments.c.parent_id,
+        func.row_number().over(order_by=order).label("rn"),
+    ).where(
+        comments.c.item_id == item_id,
+        comments.c.parent_id.is_(None) if parent_id is None else comments.c.parent_id == parent_id,
+    )
+    if after is not None:
+        after_created_at, after_id = after
+        query = query.where(
+            comments.c.created_at >= after_created_at,
+            tuple_(comments.c.created_at, comments.c.id) > tuple_(after_created_at, after_id),
+        )
+    return query.order_by(*order).limit(limit + 1)
+
+
+async def load_comment_tree(
+    db: AsyncSession,
+    *,
+    item_id: int,
+    parent_id: Optional[int] = None,
+    after: Optional[TreeCursor] = None,
+    max_depth: int = 3,
+    max_children: int = 20,
+) -> Dict[str, Any]:
+    """加载一段评论树。
+
+    参数：
+        db: 异步数据库会话。
+        item_id: 所属内容 ID。
+        parent_id: 子树根评论 ID；不传时从顶层评论开始。
+        after: 起始层的分页位置（上一页最后一条回复）。
+        max_depth: 向下展开的层数（起始层为第 1 层）。
+        max_children: 每个节点最多返回的回复数。
+
+    返回：
+        Dict[str, Any]: ``{"nodes": [...], "has_more": bool, "after": TreeCursor | None}``；
+        每个节点为 ``{"comment", "replies", "has_more_replies", "replies_after"}``。
+        到达深度上限且仍有回复的节点 ``has_more_replies`` 为真、``replies_after`` 为空，
+        以该节点为 ``parent_id`` 重新请求即可继续展开。
+    """
+    comments = SourceComment.__table__
+
+    anchor = _children_page(
+        comments,
+        parent_id=parent_id,
+        item_id=item_id,
+        limit=max_children,
+        after=after,
+    ).subquery("anchor")
+    tree = select(
+        anchor.c.id,
+        anchor.c.created_at,
+        anchor.c.parent_id,
+        literal(1).label("level"),
+        anchor.c.rn,
+    ).cte("comment_tree", recursive=True)
+
+    children = comments.alias("child")
+    page = _children_page(
+        children,
+        parent_id=tree.c.id,
+        item_id=item_id,
+        limit=max_children,
+    ).lateral("replies")
+    tree = tree.union_all(
+        select(page.c.id, page.c.created_at, page.c.parent_id, tree.c.level + 1, page.c.rn)
+        .select_from(tree.join(page, true()))
+        # 只从本页保留的节点继续向下展开
+        .where(tree.c.level < max_depth, tree.c.rn <= max_children)
+    )
+
+    # 深度边界上的节点只探测是否还有回复，不再读取
+    probe = comments.alias("probe")
+    has_replies = case(
+        (
+            tree.c.level >= max_depth,
+            exists().where(
+                probe.c.parent_id == tree.c.id,
+                probe.c.item_id == item_id,
+            ),
+        ),
+        else_=false(),
+    ).label("has_replies")
+
+    query = (
+        select(SourceComment, tree.c.level, tree.c.rn, has_replies)
+        .join(tree, and_(SourceComment.id == tree.c.id, SourceComment.created_at == tree.c.created_at))
+        .order_by(tree.c.level, SourceComment.created_at, SourceComment.id)
+    )
+    result = await db.execute(query)
+
+    root: Dict[str, Any] = {"replies": [], "has_more_replies": False, "replies_after": None}
+    nodes: Dict[int, Dict[str, Any]] = {}
+    for comment, level, rn, boundary_has_replies in result.all():
+        parent = root if level == 1 else nodes.get(comment.parent_id)
+        if parent is None:
+            continue
+        if rn > max_children:
+            # 多取的一条只用来标记父节点还有更多回复
+            last = parent["replies"][-1]["comment"]
+            parent["has_more_replies"] = True
+            parent["replies_after"] = (last.created_at, last.id)
+            continue
+        node = {
+            "comment": comment,
+            "replies": [],
+            "has_more_replies": bool(boundary_has_replies),
+            "replies_after": None,
+        }
+        nodes[comment.id] = node
+        parent["replies"].append(node)
+
+    return {
+        "nodes": root["replies"],
+        "has_more": root["has_more_replies"],
+        "after": root["replies_after"],
+    }
+
+
+async def list_thread_comments(
+    db: AsyncSession,
+    *,
+    item_id: int,
+    top_level_only: bool = False,
+    after_path: Optional[str] = None,
+    limit: int = 100,
+) -> List[SourceComment]:
+    """按线程视图顺序（深度优先、同级按时间）读取评论。
+
+    参数：
+        db: 异步数据库会话。
+        item_id: 所属内容 ID。
+        top_level_only: 只返回顶层评论（走部分索引）。
+        after_path: 上一页最后一条评论的 ``thread_path``。
+        limit: 返回条数。
+
+    返回：
+        List[SourceComment]: 按 ``thread_path`` 升序的评论列表。
+    """
+    query = select(SourceComment).where(
+        SourceComment.item_id == item_id,
+        SourceComment.thread_path.is_not(None),
+    )
+    if top_level_only:
+        query = query.where(SourceComment.parent_id.is_(None))
+    if after_path:
+        query = query.where(SourceComment.thread_path > after_path)
+    result = await db.execute(query.order_by(SourceComment.thread_path).limit(limit))
+    return list(result.scalars().all())
+
+
+async def list_descendants(
+    db: AsyncSession,
+    *,
+    comment: SourceComment,
+    after_path: Optional[str] = None,
+    limit: int = 100,
+) -> List[SourceComment]:
+    """按线程视图顺序读取某条评论的全部后代（不含自身）。
+
+    参数：
+        db: 异步数据库会话。
+        comment: 子树根评论（需已有 ``thread_path``）。
+        after_path: 上一页最后一条评论的 ``thread_path``。
+        limit: 返回条数。
+
+    返回：
+        List[SourceComment]: 按 ``thread_path`` 升序的后代评论。
+    """
+    if not comment.thread_path:
+        return []
+    # C 排序规则与 Python 字符串比较一致；游标不能越出子树下界
+    lower = max(after_path or "", f"{comment.thread_path}{THREAD_PATH_SEPARATOR}")
+    query = (
+        select(SourceComment)
+        .where(
+            SourceComment.item_id == comment.item_id,
+            SourceComment.thread_path > lower,
+            SourceComment.thread_path < f"{comment.thread_path}{_SUBTREE_END}",
+        )
+        .order_by(SourceComment.thread_path)
+        .limit(limit)
+    )
+    result = await db.execute(query)
+    return list(result.scalars().all())
@@ -0,0 +1,102 @@
+from __future__ import annotations
+"""仪表盘统计服务。
+
+所有计数在一条聚合语句内完成（每张表只扫描一次，条件计数使用 ``FILTER``），
+结果在进程内按 TTL 缓存，并发请求共享同一次计算，仪表盘刷新频率与表规模无关。
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import func, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.analyses import Analysis
+from app.models.posts import Post
+from app.models.source_comments import SourceAnalysis
+from app.models.source_items import SourceItem
+from app.models.source_targets import SourceTarget
+from app.models.subreddits import Subreddit
+from app.models.tags import Tag
+
+# (过期时间 monotonic, 统计结果)
+_stats_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+_stats_lock = asyncio.Lock()
+
+
+def _stats_query(since_24h: datetime):
+    """构建单条聚合统计语句：每张表一个单行子查询，交叉连接成一行。"""
+    posts = select(
+        func.count().label("posts_total"),
+        func.count().filter(Post.fetched_at >= since_24h).label("posts_fetched_24h"),
+    ).select_from(Post).subquery()
+    items = select(
+        func.count().label("source_items_total"),
+        func.count().filter(SourceItem.fetched_at >= since_24h).label("source_items_fetched_24h"),
+    ).select_from(SourceItem).subquery()
+    subreddits = select(
+        func.count().label("subreddits_total"),
+        func.count().filter(Subreddit.monitor_enabled.is_(True)).label("subreddits_monitored"),
+        func.count().filter(Subreddit.last_fetched_at.is_not(None)).label("subreddits_fetched"),
+    ).select_from(Subreddit).subquery()
+    targets = select(
+        func.count().label("targets_total"),
+        func.count().filter(SourceTarget.monitor_enabled.is_(True)).label("targets_monitored"),
+        func.count().filter(SourceTarget.last_fetched_at.is_not(None)).label("targets_fetched"),
+    ).select_from(SourceTarget).subquery()
+    tags = select(func.count().label("tags_total")).select_from(Tag).subquery()
+    analyses = (
+        select(func.count().label("analyses_valuable_total"))
+        .select_from(Analysis)
+        .where(Analysis.is_valuable == 1)
+        .subquery()
+    )
+    source_analyses = (
+        select(func.count().label("source_analyses_valuable_total"))
+        .select_from(SourceAnalysis)
+        .where(SourceAnalysis.is_valuable == 1)
+        .subquery()
+    )
+
+    parts = [posts, items, subreddits, targets, tags, analyses, source_analyses]
+    query = select(*[column for part in parts for column in part.c]).select_from(parts[0])
+    for part in parts[1:]:
+        query = query.join(part, true())
+    return query
+
+
+async def compute_dashboard_stats(db: AsyncSession) -> Dict[str, Any]:
+    """执行聚合语句并返回统计结果（不走缓存）。"""
+    now = datetime.now(timezone.utc)
+    row = (await db.execute(_stats_query(now - timedelta(hours=24)))).one()
+    stats: Dict[str, Any] = {"now": now}
+    stats.update({key: int(value or 0) for key, value in row._mapping.items()})
+    return stats
+
+
+async def get_dashboard_stats(db: AsyncSession) -> Dict[str, Any]:
+    """返回仪表盘统计，命中 TTL 缓存时不访问数据库。
+
+    参数：
+        db: 异步数据库会话。
+
+    返回：
+        Dict[str, Any]: 统计结果，``now`` 为实际计算时间。
+    """
+    global _stats_cache
+    cached = _stats_cache
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    async with _stats_lock:
+        # 等锁期间可能已被其他请求刷新
+        cached = _stats_cache
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        stats = await compute_dashboard_stats(db)
+        _stats_cache = (time.monotonic() + max(settings.dashboard_stats_ttl_seconds, 0), stats)
+        return stats
+
@@ -0,0 +1,653 @@
+from __future__ import annotations
+"""离线转储批量导入（历史回填）。
+
+流水线：
+1. 主进程流式读取转储文件（``.zst`` 增量解压，``.gz`` / 纯文本同样支持；每行一个 JSON，
+   文件名含 ``.csv`` 时按带表头的 CSV 读取），按行切块；
+2. 进程池并行解析 JSON、按目标过滤、经适配器规范化（CPU 密集部分）；
+3. 主进程按提交顺序分批写库，复用 ``save_source_items`` / ``save_source_comments``，
+   标签、规则标签、规范外链、物化路径、近似重复标记与在线抓取完全一致；以回填模式写入，
+   不产生指标样本、增速与当前小时的入库计数。
+
+在途块数限制为工作进程数的两倍，内存占用与文件大小无关；按提交顺序写库保证
+按时间排序的转储中父评论先于子评论入库。每写完一块可把已处理行数写入检查点文件，
+中断后重跑同一文件会从检查点继续（写入按外部 ID 幂等，重复处理同一块不会产生重复行）。
+"""
+
+import asyncio
+import csv
+import gzip
+import io
+import json
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Awaitable, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+import orjson
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import AsyncSessionLocal
+from app.logging_config import get_logger
+from app.models.source_comments import SourceComment
+from app.models.source_items import SourceItem
+from app.models.source_targets import SourceTarget
+from app.services.source_ingestion_service import save_source_comments, save_source_items, upsert_source_target
+from app.services.source_registry_service import source_registry
+from app.services.sources.base import parse_timestamp
+
+logger = get_logger("reddit_trace.dump_import")
+
+REDDIT_DUMP_KINDS = ("submissions", "comments")
+# 与在线抓取一致：只导入故事与招聘帖，其余类型（poll / pollopt）忽略
+HN_STORY_TYPES = ("story", "job")
+_HN_INT_FIELDS = ("id", "parent", "score", "time", "descendants")
+
+# zstd 转储使用长距离窗口（最大 2 GiB），解压时需放宽窗口上限
+_ZSTD_MAX_WINDOW = 2 ** 31
+_READ_SIZE = 1 << 20
+
+# 解析结果：(规范化记录, 无法解析的行数)
+ParsedChunk = Tuple[List[Dict[str, Any]], int]
+# 行：JSON 行为原始字节，CSV 行为列名到文本的字典
+DumpRow = Any
+# HN 线程节点：(所属故事外部 ID, 深度)；故事本身深度为 -1，顶层评论为 0
+ThreadNode = Tuple[str, int]
+
+
+def _open_dump(path: str) -> Tuple[BinaryIO, BinaryIO]:
+    """打开转储文件，返回 ``(原始文件, 解压后字节流)``；原始文件用于统计读取进度。"""
+    raw = open(path, "rb")
+    if path.endswith(".zst"):
+        try:
+            import zstandard
+        except ImportError as e:
+            raw.close()
+            raise RuntimeError("Reading .zst dumps requires zstandard (pip install zstandard)") from e
+        return raw, zstandard.ZstdDecompressor(max_window_size=_ZSTD_MAX_WINDOW).stream_reader(raw)
+    if path.endswith(".gz"):
+        return raw, gzip.GzipFile(fileobj=raw)
+    return raw, raw
+
+
+def _is_csv(path: str) -> bool:
+    return "csv" in os.path.basename(path).lower().split(".")[1:]
+
+
+def iter_dump_chunks(path: str, chunk_lines: int) -> Iterator[Tuple[List[DumpRow], int]]:
+    """逐块产出 ``(行列表, 已读取的文件字节数)``。
+
+    JSON 行以原始字节交给工作进程解析；CSV 需按引号规则处理跨行字段，由主进程读成字典。
+    """
+    raw, stream = _open_dump(path)
+    try:
+        if _is_csv(path):
+            text = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+            try:
+                rows: List[Dict[str, str]] = []
+                for row in csv.DictReader(text):
+                    rows.append(row)
+                    if len(rows) >= chunk_lines:
+                        yield rows, raw.tell()
+                        rows = []
+                if rows:
+                    yield rows, raw.tell()
+            finally:
+                # 文件由外层关闭；包装器被回收时会连带关闭底层流
+                text.detach()
+            return
+
+        lines: List[bytes] = []
+        remainder = b""
+        while True:
+            data = stream.read(_READ_SIZE)
+            if not data:
+                break
+            parts = (remainder + data).split(b"\n")
+            remainder = parts.pop()
+            lines.extend(part for part in parts if part.strip())
+            while len(lines) >= chunk_lines:
+                yield lines[:chunk_lines], raw.tell()
+                lines = lines[chunk_lines:]
+        if remainder.strip():
+            lines.append(remainder)
+        if lines:
+            yield lines, raw.tell()
+    finally:
+        if stream is not raw:
+            stream.close()
+        raw.close()
+
+
+def parse_reddit_chunk(lines: Sequence[bytes], kind: str, subreddits: Sequence[str]) -> ParsedChunk:
+    """（工作进程）解析一块 Reddit 转储行：按版块过滤并经 ``RedditAdapter`` 规范化。
+
+    评论记录额外带 ``item_external_id``（来自 ``link_id``），提交记录带 ``subreddit``（小写）。
+    """
+    from app.services.sources.reddit import RedditAdapter
+
+    adapter = RedditAdapter()
+    wanted = set(subreddits)
+    records: List[Dict[str, Any]] = []
+    bad_lines = 0
+    for line in lines:
+        try:
+            obj = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            bad_lines += 1
+            continue
+        subreddit = str(obj.get("subreddit") or "").lower()
+        if subreddit not in wanted:
+            continue
+        if kind == "submissions":
+            record = adapter.normalize_item_payload(obj, channel=subreddit)
+        else:
+            link_id = str(obj.get("link_id") or "")
+            if not link_id.startswith("t3_"):
+                continue
+            record = adapter.normalize_comment_payload(obj)
+            record["item_external_id"] = link_id[3:]
+        if not record.get("external_id"):
+            continue
+        record["subreddit"] = subreddit
+        records.append(record)
+    return records, bad_lines
+
+
+def _hn_item(row: Dict[str, Any]) -> Dict[str, Any]:
+    """把 CSV 行的文本值还原为 API 形状（整数、布尔、空值），JSON 行原样通过。"""
+    item = {key: (None if value == "" else value) for key, value in row.items()}
+    for key in _HN_INT_FIELDS:
+        value = item.get(key)
+        if isinstance(value, str):
+            item[key] = int(float(value))
+    for key in ("dead", "deleted"):
+        value = item.get(key)
+        if isinstance(value, str):
+            item[key] = value.strip().lower() in ("true", "t", "1")
+    if not item.get("time") and item.get("timestamp"):
+        created = parse_timestamp(item["timestamp"])
+        item["time"] = int(created.timestamp()) if created else None
+    return item
+
+
+def parse_hn_chunk(rows: Sequence[DumpRow], feed: str) -> ParsedChunk:
+    """（工作进程）解析一块 HN 条目并经 ``HackerNewsAdapter`` 规范化。
+
+    记录带 ``kind``：``item``（故事）、``comment``，以及 ``skipped``（已删除 / dead 的评论，
+    只保留父链信息，供其子评论追溯所属故事）。
+    """
+    from app.services.sources.hackernews import HackerNewsAdapter
+
+    adapter = HackerNewsAdapter()
+    records: List[Dict[str, Any]] = []
+    bad_lines = 0
+    for row in rows:
+        try:
+            item = _hn_item(orjson.loads(row) if isinstance(row, bytes) else row)
+        except (orjson.JSONDecodeError, TypeError, ValueError, AttributeError):
+            bad_lines += 1
+            continue
+        if not item.get("id"):
+            bad_lines += 1
+            continue
+        item_type = item.get("type")
+        hidden = bool(item.get("deleted") or item.get("dead"))
+        if item_type in HN_STORY_TYPES:
+            if hidden:
+                continue
+            record = adapter.normalize_item_payload(item, channel=feed)
+            record["kind"] = "item"
+        elif item_type == "comment":
+            if hidden:
+                record = {"external_id": str(item["id"]), "kind": "skipped"}
+            else:
+                record = adapter.normalize_comment_payload(item)
+                record["kind"] = "comment"
+            record["parent_external_id"] = str(item["parent"]) if item.get("parent") else None
+        else:
+            continue
+        records.append(record)
+    return records, bad_lines
+
+
+def _load_checkpoint(checkpoint: str) -> Dict[str, int]:
+    try:
+        with open(checkpoint, "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except FileNotFoundError:
+        return {}
+
+
+def read_checkpoint(checkpoint: str, path: str) -> int:
+    """读取检查点中 ``path`` 已处理的行数（检查点按文件绝对路径记录，可多个文件共用）。"""
+    return int(_load_checkpoint(checkpoint).get(os.path.abspath(path)) or 0)
+
+
+def write_checkpoint(checkpoint: str, path: str, lines: int) -> None:
+    """原子地更新检查点中 ``path`` 的行数（先写临时文件再替换）。"""
+    state = _load_checkpoint(checkpoint)
+    state[os.path.abspath(path)] = lines
+    tmp = f"{checkpoint}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(state, fh)
+    os.replace(tmp, checkpoint)
+
+
+async def run_dump_import(
+    path: str,
+    *,
+    parse: Callable[..., ParsedChunk],
+    parse_args: Tuple[Any, ...],
+    load: Callable[[List[Dict[str, Any]]], Awaitable[None]],
+    stats: Dict[str, Any],
+    workers: int,
+    chunk_lines: int = 20000,
+    progress_seconds: float = 10.0,
+    skip_lines: int = 0,
+    checkpoint: Optional[str] = None,
+) -> Dict[str, Any]:
+    """通用导入流水线：主进程读块，进程池解析，按提交顺序回调 ``load`` 写库。
+
+    参数：
+        path: 转储文件路径。
+        parse: 工作进程中执行的解析函数 ``parse(lines, *parse_args)``（需可被 pickle）。
+        parse_args: 解析函数的额外参数。
+        load: 写库回调，按块提交顺序依次调用。
+        stats: 统计字典（``load`` 可写入自定义计数）。
+        workers: 工作进程数。
+        chunk_lines: 每块行数。
+        progress_seconds: 进度日志间隔。
+        skip_lines: 跳过文件开头的行数（用于中断后续跑）。
+        checkpoint: 检查点文件；存在时从记录的行数继续，每写完一块更新一次。
+
+    返回：
+        Dict[str, Any]: ``stats``，含 ``lines`` / ``matched``（解析出的记录数）/ ``bad_lines`` /
+        ``bytes`` / ``seconds``。
+    """
+    if checkpoint:
+        skip_lines = max(skip_lines, read_checkpoint(checkpoint, path))
+        if skip_lines:
+            logger.info(f"[DumpImport] {path}: 从第 {skip_lines} 行继续")
+    for key in ("lines", "matched", "bad_lines", "bytes"):
+        stats.setdefault(key, 0)
+    started = last_report = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    pending: deque = deque()
+
+    async def drain() -> None:
+        nonlocal last_report
+        future, line_count, position = pending.popleft()
+        records, bad_lines = await future
+        await load(records)
+        stats["lines"] += line_count
+        stats["matched"] += len(records)
+        stats["bad_lines"] += bad_lines
+        stats["bytes"] = position
+        if checkpoint:
+            write_checkpoint(checkpoint, path, stats["lines"])
+        now = time.perf_counter()
+        if now - last_report >= progress_seconds:
+            last_report = now
+            elapsed = now - started
+            logger.info(
+                f"[DumpImport] {path}: lines={stats['lines']} matched={stats['matched']} "
+                f"read={position / 1e6:.0f}MB ({position / 1e6 / elapsed:.1f}MB/s, "
+                f"{stats['lines'] / elapsed:.0f} lines/s)"
+            )
+
+    # spawn：工作进程不继承父进程的数据库连接
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        skipped = 0
+        for lines, position in iter_dump_chunks(path, chunk_lines):
+            if skipped < skip_lines:
+                take = min(skip_lines - skipped, len(lines))
+                skipped += take
+                stats["lines"] += take
+                lines = lines[take:]
+                if not lines:
+                    continue
+            pending.append((loop.run_in_executor(pool, parse, lines, *parse_args), len(lines), position))
+            if len(pending) >= workers * 2:
+                await drain()
+        while pending:
+            await drain()
+
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    return stats
+
+
+async def _save_item_records(
+    db: AsyncSession,
+    records: List[Dict[str, Any]],
+    *,
+    source: str,
+    target: Optional[SourceTarget],
+    stats: Dict[str, Any],
+    batch_size: int,
+) -> None:
+    for start in range(0, len(records), batch_size):
+        created, updated = await save_source_items(
+            db, source=source, target=target, items=records[start:start + batch_size], backfill=True
+        )
+        await db.commit()
+        # 目标实体在提交后仍可用（expire_on_commit=False），只需避免身份映射无限增长
+        db.expunge_all()
+        stats["created"] += created
+        stats["updated"] += updated
+
+
+async def _save_comment_records(
+    db: AsyncSession,
+    records: List[Dict[str, Any]],
+    *,
+    source: str,
+    stats: Dict[str, Any],
+    batch_size: int,
+) -> None:
+    """按 ``item_external_id`` 把评论挂到已入库内容下；父评论由 ``save_source_comments`` 解析。"""
+    for start in range(0, len(records), batch_size):
+        batch = records[start:start + batch_size]
+        by_item: Dict[str, List[Dict[str, Any]]] = {}
+        for record in batch:
+            by_item.setdefault(record["item_external_id"], []).append(record)
+        result = await db.execute(
+            select(SourceItem).where(SourceItem.source == source, SourceItem.external_id.in_(list(by_item)))
+        )
+        items = {item.external_id: item for item in result.scalars().all()}
+        for external_id, comments in by_item.items():
+            item = items.get(external_id)
+            if item is None:
+                stats["orphans"] += len(comments)
+                continue
+            created, updated = await save_source_comments(
+                db, source=source, item=item, comments=comments, backfill=True
+            )
+            stats["created"] += created
+            stats["updated"] += updated
+        await db.commit()
+        db.expunge_all()
+
+
+async def _load_reddit_submissions(
+    db: AsyncSession,
+    records: List[Dict[str, Any]],
+    *,
+    subreddits: Dict[str, str],
+    targets: Dict[str, SourceTarget],
+    stats: Dict[str, Any],
+    batch_size: int,
+) -> None:
+    by_subreddit: Dict[str, List[Dict[str, Any]]] = {}
+    for record in records:
+        by_subreddit.setdefault(record["subreddit"], []).append(record)
+    for subreddit, items in by_subreddit.items():
+        target = targets.get(subreddit)
+        if target is None:
+            target = await upsert_source_target(
+                db, source="reddit", target_type="subreddit", target_key=subreddits[subreddit]
+            )
+            targets[subreddit] = target
+        await _save_item_records(
+            db, items, source="reddit", target=target, stats=stats, batch_size=batch_size
+        )
+
+
+async def import_reddit_dump(
+    path: str,
+    *,
+    kind: str,
+    subreddits: Sequence[str],
+    workers: int,
+    chunk_lines: int = 20000,
+    batch_size: int = 500,
+    skip_lines: int = 0,
+    checkpoint: Optional[str] = None,
+) -> Dict[str, Any]:
+    """导入 Reddit 归档转储（每行一个 JSON 的提交或评论，可为 zstd 压缩）。
+
+    提交按版块写入 ``subreddit`` 目标（不存在时创建，默认不开启监控）；评论按 ``link_id``
+    挂到已入库的提交下，因此需先导入同期的提交文件。找不到所属提交的评论计入 ``orphans``。
+
+    参数：
+        path: 转储文件路径（``RS_*.zst`` / ``RC_*.zst`` 等）。
+        kind: ``submissions`` 或 ``comments``。
+        subreddits: 需要导入的版块（不区分大小写；新建目标时使用此处的写法）。
+        workers: 解析进程数。
+        chunk_lines: 每块行数。
+        batch_size: 每次写库的记录数。
+        skip_lines: 跳过文件开头的行数（用于中断后续跑）。
+        checkpoint: 检查点文件（见 ``run_dump_import``）。
+
+    返回：
+        Dict[str, Any]: 读取/匹配行数、新增/更新数、``orphans``、耗时等统计。
+
+    异常：
+        ValueError: ``kind`` 不受支持或未指定版块时抛出。
+    """
+    if kind not in REDDIT_DUMP_KINDS:
+        raise ValueError(f"Unsupported Reddit dump kind: {kind}")
+    names = {name.strip().removeprefix("r/").lower(): name.strip().removeprefix("r/") for name in subreddits}
+    names.pop("", None)
+    if not names:
+        raise ValueError("At least one subreddit is required")
+
+    stats: Dict[str, Any] = {"created": 0, "updated": 0, "orphans": 0}
+    targets: Dict[str, SourceTarget] = {}
+    async with AsyncSessionLocal() as db:
+
+        async def load(records: List[Dict[str, Any]]) -> None:
+            if kind == "submissions":
+                await _load_reddit_submissions(
+                    db, records, subreddits=names, targets=targets, stats=stats, batch_size=batch_size
+                )
+            else:
+                await _save_comment_records(db, records, source="reddit", stats=stats, batch_size=batch_size)
+
+        await run_dump_import(
+            path,
+            parse=parse_reddit_chunk,
+            parse_args=(kind, sorted(names)),
+            load=load,
+            stats=stats,
+            workers=workers,
+            chunk_lines=chunk_lines,
+            skip_lines=skip_lines,
+            checkpoint=checkpoint,
+        )
+    return stats
+
+
+class SkippedCommentStore:
+    """已删除 / dead 的 HN 评论的线程节点（不入库，但其回复需要据此找到所属故事）。
+
+    存于本地 SQLite 文件而非进程内存：全量 HN 有数百万条此类评论，内存不随转储增长；
+    指定检查点时文件放在检查点旁，续跑后仍能解析此前块中被删评论下的回复。
+    """
+
+    _LOOKUP_BATCH = 500
+
+    def __init__(self, path: Optional[str] = None):
+        self._temp_path: Optional[str] = None
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix="hn_skipped_", suffix=".sqlite")
+            os.close(fd)
+            self._temp_path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS skipped (id TEXT PRIMARY KEY, story_id TEXT NOT NULL, depth INTEGER NOT NULL)"
+        )
+        self._conn.commit()
+
+    def lookup(self, external_ids: Iterable[str]) -> Dict[str, ThreadNode]:
+        ids = list(external_ids)
+        found: Dict[str, ThreadNode] = {}
+        for start in range(0, len(ids), self._LOOKUP_BATCH):
+            batch = ids[start:start + self._LOOKUP_BATCH]
+            rows = self._conn.execute(
+                f"SELECT id, story_id, depth FROM skipped WHERE id IN ({','.join('?' * len(batch))})", batch
+            )
+            found.update({external_id: (story_id, depth) for external_id, story_id, depth in rows})
+        return found
+
+    def add(self, nodes: Dict[str, ThreadNode]) -> None:
+        if nodes:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO skipped (id, story_id, depth) VALUES (?, ?, ?)",
+                [(external_id, story_id, depth) for external_id, (story_id, depth) in nodes.items()],
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+        if self._temp_path:
+            os.remove(self._temp_path)
+
+
+async def _resolve_hn_threads(
+    db: AsyncSession,
+    records: List[Dict[str, Any]],
+    *,
+    skipped: SkippedCommentStore,
+    stats: Dict[str, Any],
+) -> List[Dict[str, Any]]:
+    """为一块 HN 记录中的评论确定所属故事与深度。
+
+    HN 评论只记录直接父节点（故事或评论）。块外的父节点先查被删评论表，其余一次查库
+    （故事表 + 评论表各一条查询），块内按 ID 顺序沿父链传递；已删除 / dead 评论不入库，
+    但写入 ``skipped``，其回复仍能找到所属故事。找不到祖先的评论计入 ``orphans``。
+
+    返回：
+        List[Dict[str, Any]]: 待入库的故事与评论（评论已带 ``item_external_id`` 与 ``depth``）。
+    """
+    local_ids = {record["external_id"] for record in records}
+    outside: Set[str] = {
+        record["parent_external_id"]
+        for record in records
+        if record["kind"] != "item"
+        and record["parent_external_id"]
+        and record["parent_external_id"] not in local_ids
+    }
+
+    nodes: Dict[str, ThreadNode] = skipped.lookup(outside) if outside else {}
+    rest = outside - set(nodes)
+    if rest:
+        result = await db.execute(
+            select(SourceItem.external_id).where(SourceItem.source == "hackernews", SourceItem.external_id.in_(rest))
+        )
+        nodes.update({external_id: (external_id, -1) for external_id in result.scalars().all()})
+        rest -= set(nodes)
+    if rest:
+        result = await db.execute(
+            select(SourceComment.external_id, SourceComment.depth, SourceItem.external_id)
+            .join(SourceItem, SourceItem.id == SourceComment.item_id)
+            .where(SourceComment.source == "hackernews", SourceComment.external_id.in_(rest))
+        )
+        nodes.update({external_id: (story_id, depth) for external_id, depth, story_id in result.all()})
+
+    resolved: List[Dict[str, Any]] = []
+    new_skipped: Dict[str, ThreadNode] = {}
+    for record in records:
+        external_id = record["external_id"]
+        if record["kind"] == "item":
+            nodes[external_id] = (external_id, -1)
+            resolved.append(record)
+            continue
+        parent_id = record["parent_external_id"]
+        parent = nodes.get(parent_id) if parent_id else None
+        if parent is None:
+            if record["kind"] == "comment":
+                stats["orphans"] += 1
+            continue
+        node = nodes[external_id] = (parent[0], parent[1] + 1)
+        if record["kind"] == "skipped":
+            new_skipped[external_id] = node
+            stats["skipped"] += 1
+            continue
+        record["item_external_id"], record["depth"] = node
+        resolved.append(record)
+    skipped.add(new_skipped)
+    return resolved
+
+
+async def import_hn_dump(
+    path: str,
+    *,
+    workers: int,
+    feed: Optional[str] = None,
+    chunk_lines: int = 20000,
+    batch_size: int = 500,
+    skip_lines: int = 0,
+    checkpoint: Optional[str] = None,
+) -> Dict[str, Any]:
+    """导入 Hacker News 条目转储（Firebase API 形状的 JSON 行，或 BigQuery 等导出的 CSV）。
+
+    故事与评论混在同一文件中，需按 ``id`` 升序（HN 的 ID 单调递增，父节点总先于子节点）。
+    每块先写故事、再写评论；评论的所属故事与深度见 ``_resolve_hn_threads``。已删除 / dead
+    的条目与在线抓取一样不入库。
+
+    参数：
+        path: 转储文件路径。
+        workers: 解析进程数。
+        feed: 可选，把故事挂到该 feed 目标下（如 ``topstories``）；默认不关联目标。
+        chunk_lines: 每块行数。
+        batch_size: 每次写库的记录数。
+        skip_lines: 跳过文件开头的行数（用于中断后续跑）。
+        checkpoint: 检查点文件（见 ``run_dump_import``）；被删评论的线程节点同时保存在
+            ``<checkpoint>.skipped.sqlite``，续跑时沿用。
+
+    返回：
+        Dict[str, Any]: 读取/匹配行数、新增/更新数、``orphans``、``skipped``、耗时等统计。
+
+    异常：
+        ValueError: ``feed`` 不受支持时抛出。
+    """
+    target_key = source_registry.get("hackernews").normalize_target_key("feed", feed) if feed else None
+
+    stats: Dict[str, Any] = {"created": 0, "updated": 0, "orphans": 0, "skipped": 0}
+    skipped = SkippedCommentStore(f"{checkpoint}.skipped.sqlite" if checkpoint else None)
+    async with AsyncSessionLocal() as db:
+        target: Optional[SourceTarget] = None
+        if target_key:
+            target = await upsert_source_target(db, source="hackernews", target_type="feed", target_key=target_key)
+            await db.commit()
+
+        async def load(records: List[Dict[str, Any]]) -> None:
+            resolved = await _resolve_hn_threads(db, records, skipped=skipped, stats=stats)
+            await _save_item_records(
+                db,
+                [record for record in resolved if record["kind"] == "item"],
+                source="hackernews",
+                target=target,
+                stats=stats,
+                batch_size=batch_size,
+            )
+            await _save_comment_records(
+                db,
+                [record for record in resolved if record["kind"] == "comment"],
+                source="hackernews",
+                stats=stats,
+                batch_size=batch_size,
+            )
+
+        try:
+            await run_dump_import(
+                path,
+                parse=parse_hn_chunk,
+                parse_args=(target_key or "",),
+                load=load,
+                stats=stats,
+                workers=workers,
+                chunk_lines=chunk_lines,
+                skip_lines=skip_lines,
+                checkpoint=checkpoint,
+            )
+        finally:
+            skipped.close()
+    return stats
@@ -0,0 +1,309 @@
+from __future__ import annotations
+"""批量导出服务（内容 / 评论 / 分析结果）。
+
+查询通过服务端游标（``AsyncSession.stream`` + ``yield_per``）分批读取，逐批编码输出，
+内存占用与导出总量无关：
+
+- ``/api/export`` 以 NDJSON 或 CSV 流式返回；
+- ``python -m scripts.export_parquet`` 按 ``source=<平台>/date=<日期>`` 分目录写 Parquet
+  （需安装 ``pyarrow``）。
+"""
+
+import csv
+import io
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+import orjson
+from sqlalchemy import ARRAY, BigInteger, Boolean, DateTime, Float, Integer, func, select
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.logging_config import get_logger
+from app.models.source_comments import SourceAnalysis, SourceComment
+from app.models.source_item_tag_associations import source_item_tags
+from app.models.source_items import SourceItem
+from app.services.tagging_service import item_scope
+
+logger = get_logger("reddit_trace.export")
+
+EXPORT_KINDS = ("items", "comments", "analyses")
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+# 分析结果中以 JSON 文本存储的列，导出时解析为列表
+_ANALYSIS_JSON_COLUMNS = ("pain_points", "user_needs", "opportunities")
+
+
+def _stored_columns(table) -> List[Any]:
+    # 数据库生成列（search_vector）不导出
+    return [column for column in table.c if column.computed is None]
+
+
+def build_export_query(
+    kind: str,
+    *,
+    source: Optional[str] = None,
+    target_id: Optional[int] = None,
+    tag_ids: Optional[Iterable[int]] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    ordered: bool = False,
+):
+    """构建导出查询。
+
+    时间范围作用于各自的 ``created_at``（评论按分区键裁剪）；目标与标签条件通过所属内容过滤，
+    ``tag_ids`` 为命中任一标签。
+
+    参数：
+        kind: ``items`` / ``comments`` / ``analyses``。
+        source: 平台过滤。
+        target_id: 目标过滤。
+        tag_ids: 标签过滤。
+        since: 起始时间（含）。
+        until: 截止时间（不含）。
+        ordered: 是否按 ``(created_at, id)`` 排序（分区写文件时需要）。
+
+    返回：
+        Select: 每行一条导出记录的查询。
+
+    异常：
+        ValueError: ``kind`` 不受支持时抛出。
+    """
+    tag_ids = list(tag_ids or [])
+    if kind == "items":
+        tag_list = (
+            select(func.array_agg(source_item_tags.c.tag_id))
+            .where(source_item_tags.c.source_item_id == SourceItem.id)
+            .scalar_subquery()
+        )
+        query = select(*_stored_columns(SourceItem.__table__), tag_list.label("tag_ids")).where(
+            *item_scope(source=source, target_id=target_id, tag_ids=tag_ids)
+        )
+        model = SourceItem
+    elif kind in ("comments", "analyses"):
+        item_filter = (
+            [SourceComment.item_id.in_(select(SourceItem.id).where(*item_scope(target_id=target_id, tag_ids=tag_ids)))]
+            if target_id or tag_ids
+            else []
+        )
+        if source:
+            item_filter.append(SourceComment.source == source)
+        if kind == "comments":
+            query = select(*_stored_columns(SourceComment.__table__)).where(*item_filter)
+            model = SourceComment
+        else:
+            query = (
+                select(
+                    *_stored_columns(SourceAnalysis.__table__),
+                    SourceComment.source,
+                    SourceComment.item_id,
+                )
+                .join(SourceComment, SourceComment.id == SourceAnalysis.comment_id)
+                .where(*item_filter)
+            )
+            model = SourceAnalysis
+    else:
+        raise ValueError(f"Unsupported export kind: {kind}")
+
+    if since:
+        query = query.where(model.created_at >= since)
+    if until:
+        query = query.where(model.created_at < until)
+    if ordered:
+        query = query.order_by(model.created_at, model.id)
+    return query
+
+
+def _parse_json_list(value: Optional[str]) -> List[Any]:
+    if not value:
+        return []
+    try:
+        return json.loads(value)
+    except ValueError:
+        return []
+
+
+async def iter_export_batches(
+    db: AsyncSession,
+    query,
+    *,
+    kind: str,
+    batch_size: int = 1000,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """通过服务端游标逐批产出导出记录。"""
+    result = await db.stream(query.execution_options(yield_per=batch_size))
+    async for rows in result.partitions():
+        records = [dict(row._mapping) for row in rows]
+        if kind == "analyses":
+            for record in records:
+                for name in _ANALYSIS_JSON_COLUMNS:
+                    record[name] = _parse_json_list(record[name])
+        yield records
+
+
+async def stream_ndjson(batches: AsyncIterator[List[Dict[str, Any]]]) -> AsyncIterator[bytes]:
+    """把记录批次编码为 NDJSON 字节块（每批一块）。"""
+    async for records in batches:
+        yield b"".join(orjson.dumps(record) + b"\n" for record in records)
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (list, dict)):
+        return orjson.dumps(value).decode("utf-8")
+    return value
+
+
+async def stream_csv(batches: AsyncIterator[List[Dict[str, Any]]], columns: List[str]) -> AsyncIterator[bytes]:
+    """把记录批次编码为 CSV 字节块（首块含表头；列表/对象列写为 JSON 文本）。"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    async for records in batches:
+        for record in records:
+            writer.writerow([_csv_value(record[name]) for name in columns])
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def export_columns(query) -> List[str]:
+    """导出查询的列名（CSV 表头）。"""
+    return [column.key for column in query.selected_columns]
+
+
+def _arrow_type(pa, column) -> Any:
+    column_type = column.type
+    if isinstance(column_type, (Integer, BigInteger)):
+        return pa.int64()
+    if isinstance(column_type, Float):
+        return pa.float64()
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, DateTime):
+        return pa.timestamp("us", tz="UTC")
+    if isinstance(column_type, ARRAY):
+        return pa.list_(pa.int64())
+    return pa.string()
+
+
+def _arrow_string_list(value: Any) -> List[str]:
+    # 分析结果由 LLM 生成，列表元素不一定是字符串（可能是对象），统一写为文本
+    return [item if isinstance(item, str) else orjson.dumps(item).decode("utf-8") for item in value or []]
+
+
+def _arrow_value(value: Any, column) -> Any:
+    if isinstance(column.type, JSONB) or (isinstance(value, (list, dict)) and not isinstance(column.type, ARRAY)):
+        return orjson.dumps(value).decode("utf-8") if value is not None else None
+    return value
+
+
+async def export_parquet(
+    db: AsyncSession,
+    *,
+    kind: str,
+    out_dir: str,
+    source: Optional[str] = None,
+    target_id: Optional[int] = None,
+    tag_ids: Optional[Iterable[int]] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    batch_size: int = 5000,
+    row_group_size: int = 50000,
+) -> Dict[str, Any]:
+    """导出为按平台与日期分区的 Parquet 文件。
+
+    目录结构为 ``<out_dir>/<kind>/source=<平台>/date=<YYYY-MM-DD>/part-00000.parquet``
+    （Hive 分区风格，可直接被 DuckDB / Spark / pandas 读取）。查询按 ``created_at`` 排序，
+    各分区缓冲到 ``row_group_size`` 行写出一个 row group；进入下一天时写出并关闭前一天的
+    全部文件，因此同时打开的文件数不超过平台数，内存不超过每个平台一个 row group。
+
+    返回：
+        Dict[str, Any]: ``rows`` 导出行数、``files`` 写出的文件列表。
+
+    异常：
+        RuntimeError: 未安装 ``pyarrow`` 时抛出。
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)") from e
+
+    query = build_export_query(
+        kind, source=source, target_id=target_id, tag_ids=tag_ids, since=since, until=until, ordered=True
+    )
+    columns = list(query.selected_columns)
+    # 分析结果的 JSON 文本列已在 iter_export_batches 中解析为列表，按 list<string> 写出
+    list_columns = set(_ANALYSIS_JSON_COLUMNS) if kind == "analyses" else set()
+    schema = pa.schema(
+        [
+            pa.field(
+                column.key,
+                pa.list_(pa.string()) if column.key in list_columns else _arrow_type(pa, column),
+            )
+            for column in columns
+        ]
+    )
+
+    writers: Dict[Tuple[str, str], Any] = {}
+    buffers: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    files: List[str] = []
+
+    def flush(key: Tuple[str, str]) -> None:
+        records = buffers.pop(key, None)
+        if not records:
+            return
+        writer = writers.get(key)
+        if writer is None:
+            directory = os.path.join(out_dir, kind, f"source={key[0]}", f"date={key[1]}")
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, "part-00000.parquet")
+            writer = writers[key] = pq.ParquetWriter(path, schema, compression="zstd")
+            files.append(path)
+        table = pa.Table.from_pydict(
+            {
+                column.key: [
+                    _arrow_string_list(record[column.key]) if column.key in list_columns
+                    else _arrow_value(record[column.key], column)
+                    for record in records
+                ]
+                for column in columns
+            },
+            schema=schema,
+        )
+        writer.write_table(table, row_group_size=row_group_size)
+
+    def close_all() -> None:
+        for key in list(buffers):
+            flush(key)
+        for writer in writers.values():
+            writer.close()
+        writers.clear()
+
+    rows = 0
+    current_day: Optional[str] = None
+    async for records in iter_export_batches(db, query, kind=kind, batch_size=batch_size):
+        for record in records:
+            day = record["created_at"].astimezone(timezone.utc).date().isoformat()
+            if day != current_day:
+                close_all()
+                current_day = day
+            key = (record["source"] or "unknown", day)
+            buffer = buffers.setdefault(key, [])
+            buffer.append(record)
+            if len(buffer) >= row_group_size:
+                flush(key)
+        rows += len(records)
+    close_all()
+
+    logger.info(f"[Export] Parquet 导出完成: kind={kind}, rows={rows}, files={len(files)}")
+    return {"rows": rows, "files": files}
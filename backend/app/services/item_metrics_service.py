@@ -0,0 +1,220 @@
+from __future__ import annotations
+"""统一内容指标时间序列服务。
+
+入库时根据上一次抓取值计算分数/评论增量与每小时速度，
+仅在数值变化（或首次入库）时向 ``source_item_metrics`` 追加样本，
+并把最新速度写回 ``source_items`` 供上升榜排序使用。
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.source_item_metrics import SourceItemMetric
+from app.models.source_items import SourceItem
+
+# 速度计算的最小时间间隔，避免连续抓取时除以极小值
+MIN_VELOCITY_HOURS = 1.0 / 60
+
+# 最快上升榜每批读取的样本数相对 limit 的倍数
+FASTEST_RISING_OVERFETCH = 4
+
+# 综合上升分中评论速度的权重
+RISING_COMMENT_WEIGHT = 2.0
+
+# 上一次抓取快照：(score, num_comments, fetched_at)
+PreviousSnapshot = Tuple[int, int, datetime]
+
+
+def _hours_between(start: Optional[datetime], end: datetime) -> float:
+    """返回两个时间点之间的小时数（带最小值保护）。"""
+    if not start:
+        return MIN_VELOCITY_HOURS
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    return max((end - start).total_seconds() / 3600, MIN_VELOCITY_HOURS)
+
+
+def build_metric_sample(
+    item: SourceItem,
+    previous: Optional[PreviousSnapshot],
+    *,
+    captured_at: datetime,
+) -> Optional[Dict[str, Any]]:
+    """根据本次与上一次抓取值构建指标样本。
+
+    参数：
+        item: 已写入本次抓取值的内容实体（需已 flush 拿到 id）。
+        previous: 上一次抓取快照；首次入库为 ``None``。
+        captured_at: 本次抓取时间。
+
+    返回：
+        Optional[Dict[str, Any]]: 待插入的样本；数值未变化时返回 ``None``。
+    """
+    score = int(item.score or 0)
+    num_comments = int(item.num_comments or 0)
+
+    if previous is None:
+        # 首次入库：以发布时刻为零点估算初始速度
+        score_delta = score
+        comments_delta = num_comments
+        hours = _hours_between(item.created_at, captured_at)
+    else:
+        prev_score, prev_comments, prev_fetched_at = previous
+        score_delta = score - int(prev_score or 0)
+        comments_delta = num_comments - int(prev_comments or 0)
+        if score_delta == 0 and comments_delta == 0:
+            return None
+        hours = _hours_between(prev_fetched_at, captured_at)
+
+    return {
+        "captured_at": captured_at,
+        "item_id": item.id,
+        "source": item.source,
+        "score": score,
+        "num_comments": num_comments,
+        "score_delta": score_delta,
+        "comments_delta": comments_delta,
+        "score_velocity": score_delta / hours,
+        "comments_velocity": comments_delta / hours,
+    }
+
+
+def apply_item_velocity(
+    item: SourceItem,
+    sample: Optional[Dict[str, Any]],
+    *,
+    captured_at: datetime,
+) -> None:
+    """将本次样本的速度写回内容行；数值未变化时速度归零。
+
+    参数：
+        item: 内容实体。
+        sample: ``build_metric_sample`` 的结果，可为 ``None``。
+        captured_at: 本次抓取时间。
+    """
+    score_velocity = float(sample["score_velocity"]) if sample else 0.0
+    comments_velocity = float(sample["comments_velocity"]) if sample else 0.0
+    item.score_velocity = score_velocity
+    item.comments_velocity = comments_velocity
+    item.rising_score = score_velocity + RISING_COMMENT_WEIGHT * comments_velocity
+    item.velocity_updated_at = captured_at
+
+
+async def record_metric_samples(db: AsyncSession, samples: List[Dict[str, Any]]) -> int:
+    """批量追加指标样本，返回写入条数。"""
+    if not samples:
+        return 0
+    await db.execute(pg_insert(SourceItemMetric).values(samples))
+    return len(samples)
+
+
+async def list_item_metrics(
+    db: AsyncSession,
+    *,
+    item_id: int,
+    since: Optional[datetime] = None,
+    limit: int = 500,
+) -> List[SourceItemMetric]:
+    """按时间升序返回单条内容的指标轨迹（走 ``(item_id, captured_at)`` 索引）。"""
+    query = select(SourceItemMetric).where(SourceItemMetric.item_id == item_id)
+    if since:
+        query = query.where(SourceItemMetric.captured_at >= since)
+    query = query.order_by(SourceItemMetric.captured_at.asc()).limit(limit)
+    result = await db.execute(query)
+    return list(result.scalars().all())
+
+
+async def list_rising_items(
+    db: AsyncSession,
+    *,
+    hours: int = 24,
+    source: Optional[str] = None,
+    target_id: Optional[int] = None,
+    limit: int = 20,
+) -> List[SourceItem]:
+    """按入库时维护的 ``rising_score`` 排序返回正在上升的内容。
+
+    仅包含窗口内更新过速度的内容；排序走 ``rising_score`` 索引，
+    不随表规模增长。
+    """
+    since = datetime.now(timezone.utc) - timedelta(hours=max(1, hours))
+    query = select(SourceItem).where(
+        SourceItem.rising_score > 0,
+        SourceItem.velocity_updated_at >= since,
+    )
+    if source:
+        query = query.where(SourceItem.source == source)
+    if target_id:
+        query = query.where(SourceItem.target_id == target_id)
+    query = query.order_by(SourceItem.rising_score.desc(), SourceItem.id.desc()).limit(limit)
+    result = await db.execute(query)
+    return list(result.scalars().all())
+
+
+async def list_fastest_rising(
+    db: AsyncSession,
+    *,
+    hours: int = 24,
+    metric: str = "score",
+    source: Optional[str] = None,
+    limit: int = 20,
+) -> List[Tuple[SourceItemMetric, SourceItem]]:
+    """查询窗口内速度最高的内容。
+
+    沿速度索引 ``(velocity, captured_at)`` 倒序分批读取样本（各月度分区的索引扫描
+    合并为有序流，不对窗口内全部样本排序），按 ``item_id`` 去重，凑够 ``limit``
+    条不同内容即停止；每批多取若干倍，活跃内容的大量样本只多读几批。
+
+    参数：
+        db: 异步数据库会话。
+        hours: 回看窗口（小时）。
+        metric: ``score`` 或 ``comments``。
+        source: 可选平台过滤。
+        limit: 返回内容条数。
+
+    返回：
+        List[Tuple[SourceItemMetric, SourceItem]]: 每条内容速度最高的样本与对应内容。
+    """
+    velocity = (
+        SourceItemMetric.comments_velocity if metric == "comments" else SourceItemMetric.score_velocity
+    )
+    since = datetime.now(timezone.utc) - timedelta(hours=max(1, hours))
+    batch_size = max(limit, 1) * FASTEST_RISING_OVERFETCH
+
+    base = select(SourceItemMetric).where(SourceItemMetric.captured_at >= since, velocity > 0)
+    if source:
+        base = base.where(SourceItemMetric.source == source)
+
+    best: Dict[int, SourceItemMetric] = {}
+    cursor: Optional[Tuple[float, datetime, int]] = None
+    while len(best) < limit:
+        query = base
+        if cursor is not None:
+            query = query.where(tuple_(velocity, SourceItemMetric.captured_at, SourceItemMetric.id) < cursor)
+        query = query.order_by(
+            velocity.desc(), SourceItemMetric.captured_at.desc(), SourceItemMetric.id.desc()
+        ).limit(batch_size)
+        samples = list((await db.execute(query)).scalars().all())
+        for sample in samples:
+            # 按速度倒序读取，每条内容第一次出现的样本即其窗口内最高速度
+            best.setdefault(sample.item_id, sample)
+            if len(best) >= limit:
+                break
+        if len(samples) < batch_size:
+            break
+        last = samples[-1]
+        cursor = (
+            last.comments_velocity if metric == "comments" else last.score_velocity,
+            last.captured_at,
+            last.id,
+        )
+
+    if not best:
+        return []
+    items = await db.execute(select(SourceItem).where(SourceItem.id.in_(list(best))))
+    by_id = {item.id: item for item in items.scalars().all()}
+    return [(sample, by_id[item_id]) for item_id, sample in best.items() if item_id in by_id]
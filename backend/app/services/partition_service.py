@@ -0,0 +1,106 @@
+from __future__ import annotations
+"""按月范围分区维护服务。
+
+为声明式分区表预先创建未来月份的分区，由调度器周期调用。
+每张分区表另有一个 ``DEFAULT`` 分区兜底，避免分区缺失时写入失败。
+"""
+
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.logging_config import get_logger
+
+logger = get_logger("reddit_trace.partition")
+
+# 按月分区的表（分区键均为 timestamptz）
+MONTHLY_PARTITIONED_TABLES: List[str] = [
+    "source_item_metrics",
+    "source_comments",
+    "source_comment_payloads",
+    "source_item_payloads",
+]
+
+
+def month_start(dt: datetime) -> datetime:
+    """返回所在月份第一天 00:00 (UTC)。"""
+    dt = dt.astimezone(timezone.utc) if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+    return dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(dt: datetime, months: int) -> datetime:
+    """按月偏移（``dt`` 需为月初）。"""
+    index = dt.year * 12 + (dt.month - 1) + months
+    return dt.replace(year=index // 12, month=index % 12 + 1)
+
+
+def month_range(dt: datetime) -> Tuple[datetime, datetime]:
+    """返回 ``dt`` 所在月份的 ``[start, end)`` 区间。"""
+    start = month_start(dt)
+    return start, add_months(start, 1)
+
+
+def partition_name(table: str, start: datetime) -> str:
+    """按 ``<表名>_pYYYYMM`` 规则生成分区名。"""
+    return f"{table}_p{start:%Y%m}"
+
+
+async def ensure_monthly_partitions(
+    db: AsyncSession,
+    *,
+    table: str,
+    months_ahead: int = 2,
+    now: Optional[datetime] = None,
+) -> List[str]:
+    """确保当前月及未来若干月的分区存在。
+
+    参数：
+        db: 异步数据库会话。
+        table: 分区父表名（需在 ``MONTHLY_PARTITIONED_TABLES`` 中）。
+        months_ahead: 额外预建的未来月份数。
+        now: 基准时间，默认当前 UTC 时间。
+
+    返回：
+        List[str]: 本次新建的分区名列表。
+
+    异常：
+        ValueError: 表未登记为按月分区时抛出。
+    """
+    if table not in MONTHLY_PARTITIONED_TABLES:
+        raise ValueError(f"Table is not monthly partitioned: {table}")
+
+    base = month_start(now or datetime.now(timezone.utc))
+    created: List[str] = []
+    for offset in range(0, max(0, months_ahead) + 1):
+        start = add_months(base, offset)
+        end = add_months(start, 1)
+        name = partition_name(table, start)
+        exists = await db.scalar(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name})
+        if exists:
+            continue
+        await db.execute(
+            text(
+                f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" '
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            )
+        )
+        created.append(name)
+
+    await db.commit()
+    if created:
+        logger.info(f"[Partition] {table} 新建分区: {created}")
+    return created
+
+
+async def ensure_all_partitions(db: AsyncSession, *, months_ahead: int = 2) -> List[str]:
+    """为所有登记的按月分区表预建分区，单表失败不影响其他表。"""
+    created: List[str] = []
+    for table in MONTHLY_PARTITIONED_TABLES:
+        try:
+            created.extend(await ensure_monthly_partitions(db, table=table, months_ahead=months_ahead))
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"[Partition] {table} 预建分区失败: {type(e).__name__}: {e}", exc_info=True)
+    return created
@@ -20,6 +20,7 @@ from app.models.payloads import CommentPayload, PostPayload
 from app.models.posts import Post
 from app.models.subreddits import Subreddit
 from app.models.tags import Tag
+from app.services.cache_service import CACHE_POSTS, CACHE_TAGS, invalidate_on_commit
 
 logger = get_logger("reddit_trace.ingest")
 
@@ -143,6 +144,8 @@ async def save_subreddit_posts(
     """
     fetched_at = fetched_at or datetime.now(timezone.utc)
     subreddit = await upsert_subreddit(db, name=subreddit_name, fetched_at=fetched_at)
+    if posts:
+        invalidate_on_commit(db, CACHE_POSTS, CACHE_TAGS)
 
     reddit_ids = [p.get("id") for p in posts if p.get("id")]
     existing_posts: Dict[str, Post] = {}
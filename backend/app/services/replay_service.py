@@ -0,0 +1,278 @@
+from __future__ import annotations
+"""离线重放：用当前适配器规范化逻辑重新处理已存储的原始载荷。
+
+修复 ``_normalize_post`` / ``_normalize_story`` 等规范化缺陷后，无需重新抓取：
+按载荷 ID 区间读取 ``source_item_payloads`` / ``source_comment_payloads``，经适配器的
+``normalize_item_payload`` / ``normalize_comment_payload`` 重新规范化，与在线行比较后
+批量更新有变化的行。全程不访问网络。
+
+- 字段映射与入库共用 ``item_columns`` / ``comment_columns``，重放结果与重新抓取一致；
+- ``created_at`` 是载荷与评论表的分区键，变化只计入差异统计，不写回；
+- 载荷 ID 区间可分给多个进程并行处理（见 ``scripts/replay_payloads.py``）。
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, func, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import AsyncSessionLocal, engine
+from app.logging_config import get_logger
+from app.models.source_comments import SourceComment
+from app.models.source_items import SourceItem
+from app.models.source_payloads import SourceCommentPayload, SourceItemPayload
+from app.models.source_targets import SourceTarget
+from app.services.simhash_service import comment_simhash, mark_near_duplicates
+from app.services.source_ingestion_service import comment_columns, item_columns
+from app.services.source_registry_service import source_registry
+
+logger = get_logger("reddit_trace.replay")
+
+REPLAY_KINDS = ("items", "comments")
+
+ITEM_REPLAY_FIELDS = ("item_type", "title", "content", "author", "url", "canonical_url", "score", "num_comments")
+COMMENT_REPLAY_FIELDS = ("content", "author", "score", "depth")
+# 只比较、不写回的字段
+REPORT_ONLY_FIELDS = ("created_at",)
+
+SAMPLE_VALUE_MAX_LENGTH = 120
+
+# 载荷 ID 闭区间
+PayloadRange = Tuple[int, int]
+
+
+def empty_stats() -> Dict[str, Any]:
+    return {"rows": 0, "changed": 0, "errors": 0, "fields": {}, "samples": {}}
+
+
+def merge_stats(total: Dict[str, Any], part: Dict[str, Any], *, sample_size: int = 5) -> Dict[str, Any]:
+    """把一个区间的统计并入总计（样本按字段截断到 ``sample_size`` 条）。"""
+    for key in ("rows", "changed", "errors"):
+        total[key] += part[key]
+    for field, count in part["fields"].items():
+        total["fields"][field] = total["fields"].get(field, 0) + count
+    for field, samples in part["samples"].items():
+        merged = total["samples"].setdefault(field, [])
+        merged.extend(samples[: max(sample_size - len(merged), 0)])
+    return total
+
+
+def _sample_value(value: Any) -> Any:
+    if isinstance(value, str) and len(value) > SAMPLE_VALUE_MAX_LENGTH:
+        return value[:SAMPLE_VALUE_MAX_LENGTH] + "…"
+    return value
+
+
+def _record_diff(stats: Dict[str, Any], field: str, external_id: str, old: Any, new: Any, sample_size: int) -> None:
+    stats["fields"][field] = stats["fields"].get(field, 0) + 1
+    samples = stats["samples"].setdefault(field, [])
+    if len(samples) < sample_size:
+        samples.append({"external_id": external_id, "old": _sample_value(old), "new": _sample_value(new)})
+
+
+async def plan_ranges(
+    db: AsyncSession,
+    *,
+    kind: str,
+    source: Optional[str] = None,
+    chunk_size: int = 20000,
+) -> List[PayloadRange]:
+    """按载荷 ID 把全量数据切成若干区间（区间内 ID 可能不连续，只用于分工）。"""
+    model = SourceItemPayload if kind == "items" else SourceCommentPayload
+    query = select(func.min(model.id), func.max(model.id))
+    if source:
+        query = query.where(model.source == source)
+    lo, hi = (await db.execute(query)).one()
+    if lo is None:
+        return []
+    return [(start, min(start + chunk_size - 1, hi)) for start in range(lo, hi + 1, chunk_size)]
+
+
+async def _replay_item_batch(
+    db: AsyncSession, rows, *, stats: Dict[str, Any], dry_run: bool, sample_size: int
+) -> None:
+    updates: List[Dict[str, Any]] = []
+    for row in rows:
+        item = row.SourceItem
+        try:
+            normalized = source_registry.get(item.source).normalize_item_payload(
+                row.payload, channel=row.target_key or ""
+            )
+            values = item_columns(normalized)
+        except Exception as e:
+            stats["errors"] += 1
+            logger.warning(f"[Replay] 内容规范化失败 {item.source}:{item.external_id}: {type(e).__name__}: {e}")
+            continue
+
+        changed = False
+        for field in ITEM_REPLAY_FIELDS + REPORT_ONLY_FIELDS:
+            old = getattr(item, field)
+            if values[field] != old:
+                _record_diff(stats, field, item.external_id, old, values[field], sample_size)
+                changed = changed or field not in REPORT_ONLY_FIELDS
+        if changed:
+            stats["changed"] += 1
+            updates.append({"row_id": item.id, **{f"new_{field}": values[field] for field in ITEM_REPLAY_FIELDS}})
+
+    if updates and not dry_run:
+        items = SourceItem.__table__
+        await db.execute(
+            update(items)
+            .where(items.c.id == bindparam("row_id"))
+            .values({field: bindparam(f"new_{field}") for field in ITEM_REPLAY_FIELDS}),
+            updates,
+        )
+
+
+async def _replay_comment_batch(
+    db: AsyncSession, rows, *, stats: Dict[str, Any], dry_run: bool, sample_size: int
+) -> None:
+    updates: List[Dict[str, Any]] = []
+    rehash: List[Tuple[int, Any]] = []
+    for row in rows:
+        comment = row.SourceComment
+        try:
+            normalized = source_registry.get(comment.source).normalize_comment_payload(row.payload)
+            values = comment_columns(normalized)
+            if normalized.get("depth") is None:
+                # 载荷不含深度（归档转储导入），入库时按父评论推算，重放保持原值
+                values["depth"] = comment.depth
+        except Exception as e:
+            stats["errors"] += 1
+            logger.warning(f"[Replay] 评论规范化失败 {comment.source}:{comment.external_id}: {type(e).__name__}: {e}")
+            continue
+
+        changed = False
+        for field in COMMENT_REPLAY_FIELDS + REPORT_ONLY_FIELDS:
+            old = getattr(comment, field)
+            if values[field] != old:
+                _record_diff(stats, field, comment.external_id, old, values[field], sample_size)
+                changed = changed or field not in REPORT_ONLY_FIELDS
+        if not changed:
+            continue
+        stats["changed"] += 1
+        simhash = comment_simhash(values["content"])
+        update_row = {
+            "row_id": comment.id,
+            "row_created_at": comment.created_at,
+            **{f"new_{field}": values[field] for field in COMMENT_REPLAY_FIELDS},
+            "new_simhash": simhash,
+            "new_duplicate_of_id": comment.duplicate_of_id if simhash == comment.simhash else None,
+        }
+        updates.append(update_row)
+        if simhash != comment.simhash:
+            rehash.append((comment.id, comment.created_at))
+
+    if updates and not dry_run:
+        comments = SourceComment.__table__
+        fields = COMMENT_REPLAY_FIELDS + ("simhash", "duplicate_of_id")
+        await db.execute(
+            update(comments)
+            .where(comments.c.id == bindparam("row_id"), comments.c.created_at == bindparam("row_created_at"))
+            .values({field: bindparam(f"new_{field}") for field in fields}),
+            updates,
+        )
+        if rehash:
+            # 内容变化的评论重新判定近似重复
+            result = await db.execute(
+                select(SourceComment)
+                .where(tuple_(SourceComment.id, SourceComment.created_at).in_(rehash))
+                # 本批实体仍在会话中，需用刚写入的值覆盖
+                .execution_options(populate_existing=True)
+            )
+            await mark_near_duplicates(db, result.scalars().all())
+
+
+async def replay_range(
+    db: AsyncSession,
+    *,
+    kind: str,
+    lo: int,
+    hi: int,
+    source: Optional[str] = None,
+    dry_run: bool = False,
+    batch_size: int = 500,
+    sample_size: int = 5,
+) -> Dict[str, Any]:
+    """重放一个载荷 ID 区间（按 ID 分批，每批独立提交）。
+
+    参数：
+        db: 异步数据库会话。
+        kind: ``items`` 或 ``comments``。
+        lo: 起始载荷 ID（含）。
+        hi: 结束载荷 ID（含）。
+        source: 只处理该平台。
+        dry_run: 只统计差异，不写回。
+        batch_size: 每批载荷数。
+        sample_size: 每个字段保留的差异样本数。
+
+    返回：
+        Dict[str, Any]: ``rows`` 处理数、``changed`` 有变化的行数、``errors`` 规范化失败数、
+        ``fields`` 各字段变化数、``samples`` 各字段差异样本。
+
+    异常：
+        ValueError: ``kind`` 不受支持时抛出。
+    """
+    if kind not in REPLAY_KINDS:
+        raise ValueError(f"Unsupported replay kind: {kind}")
+
+    stats = empty_stats()
+    last_id = lo - 1
+    while True:
+        if kind == "items":
+            query = (
+                select(SourceItemPayload.id, SourceItemPayload.payload, SourceItem, SourceTarget.target_key)
+                .join(
+                    SourceItem,
+                    (SourceItem.id == SourceItemPayload.item_id) & (SourceItem.created_at == SourceItemPayload.created_at),
+                )
+                .outerjoin(SourceTarget, SourceTarget.id == SourceItem.target_id)
+            )
+            model = SourceItemPayload
+        else:
+            query = select(SourceCommentPayload.id, SourceCommentPayload.payload, SourceComment).join(
+                SourceComment,
+                (SourceComment.id == SourceCommentPayload.comment_id)
+                & (SourceComment.created_at == SourceCommentPayload.created_at),
+            )
+            model = SourceCommentPayload
+        query = query.where(model.id > last_id, model.id <= hi)
+        if source:
+            query = query.where(model.source == source)
+        rows = (await db.execute(query.order_by(model.id).limit(batch_size))).all()
+        if not rows:
+            break
+
+        if kind == "items":
+            await _replay_item_batch(db, rows, stats=stats, dry_run=dry_run, sample_size=sample_size)
+        else:
+            await _replay_comment_batch(db, rows, stats=stats, dry_run=dry_run, sample_size=sample_size)
+        if dry_run:
+            await db.rollback()
+        else:
+            await db.commit()
+        db.expunge_all()
+
+        last_id = rows[-1].id
+        stats["rows"] += len(rows)
+    return stats
+
+
+async def _replay_range_standalone(kind: str, lo: int, hi: int, options: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        async with AsyncSessionLocal() as db:
+            return await replay_range(db, kind=kind, lo=lo, hi=hi, **options)
+    finally:
+        await engine.dispose()
+
+
+def replay_range_in_process(kind: str, lo: int, hi: int, options: Dict[str, Any]) -> Dict[str, Any]:
+    """在工作进程中重放一个区间（独立事件循环与连接池）。"""
+    import app.models  # noqa: F401  注册全部映射，供关系解析
+
+    started = time.perf_counter()
+    stats = asyncio.run(_replay_range_standalone(kind, lo, hi, options))
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    return stats
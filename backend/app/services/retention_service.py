@@ -0,0 +1,399 @@
+from __future__ import annotations
+"""数据保留与归档服务。
+
+按平台（``settings.retention_policies``）与目标（``source_targets.options["retention"]``）
+两级策略清理历史数据：
+
+- ``payload_days``：原始载荷保留天数，超期后删除 ``source_*_payloads`` 行；
+- ``archive_after_months``：内容发布超过 M 个月后移出在线表；
+- ``archive_mode``：``table`` 写入 ``source_*_archive`` 表，``ndjson`` 导出为 gzip NDJSON 文件。
+
+所有删除均按批执行：每批独立事务、设置 ``lock_timeout``，批间休眠让出 IO，
+避免长事务与长时间持锁。由于策略可按目标细分，不能直接整块 DROP 月度分区，
+但删除条件总是带上分区键上界以便裁剪分区。
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import Select, and_, delete, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.logging_config import get_logger
+from app.models.source_archives import SourceCommentArchive, SourceItemArchive
+from app.models.source_comments import SourceComment, SourceCommentKey
+from app.models.source_item_tag_associations import source_item_tags
+from app.models.source_items import SourceItem
+from app.models.source_payloads import SourceCommentPayload, SourceItemPayload
+from app.models.source_targets import SourceTarget
+from app.services.cache_service import CACHE_ITEMS, invalidate_on_commit
+from app.services.partition_service import add_months, month_start
+
+logger = get_logger("reddit_trace.retention")
+
+ARCHIVE_MODES = ("table", "ndjson")
+
+
+def resolve_policy(source: str, target_options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """合并平台默认策略与目标级覆盖。
+
+    参数：
+        source: 平台标识。
+        target_options: 目标的 ``options``；其中 ``retention`` 字段覆盖平台默认值。
+
+    返回：
+        Dict[str, Any]: 包含 ``payload_days`` / ``archive_after_months`` / ``archive_mode`` 的策略。
+    """
+    policy: Dict[str, Any] = {"payload_days": None, "archive_after_months": None, "archive_mode": "table"}
+    policy.update(settings.retention_policies.get(source) or {})
+    policy.update((target_options or {}).get("retention") or {})
+    if policy.get("archive_mode") not in ARCHIVE_MODES:
+        policy["archive_mode"] = "table"
+    return policy
+
+
+def _scope(source: str, target_id: Optional[int]):
+    """内容范围条件：指定目标，或该平台下未关联目标的内容。"""
+    if target_id is None:
+        return and_(SourceItem.source == source, SourceItem.target_id.is_(None))
+    return SourceItem.target_id == target_id
+
+
+def _stats(rows: int, started: float) -> Dict[str, Any]:
+    seconds = max(time.monotonic() - started, 1e-6)
+    return {"rows": rows, "seconds": round(seconds, 3), "rows_per_sec": round(rows / seconds, 1)}
+
+
+async def _set_lock_timeout(db: AsyncSession) -> None:
+    """为当前事务设置锁等待上限，拿不到锁时本批失败而不是长时间排队。"""
+    await db.execute(text(f"SET LOCAL lock_timeout = '{int(settings.retention_lock_timeout_ms)}ms'"))
+
+
+async def _pause() -> None:
+    await asyncio.sleep(max(settings.retention_batch_pause_ms, 0) / 1000)
+
+
+async def _delete_in_batches(
+    db: AsyncSession,
+    build_delete: Callable[[int], Any],
+    *,
+    batch_size: int,
+) -> int:
+    """反复执行批量删除直到不足一批，每批单独提交。"""
+    total = 0
+    while True:
+        await _set_lock_timeout(db)
+        result = await db.execute(build_delete(batch_size))
+        await db.commit()
+        deleted = result.rowcount or 0
+        total += deleted
+        if deleted < batch_size:
+            return total
+        await _pause()
+
+
+async def purge_payloads(
+    db: AsyncSession,
+    *,
+    source: str,
+    target_id: Optional[int],
+    payload_days: int,
+    now: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """删除范围内超过保留天数的内容与评论原始载荷。
+
+    参数：
+        db: 异步数据库会话。
+        source: 平台标识。
+        target_id: 目标 ID；``None`` 表示该平台下未关联目标的内容。
+        payload_days: 载荷保留天数（按抓取时间 ``fetched_at`` 计算）。
+        now: 基准时间，默认当前 UTC 时间。
+
+    返回：
+        Dict[str, Any]: ``rows`` / ``seconds`` / ``rows_per_sec`` 统计。
+    """
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=payload_days)
+    batch_size = max(int(settings.retention_payload_batch_size), 1)
+    scope = _scope(source, target_id)
+    started = time.monotonic()
+
+    # 载荷 created_at 不晚于 fetched_at，故 created_at < cutoff 是等价的必要条件，可用于分区裁剪
+    def item_batch(limit: int):
+        keys: Select = (
+            select(SourceItemPayload.id, SourceItemPayload.created_at)
+            .join(SourceItem, SourceItem.id == SourceItemPayload.item_id)
+            .where(
+                scope,
+                SourceItemPayload.created_at < cutoff,
+                SourceItemPayload.fetched_at < cutoff,
+            )
+            .limit(limit)
+        )
+        return delete(SourceItemPayload).where(
+            tuple_(SourceItemPayload.id, SourceItemPayload.created_at).in_(keys)
+        )
+
+    def comment_batch(limit: int):
+        keys: Select = (
+            select(SourceCommentPayload.id, SourceCommentPayload.created_at)
+            .join(
+                SourceComment,
+                and_(
+                    SourceComment.id == SourceCommentPayload.comment_id,
+                    SourceComment.created_at == SourceCommentPayload.created_at,
+                ),
+            )
+            .join(SourceItem, SourceItem.id == SourceComment.item_id)
+            .where(
+                scope,
+                SourceCommentPayload.created_at < cutoff,
+                SourceCommentPayload.fetched_at < cutoff,
+            )
+            .limit(limit)
+        )
+        return delete(SourceCommentPayload).where(
+            tuple_(SourceCommentPayload.id, SourceCommentPayload.created_at).in_(keys)
+        )
+
+    rows = await _delete_in_batches(db, comment_batch, batch_size=batch_size)
+    rows += await _delete_in_batches(db, item_batch, batch_size=batch_size)
+    return _stats(rows, started)
+
+
+def _row_dict(row: Any, columns: Sequence[str]) -> Dict[str, Any]:
+    return {name: getattr(row, name) for name in columns}
+
+
+def _stored_columns(table) -> List[Any]:
+    """在线表中非数据库生成的列（如 ``search_vector`` 不参与归档/导出）。"""
+    return [column for column in table.c if column.computed is None]
+
+
+def _archive_columns(archive_table, live_table) -> List[str]:
+    """归档表与在线表共有的列（``archived_at`` 由数据库填充）。"""
+    live = set(live_table.c.keys())
+    return [name for name in archive_table.c.keys() if name in live and name != "archived_at"]
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _append_ndjson(path: str, records: List[Dict[str, Any]]) -> None:
+    """以追加方式写入 gzip NDJSON（多次追加会形成多个 gzip member，标准工具可直接读取）。"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with gzip.open(path, "at", encoding="utf-8") as fp:
+        for record in records:
+            fp.write(json.dumps(record, ensure_ascii=False, default=_json_default))
+            fp.write("\n")
+
+
+def _ndjson_path(source: str, target_key: Optional[str], now: datetime) -> str:
+    safe_key = "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in (target_key or "_untargeted"))
+    return os.path.join(settings.retention_archive_dir, source, safe_key, f"items-{now:%Y%m%d}.ndjson.gz")
+
+
+async def _delete_items(db: AsyncSession, item_ids: List[int], comment_ids: List[int], oldest: datetime) -> None:
+    """按依赖顺序删除一批内容及其评论、载荷与标签关联（指标行随外键级联删除）。
+
+    评论与评论载荷不加发布时间下界：时钟偏差或时间缺省回退可能让评论早于所属内容，
+    漏删会让内容删除因外键失败，并在之后每轮重复选中同一批。
+    评论的外部 ID 查找表行一并删除，归档后重新抓到同一评论时按新评论入库。
+    """
+    if comment_ids:
+        await db.execute(delete(SourceCommentPayload).where(SourceCommentPayload.comment_id.in_(comment_ids)))
+    await db.execute(
+        delete(SourceCommentKey).where(
+            SourceCommentKey.comment_id.in_(select(SourceComment.id).where(SourceComment.item_id.in_(item_ids)))
+        )
+    )
+    await db.execute(delete(SourceComment).where(SourceComment.item_id.in_(item_ids)))
+    await db.execute(
+        delete(SourceItemPayload).where(
+            SourceItemPayload.item_id.in_(item_ids),
+            SourceItemPayload.created_at >= oldest,
+        )
+    )
+    await db.execute(delete(source_item_tags).where(source_item_tags.c.source_item_id.in_(item_ids)))
+    await db.execute(delete(SourceItem).where(SourceItem.id.in_(item_ids)))
+
+
+async def archive_items(
+    db: AsyncSession,
+    *,
+    source: str,
+    target_id: Optional[int],
+    target_key: Optional[str],
+    archive_after_months: int,
+    archive_mode: str = "table",
+    now: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """把范围内发布超过 M 个月的内容（含评论）移出在线表。
+
+    ``table`` 模式写入归档表（不保留原始载荷）；``ndjson`` 模式按
+    ``<archive_dir>/<source>/<target_key>/items-YYYYMMDD.ndjson.gz`` 导出，
+    每行一条内容，内嵌 ``comments`` 与 ``payload``。文件先于删除写入，
+    若删除失败下一轮会重复导出同一批（至少一次）。评论分析结果保留不动。
+
+    参数：
+        db: 异步数据库会话。
+        source: 平台标识。
+        target_id: 目标 ID；``None`` 表示该平台下未关联目标的内容。
+        target_key: 目标键，仅用于 NDJSON 文件路径。
+        archive_after_months: 发布时间超过多少个月后归档（按自然月对齐）。
+        archive_mode: ``table`` 或 ``ndjson``。
+        now: 基准时间，默认当前 UTC 时间。
+
+    返回：
+        Dict[str, Any]: ``rows``（内容+评论行数）/ ``items`` / ``comments`` / ``seconds`` / ``rows_per_sec``。
+
+    异常：
+        ValueError: ``archive_mode`` 不受支持时抛出。
+    """
+    if archive_mode not in ARCHIVE_MODES:
+        raise ValueError(f"Unsupported archive_mode: {archive_mode}")
+
+    now = now or datetime.now(timezone.utc)
+    cutoff = add_months(month_start(now), -archive_after_months)
+    batch_size = max(int(settings.retention_archive_batch_size), 1)
+    scope = _scope(source, target_id)
+    item_table = SourceItem.__table__
+    comment_table = SourceComment.__table__
+    item_columns = _archive_columns(SourceItemArchive.__table__, item_table)
+    comment_columns = _archive_columns(SourceCommentArchive.__table__, comment_table)
+
+    started = time.monotonic()
+    archived_items = 0
+    archived_comments = 0
+    while True:
+        await _set_lock_timeout(db)
+        items = (
+            await db.execute(
+                select(*_stored_columns(item_table))
+                .where(scope, SourceItem.created_at < cutoff)
+                .order_by(SourceItem.id)
+                .limit(batch_size)
+            )
+        ).all()
+        if not items:
+            await db.commit()
+            break
+
+        item_ids = [row.id for row in items]
+        # 内容载荷的 created_at 与内容一致，以最早发布时间作为分区裁剪下界；
+        # 评论可能早于所属内容（见 _delete_items），按 item_id 全量选取
+        oldest = min(row.created_at for row in items)
+        comments = (
+            await db.execute(select(*_stored_columns(comment_table)).where(SourceComment.item_id.in_(item_ids)))
+        ).all()
+        comment_ids = [row.id for row in comments]
+
+        if archive_mode == "table":
+            await db.execute(
+                pg_insert(SourceItemArchive)
+                .values([_row_dict(row, item_columns) for row in items])
+                .on_conflict_do_nothing(index_elements=["id"])
+            )
+            if comments:
+                await db.execute(
+                    pg_insert(SourceCommentArchive)
+                    .values([_row_dict(row, comment_columns) for row in comments])
+                    .on_conflict_do_nothing(index_elements=["id"])
+                )
+        else:
+            payloads = dict(
+                (
+                    await db.execute(
+                        select(SourceItemPayload.item_id, SourceItemPayload.payload).where(
+                            SourceItemPayload.item_id.in_(item_ids),
+                            SourceItemPayload.created_at >= oldest,
+                        )
+                    )
+                ).all()
+            )
+            comments_by_item: Dict[int, List[Dict[str, Any]]] = {}
+            for row in comments:
+                comments_by_item.setdefault(row.item_id, []).append(dict(row._mapping))
+            records = []
+            for row in items:
+                record = dict(row._mapping)
+                record["comments"] = comments_by_item.get(row.id, [])
+                record["payload"] = payloads.get(row.id)
+                records.append(record)
+            await asyncio.to_thread(_append_ndjson, _ndjson_path(source, target_key, now), records)
+
+        await _delete_items(db, item_ids, comment_ids, oldest)
+        invalidate_on_commit(db, CACHE_ITEMS)
+        await db.commit()
+
+        archived_items += len(items)
+        archived_comments += len(comments)
+        if len(items) < batch_size:
+            break
+        await _pause()
+
+    stats = _stats(archived_items + archived_comments, started)
+    stats.update({"items": archived_items, "comments": archived_comments})
+    return stats
+
+
+async def _apply_policy(
+    db: AsyncSession,
+    *,
+    source: str,
+    target_id: Optional[int],
+    target_key: Optional[str],
+    policy: Dict[str, Any],
+) -> None:
+    label = f"source={source}, target={target_key or '-'}"
+    if policy.get("payload_days"):
+        stats = await purge_payloads(
+            db, source=source, target_id=target_id, payload_days=int(policy["payload_days"])
+        )
+        logger.info(f"[Retention] 载荷清理完成: {label}, {stats}")
+    if policy.get("archive_after_months"):
+        stats = await archive_items(
+            db,
+            source=source,
+            target_id=target_id,
+            target_key=target_key,
+            archive_after_months=int(policy["archive_after_months"]),
+            archive_mode=policy.get("archive_mode") or "table",
+        )
+        logger.info(f"[Retention] 归档完成({policy.get('archive_mode')}): {label}, {stats}")
+
+
+async def run_retention(db: AsyncSession) -> None:
+    """对所有目标及各平台未关联目标的内容执行保留策略，单个范围失败不影响其他范围。"""
+    targets = (
+        await db.execute(select(SourceTarget.id, SourceTarget.source, SourceTarget.target_key, SourceTarget.options))
+    ).all()
+    await db.commit()
+
+    scopes = [(t.source, t.id, t.target_key, resolve_policy(t.source, t.options)) for t in targets]
+    untargeted_sources = (
+        await db.execute(
+            select(SourceItem.source).where(SourceItem.target_id.is_(None)).group_by(SourceItem.source)
+        )
+    ).scalars().all()
+    await db.commit()
+    scopes.extend((source, None, None, resolve_policy(source)) for source in untargeted_sources)
+
+    for source, target_id, target_key, policy in scopes:
+        try:
+            await _apply_policy(db, source=source, target_id=target_id, target_key=target_key, policy=policy)
+        except Exception as e:
+            await db.rollback()
+            logger.error(
+                f"[Retention] 执行失败: source={source}, target={target_key or '-'}, err={type(e).__name__}: {e}",
+                exc_info=True,
+            )
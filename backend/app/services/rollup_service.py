@@ -0,0 +1,157 @@
+from __future__ import annotations
+"""小时级入库/分析计数预聚合服务。
+
+入库、分析与抓取失败时增量累加 ``ingest_hourly_rollups``，
+趋势接口只读取预聚合行，不扫描原始表。
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.logging_config import get_logger
+from app.models.ingest_rollups import IngestHourlyRollup
+from app.models.source_item_tag_associations import source_item_tags
+
+logger = get_logger("reddit_trace.rollup")
+
+# 维度占位：未关联目标 / 不分标签的合计
+ROLLUP_ALL = 0
+
+ROLLUP_METRICS = ("items", "comments", "valuable_analyses", "errors")
+
+# (bucket, source, target_id, tag_id)
+RollupKey = Tuple[datetime, str, int, int]
+RollupCounts = Dict[RollupKey, Dict[str, int]]
+
+
+def hour_bucket(dt: Optional[datetime] = None) -> datetime:
+    """返回所在小时的整点时间（UTC）。"""
+    dt = dt or datetime.now(timezone.utc)
+    dt = dt.astimezone(timezone.utc) if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+    return dt.replace(minute=0, second=0, microsecond=0)
+
+
+def add_counts(
+    counts: RollupCounts,
+    *,
+    at: Optional[datetime],
+    source: str,
+    target_id: Optional[int],
+    tag_ids: Iterable[int] = (),
+    **metrics: int,
+) -> None:
+    """把一次事件累加到合计行以及每个标签的明细行。
+
+    参数：
+        counts: 待写入的累加结果（原地修改）。
+        at: 事件时间，按小时取整。
+        source: 平台标识。
+        target_id: 目标 ID，``None`` 记为 ``ROLLUP_ALL``。
+        tag_ids: 事件关联的标签 ID。
+        **metrics: ``items`` / ``comments`` / ``valuable_analyses`` / ``errors`` 增量。
+    """
+    bucket = hour_bucket(at)
+    target_key = int(target_id or ROLLUP_ALL)
+    for tag_id in {ROLLUP_ALL, *(int(t) for t in tag_ids if t)}:
+        row = counts.setdefault((bucket, source, target_key, tag_id), dict.fromkeys(ROLLUP_METRICS, 0))
+        for name, value in metrics.items():
+            row[name] += int(value)
+
+
+async def record_rollups(db: AsyncSession, counts: RollupCounts) -> None:
+    """以 ``INSERT ... ON CONFLICT DO UPDATE`` 原子累加计数（不提交事务）。
+
+    行按主键排序写入，并发入库时各事务加锁顺序一致，避免死锁。
+    """
+    if not counts:
+        return
+    rows = [
+        {"bucket": bucket, "source": source, "target_id": target_id, "tag_id": tag_id, **values}
+        for (bucket, source, target_id, tag_id), values in sorted(counts.items())
+    ]
+    stmt = pg_insert(IngestHourlyRollup).values(rows)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            constraint="ingest_hourly_rollups_pkey",
+            set_={name: getattr(IngestHourlyRollup, name) + stmt.excluded[name] for name in ROLLUP_METRICS},
+        )
+    )
+
+
+async def load_item_tag_ids(db: AsyncSession, item_id: int) -> List[int]:
+    """读取内容当前关联的标签 ID。"""
+    result = await db.execute(
+        select(source_item_tags.c.tag_id).where(source_item_tags.c.source_item_id == item_id)
+    )
+    return list(result.scalars().all())
+
+
+async def record_fetch_error(db: AsyncSession, *, source: str, target_id: Optional[int]) -> None:
+    """记录一次抓取失败并提交；自身失败只记日志，不影响调用方的错误处理。"""
+    try:
+        counts: RollupCounts = {}
+        add_counts(counts, at=None, source=(source or "").strip().lower(), target_id=target_id, errors=1)
+        await record_rollups(db, counts)
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        logger.warning(f"[Rollup] 记录抓取失败计数出错: {type(e).__name__}: {e}")
+
+
+async def list_timeseries(
+    db: AsyncSession,
+    *,
+    hours: int = 48,
+    interval: str = "hour",
+    source: Optional[str] = None,
+    target_id: Optional[int] = None,
+    tag_id: Optional[int] = None,
+    group_by_source: bool = False,
+) -> List[Dict[str, Any]]:
+    """读取预聚合趋势数据。
+
+    参数：
+        db: 异步数据库会话。
+        hours: 回看窗口（小时）。
+        interval: ``hour`` 或 ``day``，按天时在 SQL 中二次聚合。
+        source: 可选平台过滤。
+        target_id: 可选目标过滤（``0`` 表示未关联目标的内容）。
+        tag_id: 可选标签过滤；不传时读取合计行。
+        group_by_source: 是否按平台拆分序列。
+
+    返回：
+        List[Dict[str, Any]]: 按时间升序的数据点（无数据的时间段不返回）。
+    """
+    since = hour_bucket() - timedelta(hours=max(hours, 1) - 1)
+    bucket = IngestHourlyRollup.bucket if interval == "hour" else func.date_trunc("day", IngestHourlyRollup.bucket)
+    bucket = bucket.label("bucket")
+
+    columns = [bucket]
+    if group_by_source:
+        columns.append(IngestHourlyRollup.source)
+    columns.extend(func.sum(getattr(IngestHourlyRollup, name)).label(name) for name in ROLLUP_METRICS)
+
+    query = select(*columns).where(
+        IngestHourlyRollup.bucket >= since,
+        IngestHourlyRollup.tag_id == (tag_id or ROLLUP_ALL),
+    )
+    if source:
+        query = query.where(IngestHourlyRollup.source == source)
+    if target_id is not None:
+        query = query.where(IngestHourlyRollup.target_id == target_id)
+
+    group_columns = [bucket, IngestHourlyRollup.source] if group_by_source else [bucket]
+    query = query.group_by(*group_columns).order_by(*group_columns)
+
+    result = await db.execute(query)
+    points = []
+    for row in result.all():
+        point = dict(row._mapping)
+        for name in ROLLUP_METRICS:
+            point[name] = int(point[name] or 0)
+        points.append(point)
+    return points
@@ -1,15 +1,20 @@
 ﻿from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from sqlalchemy import select
-from sqlalchemy.exc import DBAPIError
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
 from datetime import datetime, timezone
 import asyncio
+import time
 
-from app.database import AsyncSessionLocal, engine
+from app.config import settings
+from app.database import AsyncSessionLocal, pool_is_saturated
 from app.models.subreddits import Subreddit
 from app.models.source_targets import SourceTarget
 from app.services.reddit_crawler_service import crawler
 from app.services.reddit_ingestion_service import save_subreddit_posts
+from app.services.partition_service import ensure_all_partitions
+from app.services.retention_service import run_retention
+from app.services.rollup_service import record_fetch_error
 from app.services.source_fetch_service import fetch_and_ingest_target
 from app.logging_config import get_logger
 
@@ -27,6 +32,9 @@ class SchedulerService:
     def __init__(self):
         """初始化 APScheduler 实例。"""
         self.scheduler = AsyncIOScheduler()
+        # 连接池饱和退避：单调时钟截止时间与当前退避时长
+        self._backoff_until = 0.0
+        self._backoff_seconds = 0.0
 
     def start(self):
         """启动调度器并注册周期任务。"""
@@ -37,6 +45,24 @@ class SchedulerService:
             id="check_fetch",
             replace_existing=True
         )
+        # 每 6 小时预建未来月份分区（启动时立即执行一次）
+        self.scheduler.add_job(
+            self.maintain_partitions,
+            IntervalTrigger(hours=6),
+            id="maintain_partitions",
+            next_run_time=datetime.now(timezone.utc),
+            replace_existing=True,
+        )
+        # 数据保留/归档任务默认关闭，单实例串行执行
+        if settings.retention_enabled:
+            self.scheduler.add_job(
+                self.apply_retention,
+                IntervalTrigger(minutes=settings.retention_interval_minutes),
+                id="retention",
+                max_instances=1,
+                coalesce=True,
+                replace_existing=True,
+            )
         self.scheduler.start()
 
     def stop(self):
@@ -46,8 +72,11 @@ class SchedulerService:
     async def check_and_fetch(self):
         """扫描监控目标并触发抓取。
 
-        当发生短暂数据库连接异常时会自动重试一次。
+        数据库连接池饱和（占用率过高、借出等待过长或超时）时本轮不再发起新的抓取，
+        按指数退避推迟后续轮次，避免与接口请求争抢连接；短暂的连接异常会重试一次。
         """
+        if time.monotonic() < self._backoff_until:
+            return
         for attempt in range(2):
             try:
                 async with AsyncSessionLocal() as db:
@@ -58,6 +87,8 @@ class SchedulerService:
 
                     for target in targets:
                         if self._should_fetch_target(target):
+                            if self._pool_saturated():
+                                return
                             await self.fetch_target(target, db)
 
                     result = await db.execute(
@@ -67,25 +98,59 @@ class SchedulerService:
 
                     for sub in subreddits:
                         if self._should_fetch(sub):
+                            if self._pool_saturated():
+                                return
                             await self.fetch_subreddit(sub, db)
+                # 本轮未遇到饱和，退避复位
+                self._backoff_seconds = 0.0
+                return
+            except PoolTimeoutError as e:
+                logger.warning(f"[Scheduler] 获取数据库连接超时: {e}")
+                self._back_off()
                 return
             except (DBAPIError, ConnectionResetError) as e:
+                # 断连错误会由连接池自动作废相关连接（配合 pre-ping），无需 dispose 整个连接池
                 logger.error(
                     f"[Scheduler] 数据库连接异常（可能是连接被重置/空闲断开），attempt={attempt + 1}/2: {e}",
                     exc_info=True,
                 )
-                try:
-                    await engine.dispose()
-                except Exception as dispose_err:
-                    logger.warning(
-                        f"[Scheduler] dispose engine 失败: {type(dispose_err).__name__}: {dispose_err}",
-                        exc_info=True,
-                    )
                 await asyncio.sleep(1)
             except Exception as e:
                 logger.error(f"[Scheduler] 未知异常: {type(e).__name__}: {e}", exc_info=True)
                 return
 
+    def _pool_saturated(self) -> bool:
+        """连接池饱和时进入退避并返回 True。"""
+        if not pool_is_saturated():
+            return False
+        self._back_off()
+        return True
+
+    def _back_off(self):
+        """按指数退避推迟下一轮抓取。"""
+        self._backoff_seconds = min(
+            max(self._backoff_seconds * 2, settings.scheduler_backoff_base_seconds),
+            settings.scheduler_backoff_max_seconds,
+        )
+        self._backoff_until = time.monotonic() + self._backoff_seconds
+        logger.warning(f"[Scheduler] 数据库连接池饱和，暂停抓取 {self._backoff_seconds:.0f}s")
+
+    async def maintain_partitions(self):
+        """为按月分区表预建当前及未来月份的分区。"""
+        try:
+            async with AsyncSessionLocal() as db:
+                await ensure_all_partitions(db)
+        except Exception as e:
+            logger.error(f"[Scheduler] 分区维护失败: {type(e).__name__}: {e}", exc_info=True)
+
+    async def apply_retention(self):
+        """按保留策略清理过期载荷并归档旧内容。"""
+        try:
+            async with AsyncSessionLocal() as db:
+                await run_retention(db)
+        except Exception as e:
+            logger.error(f"[Scheduler] 数据保留任务失败: {type(e).__name__}: {e}", exc_info=True)
+
     def _should_fetch(self, sub: Subreddit) -> bool:
         """判断旧版 subreddit 是否到达抓取时间。
 
@@ -127,6 +192,8 @@ class SchedulerService:
             target: 待抓取目标。
             db: 异步数据库会话。
         """
+        # 回滚会使实体过期，提前取出失败时需要的字段
+        source, target_id, target_key = target.source, target.id, target.target_key
         try:
             await fetch_and_ingest_target(
                 db,
@@ -141,12 +208,17 @@ class SchedulerService:
             logger.info(
                 f"[Scheduler] target 抓取完成: source={target.source}, type={target.target_type}, key={target.target_key}"
             )
+        except PoolTimeoutError:
+            # 连接池耗尽交由外层循环退避，不计为目标抓取失败
+            await db.rollback()
+            raise
         except Exception as e:
             await db.rollback()
             logger.error(
-                f"[Scheduler] 抓取 target 失败: source={target.source}, key={target.target_key}, err={type(e).__name__}: {e}",
+                f"[Scheduler] 抓取 target 失败: source={source}, key={target_key}, err={type(e).__name__}: {e}",
                 exc_info=True,
             )
+            await record_fetch_error(db, source=source, target_id=target_id)
 
     async def fetch_subreddit(self, sub: Subreddit, db):
         """抓取一个旧版 subreddit 并写入旧表。
@@ -179,6 +251,9 @@ class SchedulerService:
                 f"[Scheduler] r/{sub.name} 抓取完成: posts_created={created}, posts_updated={updated}"
             )
             await db.commit()
+        except PoolTimeoutError:
+            await db.rollback()
+            raise
         except Exception as e:
             await db.rollback()
             logger.error(f"[Scheduler] 抓取 r/{sub.name} 失败: {type(e).__name__}: {e}", exc_info=True)
@@ -0,0 +1,145 @@
+from __future__ import annotations
+"""统一内容/评论全文检索服务。
+
+基于 ``search_vector`` 生成列与 GIN 索引：先在索引上筛选命中并按相关度取一页 ID，
+再只对这一页回表取实体并生成高亮摘要（``ts_headline`` 开销较大，不能对全部命中执行）。
+评论表按 ``created_at`` 分区，传入时间范围可裁剪分区。
+"""
+
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import and_, func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.source_comments import SourceComment
+from app.models.source_items import SEARCH_TS_CONFIG, SourceItem
+
+SEARCH_SORTS = ("rank", "recent")
+
+# 高亮摘要参数：命中词以 <mark> 包裹，最多两个片段
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=30, MinWords=10, FragmentDelimiter= … "
+
+_TS_CONFIG = literal_column(f"'{SEARCH_TS_CONFIG}'::regconfig")
+
+
+def _ts_query(q: str):
+    """将用户输入解析为 tsquery（支持引号短语、``or`` 与 ``-`` 排除）。"""
+    return func.websearch_to_tsquery(_TS_CONFIG, q)
+
+
+def item_search_clause(q: str):
+    """内容全文匹配条件（可用于检索以外的场景圈定内容）。"""
+    return SourceItem.search_vector.op("@@")(_ts_query(q))
+
+
+def _headline(document, ts_query):
+    return func.ts_headline(_TS_CONFIG, document, ts_query, HEADLINE_OPTIONS)
+
+
+async def search_items(
+    db: AsyncSession,
+    *,
+    q: str,
+    source: Optional[str] = None,
+    target_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    sort: str = "rank",
+    skip: int = 0,
+    limit: int = 20,
+) -> List[Tuple[SourceItem, float, Optional[str]]]:
+    """全文检索统一内容（标题权重高于正文）。
+
+    参数：
+        db: 异步数据库会话。
+        q: 检索词（websearch 语法）。
+        source: 可选平台过滤。
+        target_id: 可选目标过滤。
+        since: 发布时间下界（含）。
+        until: 发布时间上界（不含）。
+        sort: ``rank`` 按相关度，``recent`` 按发布时间倒序。
+        skip: 偏移量。
+        limit: 返回条数。
+
+    返回：
+        List[Tuple[SourceItem, float, Optional[str]]]: ``(内容, 相关度, 高亮摘要)`` 列表。
+    """
+    ts_query = _ts_query(q)
+    rank = func.ts_rank_cd(SourceItem.search_vector, ts_query).label("rank")
+    hits = select(SourceItem.id, SourceItem.created_at, rank).where(SourceItem.search_vector.op("@@")(ts_query))
+    if source:
+        hits = hits.where(SourceItem.source == source)
+    if target_id:
+        hits = hits.where(SourceItem.target_id == target_id)
+    if since:
+        hits = hits.where(SourceItem.created_at >= since)
+    if until:
+        hits = hits.where(SourceItem.created_at < until)
+    order: Tuple[Any, ...]
+    if sort == "recent":
+        order = (SourceItem.created_at.desc(), SourceItem.id.desc())
+    else:
+        order = (rank.desc(), SourceItem.id.desc())
+    page = hits.order_by(*order).offset(skip).limit(limit).subquery()
+
+    snippet = _headline(func.concat_ws(" ", SourceItem.title, SourceItem.content), ts_query).label("snippet")
+    query = select(SourceItem, page.c.rank, snippet).join(page, page.c.id == SourceItem.id)
+    if sort == "recent":
+        query = query.order_by(page.c.created_at.desc(), page.c.id.desc())
+    else:
+        query = query.order_by(page.c.rank.desc(), page.c.id.desc())
+    result = await db.execute(query)
+    return [(item, float(item_rank or 0), headline) for item, item_rank, headline in result.all()]
+
+
+async def search_comments(
+    db: AsyncSession,
+    *,
+    q: str,
+    source: Optional[str] = None,
+    target_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    sort: str = "rank",
+    skip: int = 0,
+    limit: int = 20,
+) -> List[Tuple[SourceComment, float, Optional[str]]]:
+    """全文检索统一评论。
+
+    参数与返回同 ``search_items``；``target_id`` 通过所属内容过滤，
+    ``since``/``until`` 作用于评论发布时间并用于分区裁剪。
+    """
+    ts_query = _ts_query(q)
+    rank = func.ts_rank_cd(SourceComment.search_vector, ts_query).label("rank")
+    hits = select(SourceComment.id, SourceComment.created_at, rank).where(
+        SourceComment.search_vector.op("@@")(ts_query)
+    )
+    if source:
+        hits = hits.where(SourceComment.source == source)
+    if target_id:
+        hits = hits.where(
+            SourceComment.item_id.in_(select(SourceItem.id).where(SourceItem.target_id == target_id))
+        )
+    if since:
+        hits = hits.where(SourceComment.created_at >= since)
+    if until:
+        hits = hits.where(SourceComment.created_at < until)
+    order: Tuple[Any, ...]
+    if sort == "recent":
+        order = (SourceComment.created_at.desc(), SourceComment.id.desc())
+    else:
+        order = (rank.desc(), SourceComment.id.desc())
+    page = hits.order_by(*order).offset(skip).limit(limit).subquery()
+
+    snippet = _headline(SourceComment.content, ts_query).label("snippet")
+    query = select(SourceComment, page.c.rank, snippet).join(
+        page,
+        and_(page.c.id == SourceComment.id, page.c.created_at == SourceComment.created_at),
+    )
+    if sort == "recent":
+        query = query.order_by(page.c.created_at.desc(), page.c.id.desc())
+    else:
+        query = query.order_by(page.c.rank.desc(), page.c.id.desc())
+    result = await db.execute(query)
+    return [(comment, float(comment_rank or 0), headline) for comment, comment_rank, headline in result.all()]
@@ -0,0 +1,226 @@
+from __future__ import annotations
+"""评论近似重复检测（SimHash）。
+
+入库时为每条评论计算 64 位 SimHash（以词频为特征权重），存入 ``source_comments.simhash``。
+64 位按 16 位切成 ``SIMHASH_BANDS`` 段，每段一个表达式索引：汉明距离不超过
+``simhash_max_distance``（< 段数）的两条评论至少有一段完全相同，因此候选查询只需
+各段等值匹配（BitmapOr 多个索引），再在内存中精确计算汉明距离。
+
+命中后把评论标记为更早一条“规范评论”的近似重复（``duplicate_of_id``），
+分析阶段（``AnalyzerService``）直接跳过这些评论，不再消耗 LLM 筛选额度。
+"""
+
+import asyncio
+import hashlib
+import re
+import time
+from collections import Counter
+from datetime import timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import literal_column, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.logging_config import get_logger
+from app.models.source_comments import SourceComment
+
+logger = get_logger("reddit_trace.simhash")
+
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4
+SIMHASH_BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+_BAND_MASK = (1 << SIMHASH_BAND_BITS) - 1
+_UNSIGNED_MASK = (1 << SIMHASH_BITS) - 1
+
+_URL_RE = re.compile(r"https?://\S+|www\.\S+")
+_TOKEN_RE = re.compile(r"\w+")
+
+# 候选签名：(规范评论 ID, created_at, 无符号 SimHash)
+Candidate = Tuple[int, Any, int]
+
+
+def _tokens(text: str) -> List[str]:
+    # 链接常带随机参数，不参与特征
+    return _TOKEN_RE.findall(_URL_RE.sub(" ", text.lower()))
+
+
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def compute_simhash(text: Optional[str], *, min_tokens: Optional[int] = None) -> Optional[int]:
+    """计算文本的 64 位 SimHash（无符号）。
+
+    参数：
+        text: 评论文本。
+        min_tokens: 最少词数，默认取 ``settings.simhash_min_tokens``；过短的文本
+            （“谢谢”“+1”之类）特征太少，相似度没有意义。
+
+    返回：
+        Optional[int]: SimHash；文本过短时返回 ``None``。
+    """
+    tokens = _tokens(text or "")
+    if len(tokens) < (settings.simhash_min_tokens if min_tokens is None else min_tokens):
+        return None
+    # 词袋特征：评论较短，n-gram 下改动一个词会牵动多个特征，汉明距离放大过快
+    features = Counter(tokens)
+
+    weights = [0] * SIMHASH_BITS
+    for feature, count in features.items():
+        hashed = _feature_hash(feature)
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += count if hashed >> bit & 1 else -count
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def to_signed(value: int) -> int:
+    """无符号 64 位转为 ``BIGINT`` 可存储的有符号值。"""
+    return value - (1 << SIMHASH_BITS) if value >> (SIMHASH_BITS - 1) else value
+
+
+def to_unsigned(value: int) -> int:
+    """``BIGINT`` 中读出的有符号值转回无符号 64 位。"""
+    return value & _UNSIGNED_MASK
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return ((a ^ b) & _UNSIGNED_MASK).bit_count()
+
+
+def _band_shift(band: int) -> int:
+    return SIMHASH_BITS - SIMHASH_BAND_BITS * (band + 1)
+
+
+def simhash_bands(value: int) -> List[int]:
+    """各段取值（与表达式索引 ``(simhash >> shift) & 65535`` 一致，有符号/无符号均可）。"""
+    return [(value >> _band_shift(band)) & _BAND_MASK for band in range(SIMHASH_BANDS)]
+
+
+def band_expression(band: int):
+    """第 ``band`` 段的 SQL 表达式；常量需内联，参数化后无法匹配表达式索引。"""
+    return SourceComment.simhash.op(">>")(literal_column(str(_band_shift(band)))).op("&")(
+        literal_column(str(_BAND_MASK))
+    )
+
+
+def comment_simhash(content: Optional[str]) -> Optional[int]:
+    """评论入库用的 SimHash（已转为有符号值）。"""
+    value = compute_simhash(content)
+    return to_signed(value) if value is not None else None
+
+
+async def mark_near_duplicates(db: AsyncSession, comments: Iterable[SourceComment]) -> int:
+    """把新入库（或内容已变化）的评论标记为更早规范评论的近似重复（不提交）。
+
+    只与回看窗口内、发布时间更早的规范评论（自身不是重复）比较；同批评论按发布时间
+    依次处理，先处理的可以成为后处理者的规范评论。需在评论分配 ID 后调用。
+
+    参数：
+        db: 异步数据库会话。
+        comments: 已计算 ``simhash`` 的评论实体。
+
+    返回：
+        int: 本次标记为重复的评论数。
+    """
+    rows = sorted(
+        (comment for comment in comments if comment.simhash is not None),
+        key=lambda comment: (comment.created_at, comment.id),
+    )
+    if not rows:
+        return 0
+
+    band_values: List[Set[int]] = [set() for _ in range(SIMHASH_BANDS)]
+    for row in rows:
+        for band, value in enumerate(simhash_bands(row.simhash)):
+            band_values[band].add(value)
+
+    result = await db.execute(
+        select(SourceComment.id, SourceComment.created_at, SourceComment.simhash).where(
+            SourceComment.created_at >= rows[0].created_at - timedelta(days=settings.simhash_lookback_days),
+            SourceComment.created_at <= rows[-1].created_at,
+            SourceComment.duplicate_of_id.is_(None),
+            or_(*(band_expression(band).in_(sorted(values)) for band, values in enumerate(band_values))),
+        )
+    )
+    buckets: Dict[Tuple[int, int], List[Candidate]] = {}
+    for comment_id, created_at, simhash in result.all():
+        candidate = (comment_id, created_at, to_unsigned(simhash))
+        for band, value in enumerate(simhash_bands(simhash)):
+            buckets.setdefault((band, value), []).append(candidate)
+
+    marked = 0
+    duplicates: Set[int] = set()
+    for row in rows:
+        value = to_unsigned(row.simhash)
+        best: Optional[Candidate] = None
+        for band, band_value in enumerate(simhash_bands(value)):
+            for candidate in buckets.get((band, band_value), ()):
+                comment_id, created_at, candidate_hash = candidate
+                if comment_id == row.id or comment_id in duplicates:
+                    continue
+                if (created_at, comment_id) >= (row.created_at, row.id):
+                    continue
+                if best is not None and (created_at, comment_id) >= (best[1], best[0]):
+                    continue
+                if hamming_distance(value, candidate_hash) <= settings.simhash_max_distance:
+                    best = candidate
+        row.duplicate_of_id = best[0] if best else None
+        if best:
+            duplicates.add(row.id)
+            marked += 1
+    return marked
+
+
+async def backfill_simhashes(
+    db: AsyncSession,
+    *,
+    start_id: int = 0,
+    batch_size: int = 1000,
+    pause_ms: int = 100,
+) -> Dict[str, Any]:
+    """为历史评论计算 SimHash 并标记近似重复（按评论 ID 分批，每批独立提交）。
+
+    评论 ID 大致按入库顺序分配；晚入库的更早评论不会反过来把已处理的评论改判为重复。
+
+    返回：
+        Dict[str, Any]: ``comments`` 扫描数、``hashed`` 计算数、``duplicates`` 标记数、
+        ``last_id``、``seconds``。
+    """
+    started = time.perf_counter()
+    stats: Dict[str, Any] = {"comments": 0, "hashed": 0, "duplicates": 0, "last_id": start_id}
+    last_id = start_id
+    while True:
+        rows = (
+            await db.execute(
+                select(SourceComment).where(SourceComment.id > last_id).order_by(SourceComment.id).limit(batch_size)
+            )
+        ).scalars().all()
+        if not rows:
+            break
+
+        changed = []
+        for row in rows:
+            simhash = comment_simhash(row.content)
+            if simhash != row.simhash:
+                row.simhash = simhash
+                row.duplicate_of_id = None
+                changed.append(row)
+        await db.flush()
+        duplicates = await mark_near_duplicates(db, changed)
+        await db.commit()
+        db.expunge_all()
+
+        last_id = rows[-1].id
+        stats["comments"] += len(rows)
+        stats["hashed"] += sum(1 for row in changed if row.simhash is not None)
+        stats["duplicates"] += duplicates
+        stats["last_id"] = last_id
+        logger.info(
+            f"[SimHash] 回填进度: last_id={last_id}, comments={stats['comments']}, duplicates={stats['duplicates']}"
+        )
+        if pause_ms:
+            await asyncio.sleep(pause_ms / 1000)
+
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    return stats
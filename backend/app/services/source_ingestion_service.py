@@ -4,25 +4,37 @@
 负责将多平台抓取结果写入 ``source_*`` 系列表，包含：
 - 目标（source_targets）
 - 内容（source_items）
-- 评论（source_comments）
+- 评论（source_comments，含物化路径与 SimHash 近似重复标记）
 - 原始载荷（source_item_payloads/source_comment_payloads）
-- 标签关联（source_item_tags）
+- 标签关联（source_item_tags，含平台标签与规则自动标签）
+- 指标时间序列（source_item_metrics）
+- 小时级入库计数（ingest_hourly_rollups）
 """
 
 from datetime import datetime, timezone
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy import select
-from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.source_item_tag_associations import source_item_tags
-from app.models.source_comments import SourceComment
+from app.models.source_comments import SourceComment, SourceCommentKey
 from app.models.source_items import SourceItem
 from app.models.source_payloads import SourceCommentPayload, SourceItemPayload
 from app.models.source_targets import SourceTarget
 from app.models.tags import Tag
+from app.services.cache_service import CACHE_ITEMS, CACHE_TAGS, invalidate_on_commit
+from app.services.canonical_url_service import canonicalize_url
+from app.services.comment_tree_service import build_thread_path
+from app.services.item_metrics_service import (
+    PreviousSnapshot,
+    apply_item_velocity,
+    build_metric_sample,
+    record_metric_samples,
+)
+from app.services.rollup_service import RollupCounts, add_counts, load_item_tag_ids, record_rollups
+from app.services.simhash_service import comment_simhash, mark_near_duplicates
+from app.services.tag_rule_service import get_tag_rule_matcher, item_text, link_item_tags
 
 
 def normalize_target_key(target_key: str) -> str:
@@ -68,6 +80,32 @@ def normalize_source(value: str) -> str:
     return (value or "").strip().lower()
 
 
+def item_columns(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """适配器规范化结果中写入 ``source_items`` 的内容字段（入库与离线重放共用）。"""
+    return {
+        "item_type": str(raw.get("item_type") or "post"),
+        "title": str(raw.get("title") or ""),
+        "content": raw.get("content"),
+        "author": raw.get("author"),
+        "url": raw.get("url"),
+        "canonical_url": canonicalize_url(raw.get("link_url")),
+        "score": int(raw.get("score") or 0),
+        "num_comments": int(raw.get("num_comments") or 0),
+        "created_at": ensure_utc(raw.get("created_at")),
+    }
+
+
+def comment_columns(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """适配器规范化结果中写入 ``source_comments`` 的内容字段（入库与离线重放共用）。"""
+    return {
+        "content": str(raw.get("content") or ""),
+        "author": raw.get("author"),
+        "score": int(raw.get("score") or 0),
+        "depth": int(raw.get("depth") or 0),
+        "created_at": ensure_utc(raw.get("created_at")),
+    }
+
+
 async def upsert_source_target(
     db: AsyncSession,
     *,
@@ -179,8 +217,9 @@ async def save_source_items(
     target: Optional[SourceTarget],
     items: List[Dict[str, Any]],
     fetched_at: Optional[datetime] = None,
+    backfill: bool = False,
 ) -> Tuple[int, int]:
-    """批量 Upsert 统一内容、payload 与标签关联。
+    """批量 Upsert 统一内容、payload、标签关联，并追加指标样本。
 
     参数：
         db: 异步数据库会话。
@@ -188,12 +227,17 @@ async def save_source_items(
         target: 关联目标（可选）。
         items: 规范化后的内容字典列表。
         fetched_at: 抓取时间。
+        backfill: 历史回填（离线转储导入）。历史数据不代表当前热度，不写指标样本、
+            不更新增速（``rising_score``），也不计入当前小时的入库计数。
 
     返回：
         Tuple[int, int]: ``(新增数量, 更新数量)``。
     """
     source = normalize_source(source)
     fetched_at = ensure_utc(fetched_at)
+    if items:
+        # 列表缓存在本事务提交后失效（入库可能新建标签）
+        invalidate_on_commit(db, CACHE_ITEMS, CACHE_TAGS)
 
     external_ids = [str(item.get("external_id") or "").strip() for item in items if item.get("external_id")]
     existing: Dict[str, SourceItem] = {}
@@ -213,26 +257,22 @@ async def save_source_items(
 
     created = 0
     updated = 0
+    created_ids: List[str] = []
+    previous: Dict[str, Optional[PreviousSnapshot]] = {}
     for raw in items:
         external_id = str(raw.get("external_id") or "").strip()
         if not external_id:
             continue
 
         row = existing.get(external_id)
-        created_at = ensure_utc(raw.get("created_at"))
+        if external_id not in previous:
+            previous[external_id] = (row.score, row.num_comments, row.fetched_at) if row else None
 
         payload = {
             "target_id": target.id if target else None,
             "source": source,
             "external_id": external_id,
-            "item_type": str(raw.get("item_type") or "post"),
-            "title": str(raw.get("title") or ""),
-            "content": raw.get("content"),
-            "author": raw.get("author"),
-            "url": raw.get("url"),
-            "score": int(raw.get("score") or 0),
-            "num_comments": int(raw.get("num_comments") or 0),
-            "created_at": created_at,
+            **item_columns(raw),
             "fetched_at": fetched_at,
         }
 
@@ -242,6 +282,7 @@ async def save_source_items(
                 setattr(row, key, value)
         else:
             created += 1
+            created_ids.append(external_id)
             row = SourceItem(**payload)
             db.add(row)
             existing[external_id] = row
@@ -271,6 +312,7 @@ async def save_source_items(
         if payload:
             payload.item_id = item.id
             payload.payload = jsonable_encoder(raw.get("payload") or raw)
+            payload.created_at = item.created_at
             payload.fetched_at = fetched_at
         else:
             db.add(
@@ -279,34 +321,134 @@ async def save_source_items(
                     source=source,
                     external_id=external_id,
                     payload=jsonable_encoder(raw.get("payload") or raw),
+                    created_at=item.created_at,
                     fetched_at=fetched_at,
                 )
             )
 
-    tag_links: List[Dict[str, int]] = []
+    tag_links: List[Tuple[int, int]] = []
+    item_tag_ids: Dict[str, List[int]] = {}
+    matcher = await get_tag_rule_matcher(db)
     for raw in items:
         external_id = str(raw.get("external_id") or "").strip()
         if not external_id:
             continue
         item = existing.get(external_id)
-        if not item:
+        if not item or not item.id:
             continue
 
+        matched_tag_ids = set(matcher.match(item_text(item), source=source, target_id=item.target_id))
         for raw_tag in (raw.get("tags") or []):
             name = str(raw_tag).strip()
             if not name:
                 continue
             tag = tag_map.get(name)
-            if tag and item.id and tag.id:
-                tag_links.append({"source_item_id": item.id, "tag_id": tag.id})
+            if tag and tag.id:
+                matched_tag_ids.add(tag.id)
+        for tag_id in sorted(matched_tag_ids):
+            tag_links.append((item.id, tag_id))
+            item_tag_ids.setdefault(external_id, []).append(tag_id)
 
-    if tag_links:
-        await db.execute(pg_insert(source_item_tags).values(tag_links).on_conflict_do_nothing())
+    await link_item_tags(db, tag_links)
+
+    if backfill:
+        await db.flush()
+        return created, updated
+
+    samples = []
+    for external_id, snapshot in previous.items():
+        item = existing.get(external_id)
+        if not item:
+            continue
+        sample = build_metric_sample(item, snapshot, captured_at=fetched_at)
+        apply_item_velocity(item, sample, captured_at=fetched_at)
+        if sample:
+            samples.append(sample)
+    await record_metric_samples(db, samples)
+
+    rollup: RollupCounts = {}
+    for external_id in created_ids:
+        add_counts(
+            rollup,
+            at=fetched_at,
+            source=source,
+            target_id=target.id if target else None,
+            tag_ids=item_tag_ids.get(external_id, []),
+            items=1,
+        )
+    await record_rollups(db, rollup)
 
     await db.flush()
     return created, updated
 
 
+def _assign_thread_paths(
+    rows: Dict[str, SourceComment],
+    parent_of: Dict[str, Optional[str]],
+    known_paths: Optional[Dict[str, str]] = None,
+) -> None:
+    """按本批父子关系为评论计算物化路径（需在 ID 分配后调用）。
+
+    沿父链向上找到已算出路径的祖先或根，再自上而下逐层拼接；父链成环时从环上截断为根。
+    ``known_paths`` 为不在本批、已入库父评论的路径；父评论既不在本批也没有路径时按根处理。
+    """
+    paths: Dict[str, str] = dict(known_paths or {})
+    for external_id in parent_of:
+        chain: List[str] = []
+        current: Optional[str] = external_id
+        while current is not None and current not in paths and current not in chain:
+            if current not in rows:
+                current = None
+                break
+            chain.append(current)
+            current = parent_of.get(current)
+        prefix = paths.get(current) if current is not None else None
+        for node in reversed(chain):
+            row = rows[node]
+            prefix = build_thread_path(prefix, row.created_at, row.id)
+            paths[node] = prefix
+            row.thread_path = prefix
+
+
+def _derive_depths(
+    rows: Dict[str, SourceComment],
+    parent_of: Dict[str, Optional[str]],
+    known_depths: Dict[str, int],
+    external_ids: Set[str],
+) -> None:
+    """为 ``external_ids`` 中的评论按父链推算深度（顶层为 0）。
+
+    父评论在本批时递归推算，已入库时取其 ``depth``；父链成环时按根处理。
+    """
+    depths: Dict[str, int] = {}
+
+    def depth_of(external_id: str) -> int:
+        chain: List[str] = []
+        current: Optional[str] = external_id
+        base = -1
+        while current is not None:
+            if current in depths:
+                base = depths[current]
+                break
+            if current not in rows:
+                base = known_depths.get(current, -1)
+                break
+            if current in chain:
+                break
+            if current not in external_ids:
+                base = rows[current].depth or 0
+                break
+            chain.append(current)
+            current = parent_of.get(current)
+        for node in reversed(chain):
+            base += 1
+            depths[node] = base
+        return depths[external_id]
+
+    for external_id in external_ids:
+        rows[external_id].depth = depth_of(external_id)
+
+
 async def save_source_comments(
     db: AsyncSession,
     *,
@@ -314,6 +456,7 @@ async def save_source_comments(
     item: SourceItem,
     comments: List[Dict[str, Any]],
     fetched_at: Optional[datetime] = None,
+    backfill: bool = False,
 ) -> Tuple[int, int]:
     """批量 Upsert 统一评论与评论 payload。
 
@@ -323,6 +466,7 @@ async def save_source_comments(
         item: 父级内容实体。
         comments: 规范化后的评论字典列表。
         fetched_at: 抓取时间。
+        backfill: 历史回填，不计入当前小时的入库计数（见 ``save_source_items``）。
 
     返回：
         Tuple[int, int]: ``(新增数量, 更新数量)``。
@@ -333,16 +477,28 @@ async def save_source_comments(
     external_ids = [str(comment.get("external_id") or "").strip() for comment in comments if comment.get("external_id")]
     existing: Dict[str, SourceComment] = {}
     if external_ids:
+        # 经不分区的查找表定位：(source, external_id) 全局唯一，评论行按主键直接命中分区
         result = await db.execute(
-            select(SourceComment).where(
-                SourceComment.source == source,
-                SourceComment.external_id.in_(external_ids),
+            select(SourceComment)
+            .join(
+                SourceCommentKey,
+                and_(
+                    SourceCommentKey.comment_id == SourceComment.id,
+                    SourceCommentKey.created_at == SourceComment.created_at,
+                ),
+            )
+            .where(
+                SourceCommentKey.source == source,
+                SourceCommentKey.external_id.in_(external_ids),
             )
         )
         existing = {row.external_id: row for row in result.scalars().all()}
 
     created = 0
     updated = 0
+    new_rows: List[SourceComment] = []
+    # 新评论与内容变化的评论需要重新判定近似重复
+    rehash: Dict[str, SourceComment] = {}
     for raw in comments:
         external_id = str(raw.get("external_id") or "").strip()
         if not external_id:
@@ -353,26 +509,58 @@ async def save_source_comments(
             "item_id": item.id,
             "source": source,
             "external_id": external_id,
-            "content": str(raw.get("content") or ""),
-            "author": raw.get("author"),
-            "score": int(raw.get("score") or 0),
-            "depth": int(raw.get("depth") or 0),
-            "created_at": ensure_utc(raw.get("created_at")),
+            **comment_columns(raw),
             "fetched_at": fetched_at,
         }
+        simhash = comment_simhash(payload["content"])
 
         if row:
             updated += 1
+            # created_at 是分区键，且已编码进查找表与物化路径，已入库评论保持不变
+            payload.pop("created_at")
+            if row.simhash != simhash:
+                payload.update(simhash=simhash, duplicate_of_id=None)
+                rehash[external_id] = row
             for key, value in payload.items():
                 setattr(row, key, value)
         else:
             created += 1
-            row = SourceComment(**payload)
+            row = SourceComment(**payload, simhash=simhash)
             db.add(row)
             existing[external_id] = row
+            rehash[external_id] = row
+            new_rows.append(row)
 
     await db.flush()
+    # 与评论同事务写入查找表；并发写入同一外部 ID 时主键冲突，整批回滚
+    db.add_all(
+        SourceCommentKey(
+            source=source,
+            external_id=row.external_id,
+            comment_id=row.id,
+            created_at=row.created_at,
+        )
+        for row in new_rows
+    )
 
+    # 父评论可能已在之前的批次入库（如按时间顺序分批导入），按外部 ID 一次查出
+    missing_parents = {
+        str(raw["parent_external_id"])
+        for raw in comments
+        if raw.get("parent_external_id") and str(raw["parent_external_id"]) not in existing
+    }
+    stored_parents: Dict[str, SourceComment] = {}
+    if missing_parents:
+        result = await db.execute(
+            select(SourceComment).where(
+                SourceComment.source == source,
+                SourceComment.item_id == item.id,
+                SourceComment.external_id.in_(missing_parents),
+            )
+        )
+        stored_parents = {row.external_id: row for row in result.scalars().all()}
+
+    parent_of: Dict[str, Optional[str]] = {}
     for raw in comments:
         external_id = str(raw.get("external_id") or "").strip()
         if not external_id:
@@ -383,13 +571,32 @@ async def save_source_comments(
 
         parent_external_id = raw.get("parent_external_id")
         parent_id: Optional[int] = None
+        parent_of[external_id] = None
         if parent_external_id:
-            parent = existing.get(str(parent_external_id))
+            parent = existing.get(str(parent_external_id)) or stored_parents.get(str(parent_external_id))
             if parent:
                 parent_id = parent.id
+                parent_of[external_id] = str(parent_external_id)
         row.parent_id = parent_id
 
+    _assign_thread_paths(
+        existing,
+        parent_of,
+        {external_id: row.thread_path for external_id, row in stored_parents.items() if row.thread_path},
+    )
+    # 未提供深度的评论（如归档转储）按解析出的父评论推算
+    _derive_depths(
+        existing,
+        parent_of,
+        {external_id: row.depth for external_id, row in stored_parents.items()},
+        {
+            str(raw.get("external_id") or "").strip()
+            for raw in comments
+            if raw.get("depth") is None and str(raw.get("external_id") or "").strip() in parent_of
+        },
+    )
     await db.flush()
+    await mark_near_duplicates(db, rehash.values())
 
     payload_map: Dict[str, SourceCommentPayload] = {}
     if external_ids:
@@ -414,6 +621,7 @@ async def save_source_comments(
         if payload:
             payload.comment_id = row.id
             payload.payload = jsonable_encoder(raw.get("payload") or raw)
+            payload.created_at = row.created_at
             payload.fetched_at = fetched_at
         else:
             db.add(
@@ -422,9 +630,33 @@ async def save_source_comments(
                     source=source,
                     external_id=external_id,
                     payload=jsonable_encoder(raw.get("payload") or raw),
+                    created_at=row.created_at,
                     fetched_at=fetched_at,
                 )
             )
 
+    # 规则命中评论时给所属内容打标签
+    matcher = await get_tag_rule_matcher(db)
+    comment_tag_ids: Set[int] = set()
+    for raw in comments:
+        row = existing.get(str(raw.get("external_id") or "").strip())
+        if row:
+            comment_tag_ids |= matcher.match(row.content, source=source, target_id=item.target_id, comment=True)
+    if comment_tag_ids:
+        await link_item_tags(db, [(item.id, tag_id) for tag_id in comment_tag_ids])
+        invalidate_on_commit(db, CACHE_ITEMS)
+
+    if created and not backfill:
+        rollup: RollupCounts = {}
+        add_counts(
+            rollup,
+            at=fetched_at,
+            source=source,
+            target_id=item.target_id,
+            tag_ids=await load_item_tag_ids(db, item.id),
+            comments=created,
+        )
+        await record_rollups(db, rollup)
+
     await db.flush()
     return created, updated
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
 
@@ -39,6 +39,14 @@ class SourceAdapter(ABC):
     ) -> List[Dict[str, Any]]:
         raise NotImplementedError
 
+    def normalize_item_payload(self, payload: Dict[str, Any], *, channel: str = "") -> Dict[str, Any]:
+        """把已存储或离线导入的原始内容载荷规范化为入库字典（不访问网络）。"""
+        raise NotImplementedError
+
+    def normalize_comment_payload(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """把已存储或离线导入的原始评论载荷规范化为入库字典（不访问网络）。"""
+        raise NotImplementedError
+
     async def close(self):
         return None
 
@@ -47,8 +55,25 @@ def ensure_utc(dt: Optional[datetime]) -> Optional[datetime]:
     if dt is None:
         return None
     if dt.tzinfo is None:
-        from datetime import timezone
-
         return dt.replace(tzinfo=timezone.utc)
     return dt
 
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """解析时间：``datetime``、epoch 秒（数值或数字字符串）或 ISO 字符串；无法解析时返回 ``None``。
+
+    抓取结果中的时间是 ``datetime``，存入 payload 后变为 ISO 字符串，归档转储中则是 epoch 秒。
+    """
+    if isinstance(value, datetime):
+        return ensure_utc(value)
+    if isinstance(value, bool) or value is None or value == "":
+        return None
+    try:
+        return datetime.fromtimestamp(float(value), tz=timezone.utc)
+    except (TypeError, ValueError, OverflowError, OSError):
+        pass
+    try:
+        return ensure_utc(datetime.fromisoformat(str(value).replace("Z", "+00:00")))
+    except ValueError:
+        return None
+
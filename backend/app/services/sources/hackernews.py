@@ -90,6 +90,12 @@ class HackerNewsAdapter(SourceAdapter):
             await self._client.aclose()
             self._client = None
 
+    def normalize_item_payload(self, payload: Dict[str, Any], *, channel: str = "") -> Dict[str, Any]:
+        return self._normalize_story(payload, feed=channel)
+
+    def normalize_comment_payload(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return self._normalize_comment(payload)
+
     async def _get_client(self) -> httpx.AsyncClient:
         if self._client is None or self._client.is_closed:
             self._client = httpx.AsyncClient(timeout=20.0, follow_redirects=True)
@@ -123,6 +129,7 @@ class HackerNewsAdapter(SourceAdapter):
             "content": story.get("text") or None,
             "author": story.get("by") or "unknown",
             "url": url,
+            "link_url": story.get("url"),
             "score": int(story.get("score") or 0),
             "num_comments": int(story.get("descendants") or 0),
             "created_at": created_at,
@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from app.services.reddit_crawler_service import RedditCrawler
-from app.services.sources.base import SourceAdapter
+from app.services.sources.base import SourceAdapter, parse_timestamp
 
 
 class RedditAdapter(SourceAdapter):
@@ -69,12 +69,14 @@ class RedditAdapter(SourceAdapter):
     async def close(self):
         await self._crawler.close()
 
+    def normalize_item_payload(self, payload: Dict[str, Any], *, channel: str = "") -> Dict[str, Any]:
+        return self._normalize_post(payload, target_key=channel)
+
+    def normalize_comment_payload(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return self._normalize_comment(payload)
+
     def _normalize_post(self, item: Dict[str, Any], *, target_key: str) -> Dict[str, Any]:
-        created_at = item.get("created_utc")
-        if isinstance(created_at, datetime):
-            created = created_at
-        else:
-            created = datetime.utcnow()
+        created = parse_timestamp(item.get("created_utc")) or datetime.utcnow()
 
         permalink = item.get("permalink") or ""
         url = item.get("url")
@@ -91,6 +93,8 @@ class RedditAdapter(SourceAdapter):
             "content": item.get("selftext") or None,
             "author": item.get("author") or "[deleted]",
             "url": permalink_url or url,
+            # 链接帖的外链；自发帖的 url 指回帖子本身
+            "link_url": None if item.get("is_self") else url,
             "score": int(item.get("score") or 0),
             "num_comments": int(item.get("num_comments") or 0),
             "created_at": created,
@@ -100,11 +104,7 @@ class RedditAdapter(SourceAdapter):
         }
 
     def _normalize_comment(self, comment: Dict[str, Any]) -> Dict[str, Any]:
-        created_at = comment.get("created_utc")
-        if isinstance(created_at, datetime):
-            created = created_at
-        else:
-            created = datetime.utcnow()
+        created = parse_timestamp(comment.get("created_utc")) or datetime.utcnow()
 
         return {
             "source": "reddit",
@@ -112,7 +112,8 @@ class RedditAdapter(SourceAdapter):
             "content": str(comment.get("body") or ""),
             "author": comment.get("author") or "[deleted]",
             "score": int(comment.get("score") or 0),
-            "depth": int(comment.get("depth") or 0),
+            # 归档转储的评论没有 depth，留空由入库按父评论推算
+            "depth": int(comment["depth"]) if comment.get("depth") is not None else None,
             "parent_external_id": self._parse_parent_external_id(comment.get("parent_id")),
             "created_at": created,
             "payload": comment,
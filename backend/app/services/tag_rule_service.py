@@ -0,0 +1,303 @@
+from __future__ import annotations
+"""规则自动打标签服务。
+
+规则存于 ``tag_rules`` 表，进程内编译为一个匹配器：
+- 关键词规则合并进一个 Aho-Corasick 自动机，无论多少条规则，每篇文本只扫描一遍；
+- 正则规则合并为一个多选正则做预筛，未命中（绝大多数文本）时同样只需一遍，
+  命中后才逐条确认具体规则；
+- 范围（source / target_id）在命中后过滤。
+
+入库时由 ``save_source_items`` / ``save_source_comments`` 调用；新增规则后可用
+``python -m scripts.backfill_tag_rules`` 对历史内容分批回填。
+"""
+
+import asyncio
+import re
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.logging_config import get_logger
+from app.models.source_comments import SourceComment
+from app.models.source_item_tag_associations import source_item_tags
+from app.models.source_items import SourceItem
+from app.models.tag_rules import TagRule
+from app.services.cache_service import CACHE_ITEMS, invalidate_on_commit
+
+logger = get_logger("reddit_trace.tag_rules")
+
+TAG_RULE_KINDS = ("keyword", "regex")
+
+# (规则 ID, 标签 ID, source, target_id, match_comments)
+RuleScope = Tuple[int, int, Optional[str], Optional[int], bool]
+
+
+def _is_word_char(ch: str) -> bool:
+    # 仅对拉丁字母/数字要求词边界；中日韩文本没有空格分词，关键词可出现在任意位置
+    return ch.isascii() and (ch.isalnum() or ch == "_")
+
+
+class KeywordAutomaton:
+    """Aho-Corasick 多模式匹配（小写后匹配，命中需满足词边界）。"""
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, int]]] = [[]]  # (关键词长度, 值)
+        self._built = False
+
+    def add(self, keyword: str, value: int) -> None:
+        keyword = keyword.lower()
+        if not keyword:
+            return
+        state = 0
+        for ch in keyword:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((len(keyword), value))
+        self._built = False
+
+    def build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                candidate = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = candidate if candidate != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+        self._built = True
+
+    def __bool__(self) -> bool:
+        return len(self._goto) > 1
+
+    def find(self, text: str) -> Set[int]:
+        """返回文本中出现的全部关键词对应的值。"""
+        if not self._built:
+            self.build()
+        text = text.lower()
+        hits: Set[int] = set()
+        state = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        for index, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, value in out[state]:
+                if value in hits:
+                    continue
+                start = index - length + 1
+                if _is_word_char(text[start]) and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if _is_word_char(ch) and index + 1 < len(text) and _is_word_char(text[index + 1]):
+                    continue
+                hits.add(value)
+        return hits
+
+
+class TagRuleMatcher:
+    """编译后的规则集合。"""
+
+    def __init__(self, rules: Iterable[TagRule]):
+        self.scopes: Dict[int, RuleScope] = {}
+        self._keywords = KeywordAutomaton()
+        self._regexes: List[Tuple[int, re.Pattern]] = []
+        for rule in rules:
+            scope = (rule.id, rule.tag_id, rule.source, rule.target_id, bool(rule.match_comments))
+            if rule.kind == "regex":
+                try:
+                    compiled = re.compile(rule.pattern, re.IGNORECASE)
+                except re.error as e:
+                    logger.warning(f"[TagRule] 忽略无效正则 rule={rule.id}: {e}")
+                    continue
+                self._regexes.append((rule.id, compiled))
+            else:
+                self._keywords.add(rule.pattern.strip(), rule.id)
+            self.scopes[rule.id] = scope
+        self._keywords.build()
+        self._prefilter: Optional[re.Pattern] = None
+        if self._regexes:
+            try:
+                self._prefilter = re.compile(
+                    "|".join(f"(?:{pattern.pattern})" for _, pattern in self._regexes), re.IGNORECASE
+                )
+            except re.error as e:
+                # 单条合法的正则合并后仍可能冲突（内联全局标志、重名分组、反向引用编号错位），
+                # 此时退化为逐条匹配，不能让一条规则拖垮入库
+                logger.warning(f"[TagRule] 正则规则无法合并预筛，改为逐条匹配: {e}")
+
+    def __len__(self) -> int:
+        return len(self.scopes)
+
+    def match(
+        self,
+        text: Optional[str],
+        *,
+        source: str,
+        target_id: Optional[int],
+        comment: bool = False,
+    ) -> Set[int]:
+        """返回文本命中的标签 ID（已按规则范围过滤）。
+
+        参数：
+            text: 待匹配文本。
+            source: 内容所属平台。
+            target_id: 内容所属目标。
+            comment: 是否为评论文本（仅 ``match_comments`` 规则参与）。
+        """
+        if not text or not self.scopes:
+            return set()
+        rule_ids = self._keywords.find(text) if self._keywords else set()
+        if self._regexes and (self._prefilter is None or self._prefilter.search(text)):
+            rule_ids.update(rule_id for rule_id, pattern in self._regexes if pattern.search(text))
+
+        tag_ids: Set[int] = set()
+        for rule_id in rule_ids:
+            _, tag_id, rule_source, rule_target_id, match_comments = self.scopes[rule_id]
+            if comment and not match_comments:
+                continue
+            if rule_source and rule_source != source:
+                continue
+            if rule_target_id and rule_target_id != target_id:
+                continue
+            tag_ids.add(tag_id)
+        return tag_ids
+
+
+# 进程内缓存；规则变更后本进程立即失效，其他进程按刷新间隔重新加载
+_matcher_cache: Dict[str, Any] = {"matcher": None, "loaded_at": float("-inf")}
+
+
+def invalidate_tag_rules() -> None:
+    """使进程内缓存的匹配器失效。"""
+    _matcher_cache["loaded_at"] = float("-inf")
+
+
+async def load_tag_rule_matcher(db: AsyncSession, rule_ids: Optional[Sequence[int]] = None) -> TagRuleMatcher:
+    """从数据库加载启用的规则并编译（``rule_ids`` 可限定为部分规则）。"""
+    query = select(TagRule).where(TagRule.enabled.is_(True))
+    if rule_ids:
+        query = query.where(TagRule.id.in_(list(rule_ids)))
+    result = await db.execute(query.order_by(TagRule.id))
+    return TagRuleMatcher(result.scalars().all())
+
+
+async def get_tag_rule_matcher(db: AsyncSession) -> TagRuleMatcher:
+    """返回缓存的匹配器，超过刷新间隔时重新加载。"""
+    now = time.monotonic()
+    matcher = _matcher_cache["matcher"]
+    if matcher is None or now - _matcher_cache["loaded_at"] >= settings.tag_rules_refresh_seconds:
+        matcher = await load_tag_rule_matcher(db)
+        _matcher_cache.update(matcher=matcher, loaded_at=now)
+    return matcher
+
+
+def item_text(item: Any) -> str:
+    """内容参与匹配的文本（标题 + 正文）。"""
+    return f"{item.title or ''}\n{item.content or ''}"
+
+
+async def link_item_tags(db: AsyncSession, links: Iterable[Tuple[int, int]]) -> None:
+    """写入 ``(内容 ID, 标签 ID)`` 绑定，已存在的跳过（不提交）。"""
+    rows = [{"source_item_id": item_id, "tag_id": tag_id} for item_id, tag_id in sorted(set(links))]
+    if rows:
+        await db.execute(pg_insert(source_item_tags).values(rows).on_conflict_do_nothing())
+
+
+async def backfill_tag_rules(
+    db: AsyncSession,
+    *,
+    rule_ids: Optional[Sequence[int]] = None,
+    include_comments: bool = False,
+    start_id: int = 0,
+    batch_size: int = 500,
+    pause_ms: int = 100,
+) -> Dict[str, Any]:
+    """对历史内容按批应用规则（按内容 ID 顺序，每批独立提交）。
+
+    参数：
+        db: 异步数据库会话。
+        rule_ids: 只回填这些规则；为空时使用全部启用规则。
+        include_comments: 是否同时扫描评论（仅 ``match_comments`` 规则生效）。
+        start_id: 从该内容 ID 之后开始（用于中断后续跑）。
+        batch_size: 每批内容数。
+        pause_ms: 批间暂停毫秒数，降低对在线负载的影响。
+
+    返回：
+        Dict[str, Any]: ``items`` 扫描内容数、``links`` 写入绑定数（含已存在被跳过的）、
+        ``last_id`` 最后处理的内容 ID、``seconds`` 耗时。
+    """
+    started = time.perf_counter()
+    matcher = await load_tag_rule_matcher(db, rule_ids)
+    stats: Dict[str, Any] = {"items": 0, "links": 0, "last_id": start_id}
+    if not len(matcher):
+        stats["seconds"] = 0.0
+        return stats
+
+    scan_comments = include_comments and any(scope[4] for scope in matcher.scopes.values())
+    last_id = start_id
+    while True:
+        items = (
+            await db.execute(
+                select(
+                    SourceItem.id,
+                    SourceItem.source,
+                    SourceItem.target_id,
+                    SourceItem.title,
+                    SourceItem.content,
+                )
+                .where(SourceItem.id > last_id)
+                .order_by(SourceItem.id)
+                .limit(batch_size)
+            )
+        ).all()
+        if not items:
+            break
+
+        links: Set[Tuple[int, int]] = set()
+        for item in items:
+            for tag_id in matcher.match(item_text(item), source=item.source, target_id=item.target_id):
+                links.add((item.id, tag_id))
+
+        if scan_comments:
+            by_id = {item.id: item for item in items}
+            comments = await db.execute(
+                select(SourceComment.item_id, SourceComment.content).where(
+                    # 不加发布时间下界：评论可能早于所属内容发布（时钟偏差、时间缺省回退）
+                    SourceComment.item_id.in_(list(by_id)),
+                )
+            )
+            for item_id, content in comments.all():
+                item = by_id[item_id]
+                for tag_id in matcher.match(content, source=item.source, target_id=item.target_id, comment=True):
+                    links.add((item_id, tag_id))
+
+        await link_item_tags(db, links)
+        if links:
+            invalidate_on_commit(db, CACHE_ITEMS)
+        await db.commit()
+
+        last_id = items[-1].id
+        stats["items"] += len(items)
+        stats["links"] += len(links)
+        stats["last_id"] = last_id
+        logger.info(f"[TagRule] 回填进度: last_id={last_id}, items={stats['items']}, links={stats['links']}")
+        if pause_ms:
+            await asyncio.sleep(pause_ms / 1000)
+
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    return stats
@@ -0,0 +1,120 @@
+from __future__ import annotations
+"""统一内容标签的批量维护服务。
+
+增删都是集合操作：按条件圈定内容后，一条 ``INSERT ... SELECT ... ON CONFLICT DO NOTHING``
+完成全部绑定、一条 ``DELETE`` 完成全部解绑，不加载 ORM 标签集合。
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.source_item_tag_associations import source_item_tags
+from app.models.source_items import SourceItem
+from app.models.tags import Tag
+from app.services.cache_service import CACHE_ITEMS, invalidate_on_commit
+from app.services.search_service import item_search_clause
+
+
+def item_scope(
+    *,
+    item_ids: Optional[Iterable[int]] = None,
+    source: Optional[str] = None,
+    target_id: Optional[int] = None,
+    tag_id: Optional[int] = None,
+    tag_ids: Optional[Iterable[int]] = None,
+    q: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> List[Any]:
+    """构建圈定统一内容的 WHERE 条件列表（``tag_ids`` 为命中任一标签）。
+
+    空字符串、0 等空值不构成条件；没有任何条件时返回空列表（即不限范围），
+    批量写操作需自行拒绝空范围。
+    """
+    clauses: List[Any] = []
+    if item_ids is not None:
+        clauses.append(SourceItem.id.in_(list(item_ids)))
+    if source:
+        clauses.append(SourceItem.source == source)
+    if target_id:
+        clauses.append(SourceItem.target_id == target_id)
+    if tag_id:
+        clauses.append(
+            SourceItem.id.in_(select(source_item_tags.c.source_item_id).where(source_item_tags.c.tag_id == tag_id))
+        )
+    if tag_ids:
+        clauses.append(
+            SourceItem.id.in_(
+                select(source_item_tags.c.source_item_id).where(source_item_tags.c.tag_id.in_(list(tag_ids)))
+            )
+        )
+    if q and q.strip():
+        clauses.append(item_search_clause(q))
+    if since:
+        clauses.append(SourceItem.created_at >= since)
+    if until:
+        clauses.append(SourceItem.created_at < until)
+    return clauses
+
+
+async def find_missing_tags(db: AsyncSession, tag_ids: Iterable[int]) -> List[int]:
+    """返回不存在的标签 ID。"""
+    tag_ids = set(tag_ids)
+    if not tag_ids:
+        return []
+    result = await db.execute(select(Tag.id).where(Tag.id.in_(tag_ids)))
+    return sorted(tag_ids - set(result.scalars().all()))
+
+
+async def bulk_update_item_tags(
+    db: AsyncSession,
+    *,
+    scope: List[Any],
+    add_tag_ids: Iterable[int] = (),
+    remove_tag_ids: Iterable[int] = (),
+) -> Dict[str, int]:
+    """对圈定的内容批量绑定/解绑标签（同一事务，不提交）。
+
+    参数：
+        db: 异步数据库会话。
+        scope: ``item_scope`` 构建的条件。
+        add_tag_ids: 需要绑定的标签 ID（已绑定的跳过）。
+        remove_tag_ids: 需要解绑的标签 ID。
+
+    返回：
+        Dict[str, int]: ``matched`` 圈定内容数、``added`` 新增绑定数、``removed`` 删除绑定数。
+    """
+    add_tag_ids = sorted(set(add_tag_ids))
+    remove_tag_ids = sorted(set(remove_tag_ids))
+    matched = await db.scalar(select(func.count()).select_from(SourceItem).where(*scope)) or 0
+
+    added = removed = 0
+    if matched and add_tag_ids:
+        rows = (
+            select(SourceItem.id, Tag.id)
+            .where(*scope, Tag.id.in_(add_tag_ids))
+            # 与并发写入保持一致的加锁顺序
+            .order_by(SourceItem.id, Tag.id)
+        )
+        result = await db.execute(
+            pg_insert(source_item_tags)
+            .from_select(["source_item_id", "tag_id"], rows)
+            .on_conflict_do_nothing()
+        )
+        added = max(result.rowcount or 0, 0)
+    if matched and remove_tag_ids:
+        result = await db.execute(
+            delete(source_item_tags).where(
+                source_item_tags.c.tag_id.in_(remove_tag_ids),
+                source_item_tags.c.source_item_id.in_(select(SourceItem.id).where(*scope)),
+            )
+        )
+        removed = max(result.rowcount or 0, 0)
+
+    if added or removed:
+        invalidate_on_commit(db, CACHE_ITEMS)
+    return {"matched": int(matched), "added": added, "removed": removed}
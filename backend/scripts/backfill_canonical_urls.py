@@ -0,0 +1,41 @@
+"""为历史内容回填规范外链 canonical_url。
+
+按内容 ID 顺序分批扫描，每批独立提交，可用 ``--start-id`` 从中断处续跑；
+规范化规则调整后重新执行即可更新已有值。
+
+用法（在 backend 目录下执行，使用 .env 中的 DATABASE_URL）::
+
+    python -m scripts.backfill_canonical_urls --batch-size 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+from app.database import AsyncSessionLocal, engine
+import app.models  # noqa: F401
+from app.services.canonical_url_service import backfill_canonical_urls
+
+
+async def main(args: argparse.Namespace):
+    async with AsyncSessionLocal() as db:
+        stats = await backfill_canonical_urls(
+            db,
+            start_id=args.start_id,
+            batch_size=args.batch_size,
+            pause_ms=args.pause_ms,
+        )
+    print(
+        f"items={stats['items']} updated={stats['updated']} "
+        f"last_id={stats['last_id']} seconds={stats['seconds']}"
+    )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="为历史内容回填规范外链 canonical_url")
+    parser.add_argument("--start-id", type=int, default=0, help="从该内容 ID 之后开始")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--pause-ms", type=int, default=100)
+    asyncio.run(main(parser.parse_args()))
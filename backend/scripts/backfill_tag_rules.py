@@ -0,0 +1,44 @@
+"""将自动打标签规则回填到历史内容。
+
+按内容 ID 顺序分批扫描，每批独立提交，可用 ``--start-id`` 从中断处续跑。
+
+用法（在 backend 目录下执行，使用 .env 中的 DATABASE_URL）::
+
+    python -m scripts.backfill_tag_rules --rule-id 3 --rule-id 7 --include-comments
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+from app.database import AsyncSessionLocal, engine
+import app.models  # noqa: F401
+from app.services.tag_rule_service import backfill_tag_rules
+
+
+async def main(args: argparse.Namespace):
+    async with AsyncSessionLocal() as db:
+        stats = await backfill_tag_rules(
+            db,
+            rule_ids=args.rule_id or None,
+            include_comments=args.include_comments,
+            start_id=args.start_id,
+            batch_size=args.batch_size,
+            pause_ms=args.pause_ms,
+        )
+    print(
+        f"items={stats['items']} links={stats['links']} "
+        f"last_id={stats['last_id']} seconds={stats['seconds']}"
+    )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="将自动打标签规则回填到历史内容")
+    parser.add_argument("--rule-id", type=int, action="append", help="只回填指定规则，可重复；默认全部启用规则")
+    parser.add_argument("--include-comments", action="store_true", help="同时扫描评论（match_comments 规则）")
+    parser.add_argument("--start-id", type=int, default=0, help="从该内容 ID 之后开始")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--pause-ms", type=int, default=100)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,101 @@
+"""列表接口 payload 加载策略基准测试。
+
+对比「列表查询同时 selectin 加载原始 payload」（旧行为）与「列表仅加载响应字段」
+（当前行为）在每页查询上的耗时与内存峰值。
+
+用法（在 backend 目录下执行，使用 .env 中的 DATABASE_URL）::
+
+    python -m scripts.bench_list_payloads --pages 20 --limit 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app.database import AsyncSessionLocal, engine
+import app.models  # noqa: F401
+from app.models.source_comments import SourceComment
+from app.models.source_items import SourceItem
+from app.schemas.sources_schemas import SourceCommentResponse, SourceItemResponse
+
+
+def _items_query(with_payload: bool):
+    query = select(SourceItem).options(selectinload(SourceItem.tags))
+    if with_payload:
+        query = query.options(selectinload(SourceItem.payload))
+    return query.order_by(SourceItem.fetched_at.desc())
+
+
+def _comments_query(with_payload: bool):
+    query = select(SourceComment)
+    if with_payload:
+        query = query.options(selectinload(SourceComment.payload))
+    return query.order_by(SourceComment.created_at.asc())
+
+
+async def _run_case(
+    build_query: Callable,
+    schema,
+    *,
+    with_payload: bool,
+    pages: int,
+    limit: int,
+) -> Dict[str, float]:
+    """按页执行查询并序列化为响应模型，记录耗时与内存峰值。"""
+    durations: List[float] = []
+    peaks: List[int] = []
+    for page in range(pages):
+        async with AsyncSessionLocal() as db:
+            tracemalloc.start()
+            started = time.perf_counter()
+            result = await db.execute(build_query(with_payload).offset(page * limit).limit(limit))
+            rows = result.scalars().all()
+            [schema.model_validate(row).model_dump() for row in rows]
+            durations.append((time.perf_counter() - started) * 1000)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            peaks.append(peak)
+    return {
+        "p50_ms": statistics.median(durations),
+        "max_ms": max(durations),
+        "peak_kb": statistics.median(peaks) / 1024,
+    }
+
+
+async def main(pages: int, limit: int):
+    cases = [
+        ("source_items", _items_query, SourceItemResponse),
+        ("source_comments", _comments_query, SourceCommentResponse),
+    ]
+    print(f"pages={pages} limit={limit}")
+    print(f"{'endpoint':<18}{'payload':<10}{'p50 ms':>10}{'max ms':>10}{'peak KB':>12}")
+    for name, build_query, schema in cases:
+        for with_payload in (True, False):
+            stats = await _run_case(
+                build_query,
+                schema,
+                with_payload=with_payload,
+                pages=pages,
+                limit=limit,
+            )
+            label = "loaded" if with_payload else "deferred"
+            print(
+                f"{name:<18}{label:<10}{stats['p50_ms']:>10.1f}{stats['max_ms']:>10.1f}{stats['peak_kb']:>12.1f}"
+            )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="列表接口 payload 加载策略基准测试")
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.pages, args.limit))
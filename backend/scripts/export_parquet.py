@@ -0,0 +1,59 @@
+"""导出内容 / 评论 / 分析结果为按平台与日期分区的 Parquet 文件。
+
+输出目录结构为 ``<out>/<kind>/source=<平台>/date=<YYYY-MM-DD>/part-00000.parquet``，
+可直接被 DuckDB / Spark / pandas 以 Hive 分区读取。需安装 ``pyarrow``。
+
+用法（在 backend 目录下执行，使用 .env 中的 DATABASE_URL；默认读只读副本）::
+
+    python -m scripts.export_parquet --kind comments --source reddit \\
+        --since 2026-01-01 --until 2026-07-01 --tag-id 3 --out exports
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import datetime, timezone
+
+from app.database import engine, read_engine, read_session
+import app.models  # noqa: F401
+from app.services.export_service import EXPORT_KINDS, export_parquet
+
+
+def _parse_time(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+async def main(args: argparse.Namespace):
+    async with read_session() as db:
+        stats = await export_parquet(
+            db,
+            kind=args.kind,
+            out_dir=args.out,
+            source=args.source,
+            target_id=args.target_id,
+            tag_ids=args.tag_id,
+            since=args.since,
+            until=args.until,
+            batch_size=args.batch_size,
+            row_group_size=args.row_group_size,
+        )
+    print(f"rows={stats['rows']} files={len(stats['files'])}")
+    await engine.dispose()
+    if read_engine is not None:
+        await read_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="导出为按平台与日期分区的 Parquet 文件")
+    parser.add_argument("--kind", choices=EXPORT_KINDS, default="items")
+    parser.add_argument("--out", default="exports", help="输出目录")
+    parser.add_argument("--source", help="平台过滤")
+    parser.add_argument("--target-id", type=int, help="目标过滤")
+    parser.add_argument("--tag-id", type=int, action="append", help="命中任一标签即导出，可重复")
+    parser.add_argument("--since", type=_parse_time, help="起始时间（含），ISO 格式，默认 UTC")
+    parser.add_argument("--until", type=_parse_time, help="截止时间（不含），ISO 格式，默认 UTC")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--row-group-size", type=int, default=50000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,59 @@
+"""从 Hacker News 条目转储批量导入历史故事与评论树。
+
+支持 Firebase API 形状的 JSON 行（可为 ``.zst`` / ``.gz`` 压缩）与带表头的 CSV 导出
+（如 BigQuery ``hacker_news.full``，文件名含 ``.csv``）。文件需按 ``id`` 升序；主进程流式读取，
+工作进程并行解析与规范化，按文件顺序分批写库，评论的所属故事与父评论按批一次性解析。
+
+用法（在 backend 目录下执行，使用 .env 中的 DATABASE_URL）::
+
+    python -m scripts.import_hn_dump hn_items.jsonl.zst --workers 6 --checkpoint hn.ckpt
+    python -m scripts.import_hn_dump hn_full.csv.gz --feed topstories
+
+使用 ``--checkpoint`` 时每写完一块记录已处理行数，被删评论的父链信息同时存于
+``<checkpoint>.skipped.sqlite``；中断后用同样的参数重跑即可继续（重复写入按外部 ID 幂等更新）。
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+
+from app.database import engine
+import app.models  # noqa: F401
+from app.services.dump_import_service import import_hn_dump
+
+
+async def main(args: argparse.Namespace) -> None:
+    try:
+        stats = await import_hn_dump(
+            args.path,
+            workers=args.workers,
+            feed=args.feed,
+            chunk_lines=args.chunk_lines,
+            batch_size=args.batch_size,
+            skip_lines=args.skip_lines,
+            checkpoint=args.checkpoint,
+        )
+    finally:
+        await engine.dispose()
+    seconds = stats["seconds"] or 1
+    print(
+        f"{args.path}: lines={stats['lines']} matched={stats['matched']} created={stats['created']} "
+        f"updated={stats['updated']} skipped={stats['skipped']} orphans={stats['orphans']} "
+        f"bad_lines={stats['bad_lines']} seconds={stats['seconds']:.1f} "
+        f"lines/s={stats['lines'] / seconds:.0f} rows/s={(stats['created'] + stats['updated']) / seconds:.0f} "
+        f"MB/s={stats['bytes'] / 1e6 / seconds:.1f}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="从 Hacker News 条目转储批量导入历史故事与评论")
+    parser.add_argument("path", help="转储文件（JSON 行或 CSV，可为 .zst / .gz 压缩）")
+    parser.add_argument("--feed", help="把故事挂到该 feed 目标下（如 topstories），默认不关联目标")
+    parser.add_argument("--workers", type=int, default=max(multiprocessing.cpu_count() - 1, 1))
+    parser.add_argument("--chunk-lines", type=int, default=20000, help="每个解析块的行数")
+    parser.add_argument("--batch-size", type=int, default=500, help="每次写库的记录数")
+    parser.add_argument("--skip-lines", type=int, default=0, help="跳过文件开头的行数")
+    parser.add_argument("--checkpoint", help="检查点文件，存在时从记录的位置继续")
+    asyncio.run(main(parser.parse_args()))
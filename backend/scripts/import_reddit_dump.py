@@ -0,0 +1,62 @@
+"""从 Reddit 归档转储（Pushshift 风格 ``RS_*.zst`` / ``RC_*.zst``）批量导入历史数据。
+
+主进程流式解压，工作进程并行解析与过滤，按文件顺序分批写库；写库复用在线入库逻辑
+（标签、规则标签、规范外链、物化路径、近似重复标记均一致）。评论挂到已入库的提交下，
+因此同一时间段需先导入提交文件、再导入评论文件。读取 ``.zst`` 需安装 ``zstandard``。
+
+用法（在 backend 目录下执行，使用 .env 中的 DATABASE_URL）::
+
+    python -m scripts.import_reddit_dump RS_2023-01.zst --kind submissions --subreddit SaaS --subreddit startups
+    python -m scripts.import_reddit_dump RC_2023-01.zst --kind comments --subreddit SaaS --subreddit startups --workers 6
+
+中断后可用 ``--checkpoint`` 记录的位置或 ``--skip-lines`` 继续（重复写入按外部 ID 幂等更新）；
+检查点按文件路径记录，多个文件可共用同一个检查点文件依次续跑。
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+
+from app.database import engine
+import app.models  # noqa: F401
+from app.services.dump_import_service import REDDIT_DUMP_KINDS, import_reddit_dump
+
+
+async def main(args: argparse.Namespace) -> None:
+    try:
+        for index, path in enumerate(args.paths):
+            stats = await import_reddit_dump(
+                path,
+                kind=args.kind,
+                subreddits=args.subreddit,
+                workers=args.workers,
+                chunk_lines=args.chunk_lines,
+                batch_size=args.batch_size,
+                skip_lines=args.skip_lines if index == 0 else 0,
+                checkpoint=args.checkpoint,
+            )
+            seconds = stats["seconds"] or 1
+            print(
+                f"{path}: lines={stats['lines']} matched={stats['matched']} created={stats['created']} "
+                f"updated={stats['updated']} orphans={stats['orphans']} bad_lines={stats['bad_lines']} "
+                f"seconds={stats['seconds']:.1f} lines/s={stats['lines'] / seconds:.0f} "
+                f"MB/s={stats['bytes'] / 1e6 / seconds:.1f}",
+                flush=True,
+            )
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="从 Reddit 归档转储批量导入历史提交或评论")
+    parser.add_argument("paths", nargs="+", help="转储文件（.zst / .gz / 纯文本，每行一个 JSON）")
+    parser.add_argument("--kind", choices=REDDIT_DUMP_KINDS, required=True)
+    parser.add_argument("--subreddit", action="append", required=True, help="要导入的版块，可重复指定")
+    parser.add_argument("--workers", type=int, default=max(multiprocessing.cpu_count() - 1, 1))
+    parser.add_argument("--chunk-lines", type=int, default=20000, help="每个解析块的行数")
+    parser.add_argument("--batch-size", type=int, default=500, help="每次写库的记录数")
+    parser.add_argument("--skip-lines", type=int, default=0, help="跳过第一个文件开头的行数（中断后续跑）")
+    parser.add_argument("--checkpoint", help="检查点文件，存在时从记录的位置继续")
+    asyncio.run(main(parser.parse_args()))
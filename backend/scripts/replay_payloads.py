@@ -0,0 +1,93 @@
+"""用当前适配器规范化逻辑重放已存储的原始载荷（不访问网络）。
+
+按载荷 ID 切分区间，分给多个工作进程并行处理；完成每个区间后输出进度，结束时输出
+各字段的差异统计与样本。建议先用 ``--dry-run`` 查看差异再写回。
+
+用法（在 backend 目录下执行，使用 .env 中的 DATABASE_URL）::
+
+    python -m scripts.replay_payloads --kind items --source reddit --workers 4 --dry-run
+    python -m scripts.replay_payloads --kind comments --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from app.database import AsyncSessionLocal, engine
+import app.models  # noqa: F401
+from app.services.replay_service import (
+    REPLAY_KINDS,
+    empty_stats,
+    merge_stats,
+    plan_ranges,
+    replay_range_in_process,
+)
+
+
+async def _plan(args: argparse.Namespace):
+    async with AsyncSessionLocal() as db:
+        ranges = await plan_ranges(db, kind=args.kind, source=args.source, chunk_size=args.chunk_size)
+    await engine.dispose()
+    return ranges
+
+
+def _print_summary(stats: dict, *, dry_run: bool, seconds: float) -> None:
+    mode = "dry-run（未写回）" if dry_run else "已写回"
+    print(
+        f"\n{mode}: rows={stats['rows']} changed={stats['changed']} errors={stats['errors']} "
+        f"seconds={seconds:.1f} rows/s={stats['rows'] / seconds if seconds else 0:.0f}"
+    )
+    for field, count in sorted(stats["fields"].items(), key=lambda kv: -kv[1]):
+        note = "（只统计，不写回）" if field == "created_at" else ""
+        print(f"  {field}: {count}{note}")
+        for sample in stats["samples"].get(field, []):
+            print(f"    {sample['external_id']}: {sample['old']!r} -> {sample['new']!r}")
+
+
+def main(args: argparse.Namespace) -> None:
+    ranges = asyncio.run(_plan(args))
+    if not ranges:
+        print("没有需要重放的载荷")
+        return
+
+    options = {
+        "source": args.source,
+        "dry_run": args.dry_run,
+        "batch_size": args.batch_size,
+        "sample_size": args.samples,
+    }
+    total = empty_stats()
+    started = time.perf_counter()
+    # spawn：工作进程重新导入模块，各自创建连接池，不继承父进程的连接
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=context) as pool:
+        futures = {
+            pool.submit(replay_range_in_process, args.kind, lo, hi, options): (lo, hi) for lo, hi in ranges
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            lo, hi = futures[future]
+            merge_stats(total, future.result(), sample_size=args.samples)
+            elapsed = time.perf_counter() - started
+            eta = elapsed / done * (len(ranges) - done)
+            print(
+                f"[{done}/{len(ranges)}] ids {lo}-{hi} done; rows={total['rows']} changed={total['changed']} "
+                f"errors={total['errors']} elapsed={elapsed:.0f}s eta={eta:.0f}s",
+                flush=True,
+            )
+    _print_summary(total, dry_run=args.dry_run, seconds=time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="用当前规范化逻辑重放已存储的原始载荷")
+    parser.add_argument("--kind", choices=REPLAY_KINDS, default="items")
+    parser.add_argument("--source", help="只处理该平台")
+    parser.add_argument("--workers", type=int, default=max(multiprocessing.cpu_count() - 1, 1))
+    parser.add_argument("--chunk-size", type=int, default=20000, help="每个工作区间的载荷 ID 跨度")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--samples", type=int, default=5, help="每个字段输出的差异样本数")
+    parser.add_argument("--dry-run", action="store_true", help="只统计差异，不写回")
+    main(parser.parse_args())